@@ -1,9 +1,11 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-import hashlib
-from datetime import datetime, date, timezone
+from sqlalchemy.orm import load_only, undefer
+from datetime import datetime, timezone
+from functools import partial
+import atexit
 import os
 import sys
 
@@ -16,19 +18,29 @@ if sys.platform == 'win32':
         pass
 
 from config import Config
-from database import db, init_db, User, Analysis
-from auth import generate_token, login_required, optional_auth
+from database import db, init_db, User, Analysis, AnalysisBlob
+from auth import auth_cache, generate_token, login_required, optional_auth
 from utils.error_handler import ValidationError, logger
+from utils.fork_safety import register_after_fork, memory_report
+from utils.http_client import http_client
 from utils.preprocessing import TextPreprocessor
 from utils.scoring import TrustScoreCalculator
+from utils.result_cache import ResultCache, compute_content_hash
+from utils.pipeline import AnalysisPipeline
+from utils.quota import DailyQuota
+from utils.write_behind import WriteBehindQueue, flush_all as flush_write_behind
+from utils.pagination import keyset_page
+import utils.limiter_storage  # registers the sqlite:// limiter storage
 
 # Import AI models
 from models.fake_news_detector import FakeNewsDetector
 from models.sentiment_analyzer import SentimentAnalyzer
 from models.bias_detector import BiasDetector
+from models.inference import configure_torch_threads
 from services.fact_checker import FactChecker
 from services.source_validator import SourceValidator
 from services.image_verifier import ImageVerifier
+from services.inference_client import InferenceClient, RemoteFakeNewsDetector, RemoteSentimentAnalyzer
 
 # Initialize Flask
 app = Flask(__name__)
@@ -41,12 +53,39 @@ logger.info(f"Flask ENV: {app.config.get('FLASK_ENV', 'NOT SET')}")
 # Initialize database
 init_db(app)
 
+@register_after_fork
+def _reset_db_pool():
+    """Forked workers must not reuse the master's database connections"""
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+# Analysis result cache
+result_cache = ResultCache() if Config.RESULT_CACHE_ENABLED else None
+
+# Concurrent analysis stages
+analysis_pipeline = AnalysisPipeline(Config.PIPELINE_MAX_WORKERS)
+
+# Per-user daily analysis quota
+daily_quota = DailyQuota(cache_ttl=Config.QUOTA_CACHE_TTL)
+
+# History rows are written in batches off the request path (see save_analyses)
+analysis_writer = WriteBehindQueue(
+    'analyses',
+    lambda records: write_analyses(records),
+    batch_size=Config.WRITE_BEHIND_BATCH_SIZE,
+    max_pending=Config.WRITE_BEHIND_MAX_PENDING,
+    max_delay_ms=Config.WRITE_BEHIND_MAX_DELAY_MS,
+    policy=Config.WRITE_BEHIND_POLICY
+) if Config.WRITE_BEHIND_ENABLED else None
+atexit.register(flush_write_behind)
+
 # Rate limiting
 limiter = Limiter(
     app=app,
     key_func=get_remote_address,
     default_limits=["200 per hour"],
-    storage_uri="memory://"
+    storage_uri=Config.RATELIMIT_STORAGE_URI,
+    in_memory_fallback_enabled=True
 )
 
 # ==================== MODEL INITIALIZATION ====================
@@ -58,11 +97,20 @@ logger.info("=" * 50)
 logger.info("Loading AI models... This may take a few minutes.")
 
 try:
-    fake_news_detector = FakeNewsDetector()
-    logger.info("✅ Fake News Detector loaded")
-    
-    sentiment_analyzer = SentimentAnalyzer()
-    logger.info("✅ Sentiment Analyzer loaded")
+    if Config.INFERENCE_SOCKET:
+        # Models live in the standalone inference server
+        inference_client = InferenceClient(Config.INFERENCE_SOCKET, Config.INFERENCE_CLIENT_TIMEOUT)
+        fake_news_detector = RemoteFakeNewsDetector(inference_client)
+        sentiment_analyzer = RemoteSentimentAnalyzer(inference_client)
+        logger.info(f"✅ Using inference server at {Config.INFERENCE_SOCKET}")
+    else:
+        configure_torch_threads(Config.TORCH_NUM_THREADS)
+        
+        fake_news_detector = FakeNewsDetector()
+        logger.info("✅ Fake News Detector loaded")
+        
+        sentiment_analyzer = SentimentAnalyzer()
+        logger.info("✅ Sentiment Analyzer loaded")
     
     bias_detector = BiasDetector()
     logger.info("✅ Bias Detector loaded")
@@ -79,6 +127,11 @@ try:
     preprocessor = TextPreprocessor()
     trust_calculator = TrustScoreCalculator()
     
+    if Config.MICRO_BATCH_ENABLED and not Config.INFERENCE_SOCKET:
+        fake_news_detector.enable_micro_batching(Config.MICRO_BATCH_MAX_SIZE, Config.MICRO_BATCH_MAX_WAIT_MS)
+        sentiment_analyzer.enable_micro_batching(Config.MICRO_BATCH_MAX_SIZE, Config.MICRO_BATCH_MAX_WAIT_MS)
+        logger.info("✅ Micro-batching scheduler enabled")
+    
     logger.info("✅ All models loaded successfully!")
     
 except Exception as e:
@@ -121,7 +174,7 @@ CORS(app, resources={
             "http://localhost:5173"
         ],
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"],
+        "allow_headers": ["Content-Type", "Authorization", "X-API-Key"],
         "supports_credentials": True,
         "max_age": 3600
     }
@@ -140,10 +193,15 @@ def home():
         'status': 'running',
         'endpoints': {
             'analyze': '/api/analyze [POST]',
+            'analyze_stream': '/api/analyze/stream [POST, text/event-stream]',
+            'analyze_batch': '/api/analyze/batch [POST]',
             'signup': '/api/auth/signup [POST]',
             'login': '/api/auth/login [POST]',
+            'api_key': '/api/auth/api-key [POST]',
             'history': '/api/history [GET]',
-            'health': '/api/health [GET]'
+            'usage': '/api/usage [GET]',
+            'health': '/api/health [GET]',
+            'metrics': '/api/metrics [GET]'
         }
     })
 
@@ -156,6 +214,29 @@ def health():
         'timestamp': datetime.utcnow().isoformat()
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Runtime metrics for tuning"""
+    inference = {}
+    for name, model in (('fake_news', fake_news_detector), ('sentiment', sentiment_analyzer)):
+        if model is not None and model.scheduler is not None:
+            inference[name] = model.scheduler.stats()
+    
+    return jsonify({
+        'inference_scheduler': inference,
+        'result_cache': result_cache.stats() if result_cache else None,
+        'source_registry': source_validator.registry.stats() if source_validator else None,
+        'domain_reputation': source_validator.reputation.stats() if source_validator else None,
+        'image_hash_index': image_verifier.hash_index.stats() if image_verifier and image_verifier.hash_index else None,
+        'claim_cache': fact_checker.cache.stats() if fact_checker and fact_checker.cache else None,
+        'daily_quota': daily_quota.stats(),
+        'auth_cache': auth_cache.stats(),
+        'write_behind': analysis_writer.stats() if analysis_writer else None,
+        'http': http_client.stats(),
+        'memory': memory_report(),
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
 # ==================== AUTH ROUTES ====================
 
 @app.route('/api/auth/signup', methods=['POST'])
@@ -178,7 +259,6 @@ def signup():
         
         user = User(email=email, name=name)
         user.set_password(password)
-        user.generate_api_key()
         
         db.session.add(user)
         db.session.commit()
@@ -238,36 +318,187 @@ def get_me(user):
     """Get current user"""
     return jsonify({'user': user.to_dict()})
 
+@app.route('/api/auth/api-key', methods=['POST'])
+@limiter.limit("10 per hour")
+@login_required
+def rotate_api_key(user):
+    """Issue a new API key for machine clients, revoking the previous one"""
+    try:
+        account = db.session.get(User, user.id)
+        api_key = account.generate_api_key()
+        db.session.commit()
+        
+        logger.info(f"API key issued for user {user.id}")
+        return jsonify({
+            'message': 'Store this key now; it cannot be shown again',
+            'api_key': api_key
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"API key error: {e}")
+        return jsonify({'error': 'Could not issue API key'}), 500
+
+@app.route('/api/usage', methods=['GET'])
+@login_required
+def get_usage(user):
+    """Get today's analysis quota"""
+    try:
+        return jsonify(daily_quota.usage(user))
+    except Exception as e:
+        logger.error(f"Usage error: {e}")
+        return jsonify({'error': 'Failed to fetch usage'}), 500
+
 # ==================== ANALYSIS ROUTES ====================
 
+def check_daily_limit(user, requested=1):
+    """Reserve `requested` analyses from today's quota or raise"""
+    if not daily_quota.reserve(user, requested):
+        raise ValidationError(f"Daily limit of {daily_quota.limit_for(user)} analyses reached")
+
+def build_stages(models, cleaned_text, url, image_url, precomputed=None):
+    """Split one document's analyses into known results and runnable stages.
+
+    `precomputed` may hold model outputs already produced by a batched pass.
+    Returns the results dict (stages not run yet are None) and a mapping of
+    stage name to zero-argument callable.
+    """
+    precomputed = precomputed or {}
+    results = {
+        'fake_news_detection': None,
+        'sentiment_analysis': None,
+        'bias_detection': None,
+        'fact_checking': None,
+        'source_validation': None,
+        'image_verification': None
+    }
+    stages = {}
+    
+    # Text analysis
+    if cleaned_text and len(cleaned_text) > 20:
+        logger.info(f"Analyzing text ({len(cleaned_text)} chars)")
+        if precomputed.get('fake_news_detection'):
+            results['fake_news_detection'] = precomputed['fake_news_detection']
+        else:
+            stages['fake_news_detection'] = partial(models['fake_news_detector'].predict, cleaned_text)
+        if precomputed.get('sentiment_analysis'):
+            results['sentiment_analysis'] = precomputed['sentiment_analysis']
+        else:
+            stages['sentiment_analysis'] = partial(models['sentiment_analyzer'].analyze_emotions, cleaned_text)
+        stages['bias_detection'] = partial(models['bias_detector'].detect_bias, cleaned_text)
+        
+        if len(cleaned_text) > 100:
+            stages['fact_checking'] = partial(models['fact_checker'].verify_claims, cleaned_text)
+    
+    # Source validation
+    if url:
+        logger.info(f"Validating source: {url}")
+        stages['source_validation'] = partial(models['source_validator'].validate_source, url)
+    
+    # Image verification
+    if image_url:
+        logger.info(f"Verifying image: {image_url}")
+        stages['image_verification'] = partial(models['image_verifier'].verify_image, image_url)
+    
+    return results, stages
+
+def iter_analyses(models, results, stages):
+    """Run stages concurrently, filling `results` in place.
+
+    Yields (stage, result) as each stage completes and finally
+    ('overall_trust_score', score) once every stage is in.
+    """
+    for name, result in analysis_pipeline.iter_results(stages):
+        results[name] = result
+        yield name, result
+    
+    # Calculate trust score
+    results['overall_trust_score'] = models['trust_calculator'].calculate(results)
+    yield 'overall_trust_score', results['overall_trust_score']
+
+def run_analyses(models, cleaned_text, url, image_url, precomputed=None):
+    """Run every analyzer for one document concurrently and attach the trust score"""
+    results, stages = build_stages(models, cleaned_text, url, image_url, precomputed)
+    for _ in iter_analyses(models, results, stages):
+        pass
+    return results
+
+def build_analysis(user, content_hash, text, cleaned_text, url, image_url, results):
+    """Build the history record of one analysis"""
+    trust_score = results['overall_trust_score']
+    return {
+        'user_id': user.id,
+        'content_hash': content_hash,
+        'content_type': 'text' if text else ('url' if url else 'image'),
+        'content_preview': (cleaned_text[:500] if cleaned_text else url[:500] if url else image_url[:500]),
+        'trust_score': trust_score['score'],
+        'grade': trust_score['grade'],
+        'created_at': datetime.now(timezone.utc),
+        'result': results
+    }
+
+def write_analyses(records):
+    """Insert history records in one transaction"""
+    with app.app_context():
+        try:
+            for record in records:
+                record = dict(record)
+                result = record.pop('result')
+                db.session.add(Analysis(result_hash=AnalysisBlob.store(result), **record))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+def save_analyses(records):
+    """Persist history records through the write-behind queue when enabled"""
+    if analysis_writer:
+        analysis_writer.submit(records)
+    else:
+        write_analyses(records)
+
+def parse_analysis_request():
+    """Read text, url and image_url from the request body or raise"""
+    data = request.get_json()
+    if not data:
+        raise ValidationError('No data provided')
+    
+    text = data.get('text', '').strip()
+    url = data.get('url', '').strip()
+    image_url = data.get('image_url', '').strip()
+    
+    if not text and not url and not image_url:
+        raise ValidationError('Provide text, URL, or image URL')
+    return text, url, image_url
+
+def complete_analysis(user, content_hash, text, cleaned_text, url, image_url, results, cache_tier):
+    """Cache and save a finished analysis and return the response body"""
+    if cache_tier is None and result_cache:
+        result_cache.set(content_hash, results)
+    
+    # Save to database
+    if user:
+        try:
+            save_analyses([build_analysis(user, content_hash, text, cleaned_text, url, image_url, results)])
+        except Exception as e:
+            logger.error(f"Save error: {e}")
+    
+    logger.info(f"✅ Analysis complete - Score: {results['overall_trust_score']['score']}")
+    return dict(results, cache_hit=cache_tier is not None)
+
 @app.route('/api/analyze', methods=['POST'])
 @limiter.limit("30 per hour")
 @optional_auth
 def analyze(user=None):
     """Main analysis endpoint"""
+    reserved = 0
     try:
-        data = request.get_json()
-        if not data:
-            raise ValidationError('No data provided')
-        
-        text = data.get('text', '').strip()
-        url = data.get('url', '').strip()
-        image_url = data.get('image_url', '').strip()
-        
-        if not text and not url and not image_url:
-            raise ValidationError('Provide text, URL, or image URL')
+        text, url, image_url = parse_analysis_request()
         
         # Check rate limit for logged-in users
         if user:
-            today_start = datetime.combine(date.today(), datetime.min.time())
-            today_count = Analysis.query.filter(
-                Analysis.user_id == user.id,
-                Analysis.created_at >= today_start
-            ).count()
-            
-            limit = Config.RATE_LIMIT_FREE if user.subscription_tier == 'free' else Config.RATE_LIMIT_PRO
-            if today_count >= limit:
-                raise ValidationError(f"Daily limit of {limit} analyses reached")
+            check_daily_limit(user)
+            reserved = 1
         
         # Load models on first request (lazy loading)
         models = get_models()
@@ -276,94 +507,240 @@ def analyze(user=None):
         cleaned_text = models['preprocessor'].clean_text(text) if text else ""
         
         # Generate hash
-        content_hash = hashlib.md5(f"{cleaned_text}{url}{image_url}".encode()).hexdigest()
+        content_hash = compute_content_hash(cleaned_text, url, image_url)
         
-        # Run analyses
-        results = {}
+        # Reuse a previous analysis of the same content when possible
+        results, cache_tier = result_cache.get(content_hash) if result_cache else (None, None)
+        if results is None:
+            results = run_analyses(models, cleaned_text, url, image_url)
+        else:
+            logger.info(f"Result cache hit ({cache_tier})")
         
-        # Text analysis
-        if cleaned_text and len(cleaned_text) > 20:
-            logger.info(f"Analyzing text ({len(cleaned_text)} chars)")
-            results['fake_news_detection'] = models['fake_news_detector'].predict(cleaned_text)
-            results['sentiment_analysis'] = models['sentiment_analyzer'].analyze_emotions(cleaned_text)
-            results['bias_detection'] = models['bias_detector'].detect_bias(cleaned_text)
-            
-            if len(cleaned_text) > 100:
-                results['fact_checking'] = models['fact_checker'].verify_claims(cleaned_text)
+        return jsonify(complete_analysis(user, content_hash, text, cleaned_text, url, image_url, results, cache_tier))
+        
+    except ValidationError as e:
+        return jsonify({'error': e.message}), e.status_code
+    except Exception as e:
+        logger.error(f"Analysis error: {e}")
+        if reserved:
+            daily_quota.release(user, reserved)
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': 'Analysis failed'}), 500
+
+def sse_event(event, data):
+    """Format one Server-Sent Event, encoding data like jsonify does"""
+    return f"event: {event}\ndata: {app.json.dumps(data)}\n\n"
+
+@app.route('/api/analyze/stream', methods=['POST'])
+@limiter.limit("30 per hour")
+@optional_auth
+def analyze_stream(user=None):
+    """Analysis endpoint that streams each stage's result as Server-Sent Events.
+
+    Events: 'start' (pending stages), one 'stage' per analyzer as it
+    completes, 'score' with the trust score and grade, then 'result' with
+    exactly the body /api/analyze would return. Failures end with 'error'.
+    """
+    reserved = 0
+    try:
+        text, url, image_url = parse_analysis_request()
+        
+        # Check rate limit for logged-in users
+        if user:
+            check_daily_limit(user)
+            reserved = 1
+        
+        models = get_models()
+        cleaned_text = models['preprocessor'].clean_text(text) if text else ""
+        content_hash = compute_content_hash(cleaned_text, url, image_url)
+        cached, cache_tier = result_cache.get(content_hash) if result_cache else (None, None)
+        
+    except ValidationError as e:
+        return jsonify({'error': e.message}), e.status_code
+    except Exception as e:
+        logger.error(f"Analysis error: {e}")
+        if reserved:
+            daily_quota.release(user, reserved)
+        return jsonify({'error': 'Analysis failed'}), 500
+    
+    def generate():
+        try:
+            if cached is None:
+                results, stages = build_stages(models, cleaned_text, url, image_url)
+                updates = iter_analyses(models, results, stages)
             else:
-                results['fact_checking'] = None
-        else:
-            results['fake_news_detection'] = None
-            results['sentiment_analysis'] = None
-            results['bias_detection'] = None
-            results['fact_checking'] = None
-        
-        # Source validation
-        if url:
-            logger.info(f"Validating source: {url}")
-            results['source_validation'] = models['source_validator'].validate_source(url)
-        else:
-            results['source_validation'] = None
+                logger.info(f"Result cache hit ({cache_tier})")
+                results = cached
+                stages = {name: None for name, result in cached.items()
+                          if result is not None and name != 'overall_trust_score'}
+                updates = ((name, cached[name]) for name in list(stages) + ['overall_trust_score'])
+            
+            yield sse_event('start', {'stages': list(stages), 'cache_hit': cached is not None})
+            for name, result in updates:
+                if name == 'overall_trust_score':
+                    yield sse_event('score', result)
+                else:
+                    yield sse_event('stage', {'stage': name, 'result': result})
+            
+            body = complete_analysis(user, content_hash, text, cleaned_text, url, image_url, results, cache_tier)
+            yield sse_event('result', body)
+            
+        except Exception as e:
+            logger.error(f"Streaming analysis error: {e}")
+            if reserved:
+                daily_quota.release(user, reserved)
+            yield sse_event('error', {'error': 'Analysis failed'})
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # keep reverse proxies from holding events back
+    })
+
+@app.route('/api/analyze/batch', methods=['POST'])
+@limiter.limit("10 per hour")
+@optional_auth
+def analyze_batch(user=None):
+    """Analyze many documents with batched model inference"""
+    reserved = 0
+    try:
+        data = request.get_json()
+        if not data:
+            raise ValidationError('No data provided')
         
-        # Image verification
-        if image_url:
-            logger.info(f"Verifying image: {image_url}")
-            results['image_verification'] = models['image_verifier'].verify_image(image_url)
-        else:
-            results['image_verification'] = None
+        items = data.get('items')
+        if not isinstance(items, list) or not items:
+            raise ValidationError('Provide a non-empty list of items')
+        if len(items) > Config.BATCH_MAX_ITEMS:
+            raise ValidationError(f"Batch size is limited to {Config.BATCH_MAX_ITEMS} items")
         
-        # Calculate trust score
-        trust_score = models['trust_calculator'].calculate(results)
-        results['overall_trust_score'] = trust_score
+        # Plain strings are shorthand for text-only items
+        items = [{'text': item} if isinstance(item, str) else item for item in items]
+        if not all(isinstance(item, dict) for item in items):
+            raise ValidationError('Each item must be an object or a string')
         
-        # Save to database
         if user:
+            check_daily_limit(user, requested=len(items))
+            reserved = len(items)
+        
+        models = get_models()
+        
+        documents = []
+        for item in items:
+            text = (item.get('text') or '').strip()
+            url = (item.get('url') or '').strip()
+            image_url = (item.get('image_url') or '').strip()
+            cleaned_text = models['preprocessor'].clean_text(text) if text else ""
+            content_hash = compute_content_hash(cleaned_text, url, image_url)
+            cached, _ = result_cache.get(content_hash) if result_cache else (None, None)
+            documents.append((text, cleaned_text, url, image_url, content_hash, cached))
+        
+        # One batched forward pass per model for every uncached document with enough text
+        text_indices = [
+            i for i, doc in enumerate(documents)
+            if doc[5] is None and doc[1] and len(doc[1]) > 20
+        ]
+        batch_texts = [documents[i][1] for i in text_indices]
+        logger.info(f"Batch analysis: {len(documents)} items, {len(batch_texts)} texts")
+        
+        precomputed = {i: {} for i in range(len(documents))}
+        if batch_texts:
+            fake_news = models['fake_news_detector'].predict_batch(batch_texts)
+            sentiment = models['sentiment_analyzer'].analyze_emotions_batch(batch_texts)
+            for i, fake, senti in zip(text_indices, fake_news, sentiment):
+                precomputed[i] = {'fake_news_detection': fake, 'sentiment_analysis': senti}
+        
+        batch_results = []
+        records = []
+        for i, (text, cleaned_text, url, image_url, content_hash, cached) in enumerate(documents):
+            if not text and not url and not image_url:
+                batch_results.append({'error': 'Provide text, URL, or image URL'})
+                continue
+            
+            if cached is not None:
+                results = cached
+            else:
+                results = run_analyses(models, cleaned_text, url, image_url, precomputed[i])
+                if result_cache:
+                    result_cache.set(content_hash, results)
+            batch_results.append(dict(results, cache_hit=cached is not None))
+            
+            if user:
+                records.append(build_analysis(user, content_hash, text, cleaned_text, url, image_url, results))
+        
+        if user:
+            # Items rejected as empty do not count against the quota
+            invalid = sum(1 for r in batch_results if 'error' in r)
+            if invalid:
+                daily_quota.release(user, invalid)
             try:
-                analysis = Analysis(
-                    user_id=user.id,
-                    content_hash=content_hash,
-                    content_type='text' if text else ('url' if url else 'image'),
-                    content_preview=(cleaned_text[:500] if cleaned_text else url[:500] if url else image_url[:500]),
-                    trust_score=trust_score['score'],
-                    grade=trust_score['grade'],
-                    analysis_result=results
-                )
-                db.session.add(analysis)
-                db.session.commit()
-                logger.info(f"Analysis saved for user {user.id}")
+                save_analyses(records)
             except Exception as e:
                 logger.error(f"Save error: {e}")
-                db.session.rollback()
         
-        logger.info(f"✅ Analysis complete - Score: {trust_score['score']}")
-        return jsonify(results)
+        return jsonify({
+            'results': batch_results,
+            'count': len(batch_results)
+        })
         
     except ValidationError as e:
         return jsonify({'error': e.message}), e.status_code
     except Exception as e:
-        logger.error(f"Analysis error: {e}")
+        logger.error(f"Batch analysis error: {e}")
+        if reserved:
+            daily_quota.release(user, reserved)
         import traceback
         traceback.print_exc()
-        return jsonify({'error': 'Analysis failed'}), 500
+        return jsonify({'error': 'Batch analysis failed'}), 500
 
 @app.route('/api/history', methods=['GET'])
 @login_required
 def get_history(user):
-    """Get user's analysis history"""
+    """Get user's analysis history.
+    
+    Newest first, paginated by `cursor` (the `next_cursor` of the previous
+    page). Rows are summaries unless `full=1`; `page` keeps the old
+    offset-based pagination working.
+    """
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+        full = request.args.get('full', '0').lower() in ('1', 'true')
+        cursor = request.args.get('cursor')
+        
+        query = Analysis.query.filter(Analysis.user_id == user.id)
+        if full:
+            query = query.options(undefer(Analysis.analysis_result))
+        else:
+            query = query.options(load_only(
+                Analysis.id, Analysis.content_type, Analysis.content_preview,
+                Analysis.trust_score, Analysis.grade, Analysis.created_at
+            ))
+        query = query.order_by(Analysis.created_at.desc(), Analysis.id.desc())
+        serialize = Analysis.to_dict if full else Analysis.to_summary_dict
         
-        analyses = Analysis.query.filter_by(user_id=user.id)\
-            .order_by(Analysis.created_at.desc())\
-            .paginate(page=page, per_page=per_page, error_out=False)
+        if 'page' in request.args and not cursor:
+            page = request.args.get('page', 1, type=int)
+            analyses = query.paginate(page=page, per_page=per_page, error_out=False)
+            if full:
+                Analysis.preload_results(analyses.items)
+            return jsonify({
+                'analyses': [serialize(a) for a in analyses.items],
+                'total': analyses.total,
+                'page': page,
+                'pages': analyses.pages
+            })
+        
+        rows, next_cursor = keyset_page(query, Analysis.created_at, Analysis.id, per_page, cursor)
+        if full:
+            Analysis.preload_results(rows)
         
         return jsonify({
-            'analyses': [a.to_dict() for a in analyses.items],
-            'total': analyses.total,
-            'page': page,
-            'pages': analyses.pages
+            'analyses': [serialize(a) for a in rows],
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
         })
+    except ValidationError as e:
+        return jsonify({'error': e.message}), e.status_code
     except Exception as e:
         logger.error(f"History error: {e}")
         return jsonify({'error': 'Failed to fetch history'}), 500
@@ -1,9 +1,13 @@
 from functools import wraps
 from flask import request, jsonify
 import jwt
+import threading
+import time
 from datetime import datetime, timedelta
+from sqlalchemy import event, inspect, select
 from config import Config
-from database import User
+from database import db, User, hash_api_key
+from utils.cache import TTLCache
 
 def generate_token(user_id):
     """Generate JWT token"""
@@ -14,30 +18,183 @@ def generate_token(user_id):
     }
     return jwt.encode(payload, Config.JWT_SECRET_KEY, algorithm=Config.JWT_ALGORITHM)
 
-def verify_token(token):
-    """Verify JWT token"""
+def decode_token(token):
+    """Verify JWT token and return its payload"""
     try:
-        payload = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=[Config.JWT_ALGORITHM])
-        return payload['user_id']
+        return jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=[Config.JWT_ALGORITHM])
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
+def verify_token(token):
+    """Verify JWT token"""
+    payload = decode_token(token)
+    return payload['user_id'] if payload else None
+
+
+class UserSnapshot:
+    """Read-only copy of the user fields routes need, safe to share between requests"""
+
+    __slots__ = ('id', 'email', 'name', 'subscription_tier', 'created_at')
+
+    def __init__(self, user):
+        self.id = user.id
+        self.email = user.email
+        self.name = user.name
+        self.subscription_tier = user.subscription_tier
+        self.created_at = user.created_at
+
+    to_dict = User.to_dict
+
+
+class AuthCache:
+    """Verified credential -> UserSnapshot, so authenticated requests skip JWT
+    verification and loading the user.
+
+    Entries are keyed by JWT or API key hash and tagged with the user's
+    `auth_version`; a hit is only checked against the newest version this
+    worker knows of, without touching the database. Changes committed here
+    raise that version at once. Every `revalidate_interval` seconds one query
+    re-reads the versions of all cached users, so changes made by other
+    workers are seen within that interval.
+    """
+
+    def __init__(self, max_size=10000, ttl=60, revalidate_interval=5):
+        self.cache = TTLCache(max_size=max_size, ttl=ttl)
+        self.revalidate_interval = revalidate_interval
+        self.versions = {}  # user id -> newest auth_version seen, None once deleted
+        self.stale = 0
+        self.revalidations = 0
+        self._checked_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._revalidating = threading.Lock()
+
+    def get(self, key):
+        if time.monotonic() - self._checked_at >= self.revalidate_interval:
+            self.revalidate()
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        snapshot, version = entry
+        if self.versions.get(snapshot.id, version) != version:
+            self.cache.delete(key)
+            self.stale += 1
+            return None
+        return snapshot
+
+    def set(self, key, user, ttl=None):
+        snapshot = UserSnapshot(user)
+        with self._lock:
+            known = self.versions.get(user.id)
+            if known is not None and user.auth_version < known:
+                # Loaded before a change this worker has already seen committed
+                return snapshot
+            self.versions[user.id] = user.auth_version
+        self.cache.set(key, (snapshot, user.auth_version), ttl=ttl)
+        return snapshot
+
+    def record(self, user_id, version):
+        """Note a committed auth_version (None for a deleted user)"""
+        with self._lock:
+            known = self.versions.get(user_id, version)
+            self.versions[user_id] = None if version is None or known is None else max(known, version)
+
+    def revalidate(self):
+        """Re-read auth_version for every cached user in one query per 500 users"""
+        if not self._revalidating.acquire(blocking=False):
+            return  # another thread is on it
+        try:
+            self._checked_at = time.monotonic()
+            user_ids = sorted({snapshot.id for snapshot, _ in self.cache.values()})
+            current = {}
+            for start in range(0, len(user_ids), 500):
+                chunk = user_ids[start:start + 500]
+                current.update(db.session.execute(select(User.id, User.auth_version).where(User.id.in_(chunk))).all())
+            with self._lock:
+                versions = {}
+                for user_id in user_ids:
+                    version, known = current.get(user_id), self.versions.get(user_id)
+                    # Never step back behind a commit this worker saw during the query
+                    versions[user_id] = version if version is None or known is None else max(known, version)
+                self.versions = versions
+            self.revalidations += 1
+        finally:
+            self._revalidating.release()
+
+    def clear(self):
+        self.cache.clear()
+        with self._lock:
+            self.versions = {}
+
+    def stats(self):
+        return dict(self.cache.stats(), ttl=self.cache.ttl, stale=self.stale,
+                    revalidate_interval=self.revalidate_interval, revalidations=self.revalidations)
+
+
+auth_cache = AuthCache(max_size=Config.AUTH_CACHE_SIZE, ttl=Config.AUTH_CACHE_TTL,
+                       revalidate_interval=Config.AUTH_CACHE_REVALIDATE_INTERVAL)
+
+# Changes that must not be served from a stale snapshot
+_AUTH_FIELDS = ('email', 'name', 'subscription_tier', 'password_hash', 'api_key_hash')
+
+@event.listens_for(User, 'before_update')
+def _bump_auth_version(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in _AUTH_FIELDS):
+        target.auth_version = (target.auth_version or 0) + 1
+        state.session.info.setdefault('auth_versions', {})[target.id] = target.auth_version
+
+@event.listens_for(User, 'after_delete')
+def _user_deleted(mapper, connection, target):
+    inspect(target).session.info.setdefault('auth_versions', {})[target.id] = None
+
+# The app's own sessions only; the new versions reach other workers through revalidate()
+@event.listens_for(db.session, 'after_commit')
+def _session_committed(session):
+    for user_id, version in session.info.pop('auth_versions', {}).items():
+        auth_cache.record(user_id, version)
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _session_rolled_back(session, previous_transaction):
+    session.info.pop('auth_versions', None)
+
+def _user_from_token(token):
+    snapshot = auth_cache.get(('jwt', token))
+    if snapshot is not None:
+        return snapshot
+
+    payload = decode_token(token)
+    if not payload:
+        return None
+    # populate_existing: a cache miss must see the row as it is now, not a copy the session holds
+    user = db.session.get(User, payload.get('user_id'), populate_existing=True)
+    if not user:
+        return None
+    # Never cache a token past its own expiry
+    ttl = min(auth_cache.cache.ttl, payload.get('exp', 0) - time.time())
+    return auth_cache.set(('jwt', token), user, ttl=ttl) if ttl > 0 else UserSnapshot(user)
+
+def _user_from_api_key(api_key):
+    key_hash = hash_api_key(api_key)
+    snapshot = auth_cache.get(('api_key', key_hash))
+    if snapshot is not None:
+        return snapshot
+
+    user = User.query.filter_by(api_key_hash=key_hash).execution_options(populate_existing=True).first()
+    return auth_cache.set(('api_key', key_hash), user) if user else None
+
 def get_current_user():
-    """Get current user from request"""
+    """Get current user from request (Bearer JWT or X-API-Key)"""
+    api_key = request.headers.get('X-API-Key')
+    if api_key:
+        return _user_from_api_key(api_key)
+
     auth_header = request.headers.get('Authorization')
     if not auth_header:
         return None
-    
-    try:
-        token = auth_header.split(' ')[1] if ' ' in auth_header else auth_header
-        user_id = verify_token(token)
-        if user_id:
-            return User.query.get(user_id)
-    except:
-        pass
-    return None
+    token = auth_header.split(' ')[1] if ' ' in auth_header else auth_header
+    return _user_from_token(token)  # decode_token turns invalid and expired tokens into None
 
 def login_required(f):
     """Decorator for protected routes"""
@@ -55,4 +212,4 @@ def optional_auth(f):
     def decorated_function(*args, **kwargs):
         user = get_current_user()
         return f(user=user, *args, **kwargs)
-    return decorated_function
\ No newline at end of file
+    return decorated_function
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,19 +24,29 @@ class Config:
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret')
     JWT_ALGORITHM = 'HS256'
     JWT_EXPIRATION_HOURS = 24
+    # Verified token / API key -> user snapshot; other workers' changes to users.auth_version
+    # are picked up within AUTH_CACHE_REVALIDATE_INTERVAL seconds
+    AUTH_CACHE_TTL = int(os.getenv('AUTH_CACHE_TTL', 60))
+    AUTH_CACHE_SIZE = int(os.getenv('AUTH_CACHE_SIZE', 10000))
+    AUTH_CACHE_REVALIDATE_INTERVAL = float(os.getenv('AUTH_CACHE_REVALIDATE_INTERVAL', 5))
     
     # Database
-    # Always use /tmp for production (Render, Railway, etc.)
-    # Don't use DATABASE_URL env var if it's SQLite - use our logic instead
+    # A non-SQLite DATABASE_URL (e.g. PostgreSQL) is used as given in every environment.
+    # Otherwise production uses SQLite in /tmp (Render, Railway, etc.), unless DATABASE_URL
+    # points at an absolute SQLite path such as a mounted disk.
     env_db_url = os.getenv('DATABASE_URL', '')
+    if env_db_url.startswith('postgres://'):
+        # Heroku/Render-style scheme, which SQLAlchemy no longer accepts
+        env_db_url = 'postgresql://' + env_db_url[len('postgres://'):]
     
-    if os.getenv('FLASK_ENV') == 'production' or env_db_url.startswith('sqlite:///database/'):
+    if env_db_url and not env_db_url.startswith('sqlite:'):
+        DATABASE_URL = env_db_url
+    elif env_db_url.startswith('sqlite:////'):
+        DATABASE_URL = env_db_url
+    elif os.getenv('FLASK_ENV') == 'production' or env_db_url.startswith('sqlite:///database/'):
         # Production or invalid SQLite path - use /tmp
         DB_PATH = '/tmp/truthlens.db'
         DATABASE_URL = f'sqlite:///{DB_PATH}'
-    elif env_db_url and not env_db_url.startswith('sqlite:///'):
-        # Use provided DATABASE_URL if it's not SQLite (e.g., PostgreSQL)
-        DATABASE_URL = env_db_url
     else:
         # Local development
         BASE_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -45,18 +56,131 @@ class Config:
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Connection pool (per worker process)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))  # seconds, PostgreSQL only
+    DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', 10))  # seconds, PostgreSQL only
+    
+    # SQLite connection profile: tuned (WAL and the settings below) or default (SQLite's own)
+    SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'tuned')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', 64 * 1024))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    
     # Model Settings
     FAKE_NEWS_MODEL = "hamzab/roberta-fake-news-classification"
     SENTIMENT_MODEL = "cardiffnlp/twitter-roberta-base-sentiment"
     
+    # Inference backend: fp32 (eager), int8 (dynamic quantization) or traced (TorchScript)
+    INFERENCE_BACKEND = os.getenv('INFERENCE_BACKEND', 'fp32')
+    TORCH_NUM_THREADS = int(os.getenv('TORCH_NUM_THREADS', 0))  # 0 = torch default
+    
+    # Out-of-process inference server (empty = run models inside the web worker)
+    INFERENCE_SOCKET = os.getenv('INFERENCE_SOCKET', '')
+    INFERENCE_SERVER_WORKERS = int(os.getenv('INFERENCE_SERVER_WORKERS', 2))
+    INFERENCE_CLIENT_TIMEOUT = float(os.getenv('INFERENCE_CLIENT_TIMEOUT', 60))
+    
+    # Batched inference
+    INFERENCE_BATCH_SIZE = int(os.getenv('INFERENCE_BATCH_SIZE', 16))
+    BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', 50))
+    
+    # Long-document mode: classify overlapping token windows instead of the first 512 characters
+    LONG_DOC_ENABLED = os.getenv('LONG_DOC_ENABLED', 'false').lower() == 'true'
+    LONG_DOC_STRIDE = int(os.getenv('LONG_DOC_STRIDE', 128))  # tokens shared by consecutive windows
+    LONG_DOC_MAX_WINDOWS = int(os.getenv('LONG_DOC_MAX_WINDOWS', 16))
+    LONG_DOC_AGGREGATION = os.getenv('LONG_DOC_AGGREGATION', 'mean')  # mean, max or weighted
+    
+    # Cross-request micro-batching (useful with GUNICORN_THREADS > 1)
+    MICRO_BATCH_ENABLED = os.getenv('MICRO_BATCH_ENABLED', 'false').lower() == 'true'
+    MICRO_BATCH_MAX_SIZE = int(os.getenv('MICRO_BATCH_MAX_SIZE', 16))
+    MICRO_BATCH_MAX_WAIT_MS = float(os.getenv('MICRO_BATCH_MAX_WAIT_MS', 5))
+    
+    # Bundled data files
+    DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    
+    # Stored analysis results: compressed, deduplicated blobs (zlib, or zstd when zstandard is installed)
+    RESULT_BLOB_CODEC = os.getenv('RESULT_BLOB_CODEC', 'zlib')
+    RESULT_BLOB_LEVEL = int(os.getenv('RESULT_BLOB_LEVEL', 6))
+    
+    # Write-behind persistence of history rows; when the queue is full the policy is
+    # block (wait, then write inline), sync (write inline) or drop
+    WRITE_BEHIND_ENABLED = os.getenv('WRITE_BEHIND_ENABLED', 'true').lower() == 'true'
+    WRITE_BEHIND_BATCH_SIZE = int(os.getenv('WRITE_BEHIND_BATCH_SIZE', 100))
+    WRITE_BEHIND_MAX_PENDING = int(os.getenv('WRITE_BEHIND_MAX_PENDING', 5000))
+    WRITE_BEHIND_MAX_DELAY_MS = float(os.getenv('WRITE_BEHIND_MAX_DELAY_MS', 50))
+    WRITE_BEHIND_POLICY = os.getenv('WRITE_BEHIND_POLICY', 'block')
+    
+    # Bias and manipulation lexicons: JSON files mapping category -> terms
+    LEXICON_DIR = os.getenv('LEXICON_DIR', os.path.join(DATA_DIR, 'lexicons'))
+    
+    # Analysis pipeline (1 = run stages sequentially)
+    PIPELINE_MAX_WORKERS = int(os.getenv('PIPELINE_MAX_WORKERS', 8))
+    
+    # Analysis result cache
+    RESULT_CACHE_ENABLED = os.getenv('RESULT_CACHE_ENABLED', 'true').lower() == 'true'
+    RESULT_CACHE_VERSION = os.getenv('RESULT_CACHE_VERSION', 'v1')
+    RESULT_CACHE_SIZE = int(os.getenv('RESULT_CACHE_SIZE', 1024))
+    RESULT_CACHE_TTL = int(os.getenv('RESULT_CACHE_TTL', 3600))  # seconds, in-process tier
+    RESULT_CACHE_DB_TTL = int(os.getenv('RESULT_CACHE_DB_TTL', 86400))  # seconds, database tier
+    
+    # Fact checking: claims are queried concurrently under one overall deadline
+    FACT_CHECK_MAX_CLAIMS = int(os.getenv('FACT_CHECK_MAX_CLAIMS', 3))  # raising it costs Fact Check API quota
+    FACT_CHECK_DEADLINE = float(os.getenv('FACT_CHECK_DEADLINE', 8))  # seconds
+    FACT_CHECK_CONCURRENCY = int(os.getenv('FACT_CHECK_CONCURRENCY', 8))
+    
+    # Fact Check claim cache (CLAIM_CACHE_PATH enables SQLite persistence)
+    CLAIM_CACHE_ENABLED = os.getenv('CLAIM_CACHE_ENABLED', 'true').lower() == 'true'
+    CLAIM_CACHE_SIZE = int(os.getenv('CLAIM_CACHE_SIZE', 10000))
+    CLAIM_CACHE_TTL = int(os.getenv('CLAIM_CACHE_TTL', 86400))  # seconds, claims with a fact check
+    CLAIM_CACHE_NEGATIVE_TTL = int(os.getenv('CLAIM_CACHE_NEGATIVE_TTL', 3600))  # seconds, claims without one
+    CLAIM_CACHE_PATH = os.getenv('CLAIM_CACHE_PATH', '')
+    
+    # NewsAPI source registry
+    NEWSAPI_REFRESH_HOURS = float(os.getenv('NEWSAPI_REFRESH_HOURS', 24))
+    NEWSAPI_SOURCES_CACHE = os.getenv(
+        'NEWSAPI_SOURCES_CACHE', os.path.join(tempfile.gettempdir(), 'truthlens-newsapi-sources.json')
+    )
+    NEWSAPI_TIMEOUT = 5
+    
+    # Domain reputation index built by tools/build_domain_index.py, and the
+    # Public Suffix List (https://publicsuffix.org/list/public_suffix_list.dat)
+    DOMAIN_REPUTATION_PATH = os.getenv('DOMAIN_REPUTATION_PATH', os.path.join(DATA_DIR, 'domain_reputation.idx'))
+    PUBLIC_SUFFIX_LIST = os.getenv('PUBLIC_SUFFIX_LIST', os.path.join(DATA_DIR, 'public_suffix_list.dat'))
+    
+    # Image acquisition limits
+    IMAGE_MAX_BYTES = int(os.getenv('IMAGE_MAX_BYTES', 15 * 1024 * 1024))
+    IMAGE_MAX_PIXELS = int(os.getenv('IMAGE_MAX_PIXELS', 50_000_000))
+    ELA_TILE_SIZE = int(os.getenv('ELA_TILE_SIZE', 32))
+    
+    # Local perceptual-hash index consulted before Google reverse search (empty path disables it)
+    IMAGE_HASH_INDEX_PATH = os.getenv(
+        'IMAGE_HASH_INDEX_PATH', os.path.join(tempfile.gettempdir(), 'truthlens-image-hashes.db')
+    )
+    PHASH_MAX_DISTANCE = int(os.getenv('PHASH_MAX_DISTANCE', 8))
+    
+    # Shared HTTP client
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05))
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 2))
+    HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', 0.3))
+    HTTP_POOL_HOSTS = int(os.getenv('HTTP_POOL_HOSTS', 20))  # per-host pools kept per service
+    
     # API Endpoints
     FACT_CHECK_URL = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
     NEWS_API_URL = "https://newsapi.org/v2/everything"
+    NEWSAPI_SOURCES_URL = "https://newsapi.org/v2/sources"
     GOOGLE_CUSTOM_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
     
     # CORS
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
     
     # Rate Limiting
+    # Shared by all workers on the host; any `limits` URI (e.g. redis://host:6379) works across hosts
+    RATELIMIT_STORAGE_URI = os.getenv(
+        'RATELIMIT_STORAGE_URI', f"sqlite:///{os.path.join(tempfile.gettempdir(), 'truthlens-ratelimit.db')}"
+    )
     RATE_LIMIT_FREE = 10  # 10 analyses per day for free users
-    RATE_LIMIT_PRO = 100
\ No newline at end of file
+    RATE_LIMIT_PRO = 100
+    QUOTA_CACHE_TTL = int(os.getenv('QUOTA_CACHE_TTL', 60))  # seconds a worker trusts its cached daily count
\ No newline at end of file
@@ -1,12 +1,23 @@
 # Database models (SQLAlchemy)
-from time import timezone
+from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import datetime, timezone
 import bcrypt
+import hashlib
 import secrets
+from config import Config
+from utils.db_engine import engine_options, install_sqlite_pragmas
+from utils.result_blobs import decode_result, encode_result
 
 db = SQLAlchemy()
 
+def hash_api_key(api_key):
+    """Lookup hash of an API key"""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+
 class User(db.Model):
     __tablename__ = 'users'
     
@@ -15,7 +26,9 @@ class User(db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
     name = db.Column(db.String(255))
     subscription_tier = db.Column(db.String(50), default='free')
-    api_key = db.Column(db.String(100), unique=True)
+    api_key = db.Column(db.String(100), unique=True)  # legacy plaintext keys, no longer written
+    api_key_hash = db.Column(db.String(64), unique=True, index=True)  # sha256 of the key
+    auth_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # bumped by auth.py
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_login = db.Column(db.DateTime)
     
@@ -31,8 +44,11 @@ class User(db.Model):
         return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
     
     def generate_api_key(self):
-        """Generate unique API key"""
-        self.api_key = secrets.token_urlsafe(32)
+        """Generate a new API key; only its hash is stored, so return it to show once"""
+        api_key = secrets.token_urlsafe(32)
+        self.api_key = None
+        self.api_key_hash = hash_api_key(api_key)
+        return api_key
     
     def to_dict(self):
         """Convert to dictionary"""
@@ -46,6 +62,10 @@ class User(db.Model):
 
 class Analysis(db.Model):
     __tablename__ = 'analyses'
+    __table_args__ = (
+        # Keyset pagination of a user's history, newest first
+        db.Index('ix_analyses_user_created', 'user_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
@@ -54,9 +74,18 @@ class Analysis(db.Model):
     content_preview = db.Column(db.Text)
     trust_score = db.Column(db.Float)
     grade = db.Column(db.String(1))
-    analysis_result = db.Column(db.JSON)
+    analysis_result = db.deferred(db.Column(db.JSON))  # inline results from before analysis_blobs
+    result_hash = db.Column(db.String(64))  # analysis_blobs.sha256
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     
+    @property
+    def result(self):
+        """Full analysis result, decompressed on first access"""
+        if self.result_hash:
+            blob = getattr(self, '_result_blob', None) or db.session.get(AnalysisBlob, self.result_hash)
+            return blob.load() if blob else None
+        return self.analysis_result
+    
     def to_dict(self):
         """Convert to dictionary"""
         return {
@@ -66,13 +95,87 @@ class Analysis(db.Model):
             'trust_score': self.trust_score,
             'grade': self.grade,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'analysis_result': self.analysis_result
+            'analysis_result': self.result
+        }
+    
+    @staticmethod
+    def preload_results(analyses):
+        """Fetch the blobs of many analyses in one query before serializing them"""
+        hashes = {a.result_hash for a in analyses if a.result_hash}
+        if not hashes:
+            return
+        blobs = {b.sha256: b for b in AnalysisBlob.query.filter(AnalysisBlob.sha256.in_(hashes))}
+        for analysis in analyses:
+            if analysis.result_hash in blobs:
+                analysis._result_blob = blobs[analysis.result_hash]
+    
+    def to_summary_dict(self):
+        """Convert to dictionary without the full analysis result"""
+        return {
+            'id': self.id,
+            'content_type': self.content_type,
+            'content_preview': self.content_preview,
+            'trust_score': self.trust_score,
+            'grade': self.grade,
+            'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+class AnalysisBlob(db.Model):
+    __tablename__ = 'analysis_blobs'
+    
+    sha256 = db.Column(db.String(64), primary_key=True)  # of the canonical JSON
+    codec = db.Column(db.String(10), nullable=False)
+    raw_size = db.Column(db.Integer)
+    data = db.Column(db.LargeBinary, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @classmethod
+    def store(cls, result):
+        """Store a result once per distinct content; returns its hash"""
+        sha256, codec, raw_size, data = encode_result(result)
+        values = {'sha256': sha256, 'codec': codec, 'raw_size': raw_size, 'data': data}
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+            db.session.execute(insert(cls).values(**values).on_conflict_do_nothing(index_elements=['sha256']))
+        elif db.session.get(cls, sha256) is None:
+            db.session.add(cls(**values))
+        return sha256
+    
+    def load(self):
+        return decode_result(self.codec, self.data)
+
+class CachedResult(db.Model):
+    __tablename__ = 'cached_results'
+    
+    cache_key = db.Column(db.String(128), primary_key=True)
+    content_hash = db.Column(db.String(64), index=True)
+    version = db.Column(db.String(32))
+    inline_result = db.deferred(db.Column('result', db.JSON))  # rows cached before result_hash
+    result_hash = db.Column(db.String(64))  # analysis_blobs.sha256
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)  # expiry sweep
+    
+    @property
+    def result(self):
+        """Cached analysis result, shared with the analyses that produced it"""
+        if self.result_hash:
+            blob = db.session.get(AnalysisBlob, self.result_hash)
+            return blob.load() if blob else None
+        return self.inline_result
+
+class DailyUsage(db.Model):
+    __tablename__ = 'daily_usage'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)  # UTC day
+    count = db.Column(db.Integer, nullable=False, default=0)
+
 def init_db(app):
     """Initialize database"""
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config['SQLALCHEMY_DATABASE_URI']))
     db.init_app(app)
     with app.app_context():
+        install_sqlite_pragmas(db.engine)
         # Create database directory if it doesn't exist
         import os
         db_path = app.config['SQLALCHEMY_DATABASE_URI']
@@ -85,7 +188,29 @@ def init_db(app):
                 except:
                     pass  # Ignore if can't create directory (e.g., on Render)
         db.create_all()
+        # create_all does not add columns or indexes to tables that already exist
+        for model, column, ddl in (
+            (Analysis, 'result_hash', 'VARCHAR(64)'),
+            (User, 'api_key_hash', 'VARCHAR(64)'),
+            (User, 'auth_version', 'INTEGER NOT NULL DEFAULT 0'),
+            (CachedResult, 'result_hash', 'VARCHAR(64)'),
+        ):
+            table = model.__tablename__
+            if column not in {c['name'] for c in inspect(db.engine).get_columns(table)}:
+                with db.engine.begin() as conn:
+                    conn.execute(db.text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}'))
+        for model in (Analysis, User, CachedResult):
+            for index in model.__table__.indexes:
+                index.create(db.engine, checkfirst=True)
         try:
             print("✅ Database initialized successfully")
         except:
-            print("[OK] Database initialized successfully")
\ No newline at end of file
+            print("[OK] Database initialized successfully")
+
+def create_app(database_url):
+    """Bare app with only the database set up, for tools and tests"""
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    init_db(app)
+    return app
@@ -8,12 +8,19 @@ bind = f"0.0.0.0:{port}"
 print(f"Gunicorn binding to: {bind}")
 
 # Worker configuration
-workers = 1
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
 worker_class = 'sync'
+# More than one thread switches gunicorn to gthread workers, which lets
+# concurrent requests share micro-batched forward passes
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
 timeout = 300  # 5 minutes for model loading
 graceful_timeout = 300
 keepalive = 5
 
+# Preload: load the models once in the master and fork workers that share
+# the weight pages copy-on-write, so extra workers cost little memory
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'false').lower() == 'true'
+
 # Memory management
 max_requests = 100
 max_requests_jitter = 10
@@ -22,3 +29,38 @@ max_requests_jitter = 10
 accesslog = '-'
 errorlog = '-'
 loglevel = 'info'
+
+
+def when_ready(server):
+    if preload_app:
+        from utils.fork_safety import prepare_for_fork
+        prepare_for_fork()
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+    from config import Config
+    from models.inference import configure_torch_threads
+    from utils.fork_safety import after_fork_in_child
+
+    # Split the cores between workers instead of every worker using all of them
+    torch_threads = Config.TORCH_NUM_THREADS or max(1, (os.cpu_count() or 1) // server.cfg.workers)
+    configure_torch_threads(torch_threads)
+    after_fork_in_child()
+
+
+def worker_exit(server, worker):
+    # Write history rows still queued before the worker goes away
+    from utils.write_behind import flush_all
+    flush_all()
+
+
+def post_worker_init(worker):
+    from utils.fork_safety import memory_report
+    report = memory_report()
+    if report:
+        worker.log.info(
+            f"Worker {worker.pid} memory: rss {report['rss_mb']} MB, "
+            f"shared {report['shared_mb']} MB, private {report['private_mb']} MB, pss {report['pss_mb']} MB"
+        )
@@ -1,36 +1,27 @@
-import re
+import os
+from config import Config
+from utils.lexicon import Lexicon
 
 class BiasDetector:
     def __init__(self):
-        self.biased_words = {
-            'left': ['liberal', 'progressive', 'socialist', 'woke'],
-            'right': ['conservative', 'traditional', 'patriot'],
-            'loaded': ['terrorist', 'thug', 'elite', 'regime', 'propaganda']
+        self.lexicon = Lexicon.from_files(os.path.join(Config.LEXICON_DIR, 'bias.json'))
+        self.score_keys = {
+            'left': 'left_bias',
+            'right': 'right_bias',
+            'loaded': 'loaded_language'
         }
     
     def detect_bias(self, text):
         """Detect bias in text"""
-        text_lower = text.lower()
+        matches = self.lexicon.scan(text)
         
-        bias_scores = {
-            'left_bias': 0,
-            'right_bias': 0,
-            'loaded_language': 0
-        }
+        bias_scores = {key: len(matches.get(category, [])) for category, key in self.score_keys.items()}
         
         found_words = []
-        
-        for category, words in self.biased_words.items():
-            for word in words:
-                count = text_lower.count(word)
-                if count > 0:
-                    if category == 'left':
-                        bias_scores['left_bias'] += count
-                    elif category == 'right':
-                        bias_scores['right_bias'] += count
-                    else:
-                        bias_scores['loaded_language'] += count
-                    found_words.append(word)
+        for category in self.score_keys:
+            for match in matches.get(category, []):
+                if match['term'] not in found_words:
+                    found_words.append(match['term'])
         
         total_bias = sum(bias_scores.values())
         overall_bias = min(total_bias / 10, 1.0)
@@ -39,19 +30,22 @@ class BiasDetector:
             'overall_bias_score': round(overall_bias, 3),
             'bias_breakdown': bias_scores,
             'biased_words_found': found_words[:5],
-            'source_diversity': self._check_diversity(text),
-            'attribution_score': self._check_attribution(text),
+            'biased_word_spans': sorted(
+                ({'word': m['term'], 'start': m['start'], 'end': m['end']}
+                 for category in self.score_keys for m in matches.get(category, [])),
+                key=lambda span: span['start']
+            )[:20],
+            'source_diversity': self._check_diversity(matches),
+            'attribution_score': self._check_attribution(matches),
             'bias_level': 'HIGH' if overall_bias > 0.7 else 'MODERATE' if overall_bias > 0.4 else 'LOW'
         }
     
-    def _check_diversity(self, text):
+    def _check_diversity(self, matches):
         """Check for diverse perspectives"""
-        indicators = ['however', 'on the other hand', 'critics say', 'but']
-        count = sum(1 for phrase in indicators if phrase in text.lower())
+        count = len({m['term'] for m in matches.get('diversity', [])})
         return min(count / 3, 1.0)
     
-    def _check_attribution(self, text):
+    def _check_attribution(self, matches):
         """Check for proper attribution"""
-        patterns = [r'according to', r'said', r'reported by', r'sources say']
-        matches = sum(1 for pattern in patterns if re.search(pattern, text, re.I))
-        return min(matches / 5, 1.0)
\ No newline at end of file
+        count = len({m['term'] for m in matches.get('attribution', [])})
+        return min(count / 5, 1.0)
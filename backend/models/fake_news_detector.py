@@ -1,78 +1,111 @@
 try:
-    from transformers import AutoTokenizer, AutoModelForSequenceClassification
     import torch
 except ImportError as e:
-    print(f"Warning: {e}. Please ensure transformers and torch are installed.")
-    AutoTokenizer = None
-    AutoModelForSequenceClassification = None
+    print(f"Warning: {e}. Please ensure torch is installed.")
     torch = None
 from config import Config
 from utils.error_handler import logger
+from models.inference import document_probabilities, load_classifier
+from models.inference_scheduler import InferenceScheduler
 
 class FakeNewsDetector:
     def __init__(self):
         try:
             logger.info("Loading Fake News Detection Model...")
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                Config.FAKE_NEWS_MODEL,
-                token=Config.HUGGINGFACE_TOKEN
-            )
-            self.model = AutoModelForSequenceClassification.from_pretrained(
+            self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+            self.tokenizer, self.model = load_classifier(
                 Config.FAKE_NEWS_MODEL,
+                backend=Config.INFERENCE_BACKEND,
+                device=self.device,
                 token=Config.HUGGINGFACE_TOKEN
             )
-            self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-            self.model.to(self.device)
-            self.model.eval()
+            self.scheduler = None
             logger.info("✓ Fake News Model Loaded")
         except Exception as e:
             logger.error(f"Model loading error: {e}")
             raise
     
+    def enable_micro_batching(self, max_batch_size, max_wait_ms):
+        """Route single predictions through a cross-request batching scheduler"""
+        self.scheduler = InferenceScheduler(
+            'fake_news', self._probabilities, max_batch_size, max_wait_ms
+        )
+    
     def predict(self, text):
         """Predict if news is fake or real"""
         if not text or len(text.strip()) < 20:
-            return {
-                'label': 'INSUFFICIENT_DATA',
-                'confidence': 0.0,
-                'probabilities': {'FAKE': 0.0, 'REAL': 0.0},
-                'risk_level': 'UNKNOWN'
-            }
+            return self._insufficient_result()
+        
+        try:
+            if self.scheduler is not None:
+                row, report = self.scheduler.submit(text)
+            else:
+                row, report = self._probabilities([text])[0]
+            return self._format_prediction(row[0], row[1], report)
+        except Exception as e:
+            logger.error(f"Prediction error: {e}")
+            return self._error_result(e)
+    
+    def predict_batch(self, texts):
+        """Predict fake/real for many texts in length-bucketed forward passes"""
+        results = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) < 20:
+                results[i] = self._insufficient_result()
+            else:
+                pending.append(i)
+        
+        if not pending:
+            return results
         
         try:
-            inputs = self.tokenizer(
-                text[:512],
-                return_tensors="pt",
-                truncation=True,
-                max_length=512,
-                padding=True
-            ).to(self.device)
-            
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
-            
-            fake_prob = probs[0][0].item()
-            real_prob = probs[0][1].item()
-            
-            return {
-                'label': 'FAKE' if fake_prob > real_prob else 'REAL',
-                'confidence': round(max(fake_prob, real_prob), 4),
-                'probabilities': {
-                    'FAKE': round(fake_prob, 4),
-                    'REAL': round(real_prob, 4)
-                },
-                'risk_level': self._get_risk_level(fake_prob)
-            }
+            probs = self._probabilities([texts[i] for i in pending])
+            for i, (row, report) in zip(pending, probs):
+                results[i] = self._format_prediction(row[0], row[1], report)
         except Exception as e:
             logger.error(f"Prediction error: {e}")
-            return {
-                'label': 'ERROR',
-                'confidence': 0.0,
-                'probabilities': {'FAKE': 0.0, 'REAL': 0.0},
-                'risk_level': 'UNKNOWN',
-                'error': str(e)
-            }
+            for i in pending:
+                results[i] = self._error_result(e)
+        return results
+    
+    def _probabilities(self, texts):
+        """Return ([fake, real], long-document report) for each text"""
+        return document_probabilities(
+            self.model, self.tokenizer, texts, ['FAKE', 'REAL'],
+            Config.INFERENCE_BATCH_SIZE, self.device
+        )
+    
+    def _insufficient_result(self):
+        return {
+            'label': 'INSUFFICIENT_DATA',
+            'confidence': 0.0,
+            'probabilities': {'FAKE': 0.0, 'REAL': 0.0},
+            'risk_level': 'UNKNOWN'
+        }
+    
+    def _error_result(self, error):
+        return {
+            'label': 'ERROR',
+            'confidence': 0.0,
+            'probabilities': {'FAKE': 0.0, 'REAL': 0.0},
+            'risk_level': 'UNKNOWN',
+            'error': str(error)
+        }
+    
+    def _format_prediction(self, fake_prob, real_prob, report=None):
+        result = {
+            'label': 'FAKE' if fake_prob > real_prob else 'REAL',
+            'confidence': round(max(fake_prob, real_prob), 4),
+            'probabilities': {
+                'FAKE': round(fake_prob, 4),
+                'REAL': round(real_prob, 4)
+            },
+            'risk_level': self._get_risk_level(fake_prob)
+        }
+        if report is not None:
+            result['long_document'] = report
+        return result
     
     def _get_risk_level(self, fake_prob):
         if fake_prob > 0.8: return "CRITICAL"
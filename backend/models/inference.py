@@ -0,0 +1,201 @@
+try:
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    import torch
+except ImportError as e:
+    print(f"Warning: {e}. Please ensure transformers and torch are installed.")
+    AutoTokenizer = None
+    AutoModelForSequenceClassification = None
+    torch = None
+from config import Config
+from utils.error_handler import logger
+
+BACKENDS = ('fp32', 'int8', 'traced')
+
+
+def configure_torch_threads(num_threads):
+    """Set torch's intra-op thread count (0 keeps the torch default)"""
+    if torch is not None and num_threads > 0:
+        torch.set_num_threads(num_threads)
+
+
+def load_classifier(model_name, backend='fp32', device=None, token=None):
+    """Load a tokenizer and sequence classifier prepared for an inference backend.
+
+    fp32   - eager float32 model (default)
+    int8   - dynamically quantized Linear layers, CPU only
+    traced - TorchScript graph traced from the eager model, frozen for inference
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {BACKENDS}")
+
+    device = device or torch.device('cpu')
+    if backend == 'int8' and device.type != 'cpu':
+        logger.warning("int8 backend is CPU only, falling back to fp32")
+        backend = 'fp32'
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name, token=token)
+    model = AutoModelForSequenceClassification.from_pretrained(
+        model_name,
+        token=token,
+        torchscript=(backend == 'traced')
+    )
+    model.to(device)
+    model.eval()
+
+    if backend == 'int8':
+        model = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    elif backend == 'traced':
+        example = tokenizer(
+            ["TruthLens tracing example.", "A second, slightly longer tracing example sentence."],
+            return_tensors="pt",
+            padding=True
+        ).to(device)
+        with torch.no_grad():
+            model = torch.jit.trace(
+                model, (example['input_ids'], example['attention_mask']), strict=False
+            )
+        try:
+            model = torch.jit.optimize_for_inference(torch.jit.freeze(model.eval()))
+        except Exception as e:
+            logger.warning(f"Could not freeze traced model, using plain trace: {e}")
+
+    if not isinstance(model, torch.jit.ScriptModule):
+        # Weights are never written after loading, which keeps them shared across forked workers
+        model.requires_grad_(False)
+
+    logger.info(f"Loaded {model_name} with {backend} backend")
+    return tokenizer, model
+
+
+def forward_logits(model, inputs):
+    """Class logits from an eager or traced classifier"""
+    if isinstance(model, torch.jit.ScriptModule):
+        return model(inputs['input_ids'], inputs['attention_mask'])[0]
+    return model(**inputs).logits
+
+
+def bucket_batches(lengths, batch_size):
+    """Group sequence indices into batches of similar length"""
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def batched_probabilities(model, tokenizer, sequences, batch_size, device=None):
+    """Run length-bucketed padded forward passes over tokenized sequences.
+
+    Sorting by length before batching keeps padding inside each batch small.
+    Returns one list of class probabilities per sequence, in input order.
+    """
+    probs = [None] * len(sequences)
+    for bucket in bucket_batches([len(seq) for seq in sequences], batch_size):
+        inputs = tokenizer.pad(
+            {'input_ids': [sequences[i] for i in bucket]},
+            return_tensors="pt"
+        )
+        if device is not None:
+            inputs = inputs.to(device)
+
+        with torch.no_grad():
+            logits = forward_logits(model, inputs)
+            bucket_probs = torch.nn.functional.softmax(logits, dim=-1)
+
+        for row, index in enumerate(bucket):
+            probs[index] = bucket_probs[row].tolist()
+    return probs
+
+
+def window_sequences(tokenizer, text, max_length, stride, max_windows):
+    """Split a text into overlapping token windows.
+
+    Consecutive windows share `stride` tokens. Returns the windows (with
+    special tokens added), their (start, end) token spans in the document and
+    whether the document was cut off at `max_windows`.
+    """
+    body = max_length - tokenizer.num_special_tokens_to_add()
+    step = max(1, body - stride)
+    # Bound tokenization cost before cutting windows; ~10 chars per token is generous
+    ids = tokenizer(
+        text[:max_windows * step * 10 + body * 10],
+        add_special_tokens=False
+    )['input_ids']
+
+    windows, spans = [], []
+    start = 0
+    while True:
+        chunk = ids[start:start + body]
+        windows.append(tokenizer.build_inputs_with_special_tokens(chunk))
+        spans.append((start, start + len(chunk)))
+        if start + body >= len(ids):
+            return windows, spans, False
+        if len(windows) >= max_windows:
+            return windows, spans, True
+        start += step
+
+
+def aggregate_windows(rows, spans, method):
+    """Combine per-window class probabilities into one document distribution"""
+    classes = len(rows[0])
+    if method == 'max':
+        peaks = [max(row[c] for row in rows) for c in range(classes)]
+        total = sum(peaks)
+        return [p / total for p in peaks]
+    if method == 'weighted':
+        weights = [max(1, end - start) for start, end in spans]
+        total = sum(weights)
+        return [sum(row[c] * w for row, w in zip(rows, weights)) / total for c in range(classes)]
+    return [sum(row[c] for row in rows) / len(rows) for c in range(classes)]
+
+
+def document_probabilities(model, tokenizer, texts, labels, batch_size, device=None):
+    """Class probabilities per document, with a window report in long-document mode.
+
+    Without long-document mode only the first 512 characters are classified.
+    In long-document mode every document is split into token windows, all
+    windows of all documents run in the same bucketed batches, and the window
+    probabilities are aggregated per document. Returns (probs, report) pairs;
+    `report` is None outside long-document mode.
+    """
+    if not Config.LONG_DOC_ENABLED:
+        sequences = tokenizer(
+            [text[:512] for text in texts],
+            truncation=True,
+            max_length=512
+        )['input_ids']
+        probs = batched_probabilities(model, tokenizer, sequences, batch_size, device)
+        return [(row, None) for row in probs]
+
+    documents = []
+    sequences = []
+    for text in texts:
+        windows, spans, truncated = window_sequences(
+            tokenizer, text, 512, Config.LONG_DOC_STRIDE, Config.LONG_DOC_MAX_WINDOWS
+        )
+        documents.append((len(sequences), windows, spans, truncated))
+        sequences.extend(windows)
+
+    probs = batched_probabilities(model, tokenizer, sequences, batch_size, device)
+
+    outputs = []
+    for offset, windows, spans, truncated in documents:
+        rows = probs[offset:offset + len(windows)]
+        aggregated = aggregate_windows(rows, spans, Config.LONG_DOC_AGGREGATION)
+        verdict = max(range(len(aggregated)), key=lambda c: aggregated[c])
+        drivers = sorted(range(len(rows)), key=lambda i: rows[i][verdict], reverse=True)[:3]
+
+        outputs.append((aggregated, {
+            'windows': len(windows),
+            'tokens_covered': spans[-1][1],
+            'truncated': truncated,
+            'aggregation': Config.LONG_DOC_AGGREGATION,
+            'verdict': labels[verdict],
+            'driving_windows': [{
+                'index': i,
+                'token_start': spans[i][0],
+                'token_end': spans[i][1],
+                'probability': round(rows[i][verdict], 4),
+                'excerpt': tokenizer.decode(windows[i][1:33], skip_special_tokens=True).strip()
+            } for i in drivers]
+        }))
+    return outputs
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from utils.error_handler import logger
+
+
+class InferenceScheduler:
+    """Coalesces concurrent single-text calls into batched forward passes.
+
+    Callers block in `submit` while a background thread collects queued texts
+    until `max_batch_size` is reached or the oldest one has waited
+    `max_wait_ms`, runs `batch_fn` once and hands each caller its own row.
+    """
+
+    def __init__(self, name, batch_fn, max_batch_size=16, max_wait_ms=5):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._worker = None
+        self._worker_pid = None
+
+        # Tuning metrics
+        self._batch_histogram = {}
+        self._waits = deque(maxlen=1000)
+        self._batches = 0
+        self._items = 0
+        self._inference_time = 0.0
+
+    def submit(self, text):
+        """Queue one text and block until its batch has been run"""
+        future = Future()
+        with self._cond:
+            self._ensure_worker()
+            self._queue.append((text, future, time.perf_counter()))
+            self._cond.notify()
+        return future.result()
+
+    def stats(self):
+        """Queue depth, batch-size histogram and queue wait times"""
+        with self._cond:
+            waits = sorted(self._waits)
+            histogram = dict(sorted(self._batch_histogram.items()))
+            queue_depth = len(self._queue)
+            batches, items, inference_time = self._batches, self._items, self._inference_time
+
+        def percentile(p):
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))] * 1000, 3)
+
+        return {
+            'queue_depth': queue_depth,
+            'batches': batches,
+            'items': items,
+            'avg_batch_size': round(items / batches, 2) if batches else 0.0,
+            'batch_size_histogram': histogram,
+            'wait_ms': {
+                'p50': percentile(0.5),
+                'p95': percentile(0.95),
+                'max': round(waits[-1] * 1000, 3) if waits else 0.0
+            },
+            'avg_inference_ms': round(inference_time / batches * 1000, 3) if batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000
+        }
+
+    def _ensure_worker(self):
+        # Threads do not survive fork, so each process starts its own worker
+        if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+        self._worker_pid = os.getpid()
+        self._worker = threading.Thread(
+            target=self._run,
+            name=f"inference-scheduler-{self.name}",
+            daemon=True
+        )
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+
+                # Wait for a full batch, but never past the oldest caller's deadline
+                deadline = self._queue[0][2] + self.max_wait
+                while len(self._queue) < self.max_batch_size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                size = min(len(self._queue), self.max_batch_size)
+                batch = [self._queue.popleft() for _ in range(size)]
+
+            self._execute(batch)
+
+    def _execute(self, batch):
+        started = time.perf_counter()
+        texts = [text for text, _, _ in batch]
+        try:
+            outputs = self.batch_fn(texts)
+        except Exception as e:
+            logger.error(f"Batched inference error ({self.name}): {e}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            outputs = None
+
+        if outputs is not None:
+            for (_, future, _), output in zip(batch, outputs):
+                future.set_result(output)
+
+        finished = time.perf_counter()
+        with self._cond:
+            self._batches += 1
+            self._items += len(batch)
+            self._inference_time += finished - started
+            self._batch_histogram[len(batch)] = self._batch_histogram.get(len(batch), 0) + 1
+            self._waits.extend(started - enqueued for _, _, enqueued in batch)
@@ -1,82 +1,115 @@
-try:
-    from transformers import AutoTokenizer, AutoModelForSequenceClassification
-    import torch
-except ImportError as e:
-    print(f"Warning: {e}. Please ensure transformers and torch are installed.")
-    AutoTokenizer = None
-    AutoModelForSequenceClassification = None
-    torch = None
 from textblob import TextBlob
+import os
 import re
+from config import Config
 from utils.error_handler import logger
+from models.inference import document_probabilities, load_classifier
+from models.inference_scheduler import InferenceScheduler
+from utils.lexicon import Lexicon
 
 class SentimentAnalyzer:
     def __init__(self):
         try:
             logger.info("Loading Sentiment Analysis Model...")
-            self.tokenizer = AutoTokenizer.from_pretrained("cardiffnlp/twitter-roberta-base-sentiment")
-            self.model = AutoModelForSequenceClassification.from_pretrained("cardiffnlp/twitter-roberta-base-sentiment")
-            self.model.eval()
+            self.tokenizer, self.model = load_classifier(
+                Config.SENTIMENT_MODEL,
+                backend=Config.INFERENCE_BACKEND
+            )
+            self.scheduler = None
+            self.manipulation_lexicon = Lexicon.from_files(
+                os.path.join(Config.LEXICON_DIR, 'manipulation.json')
+            )
             logger.info("✓ Sentiment Model Loaded")
         except Exception as e:
             logger.error(f"Sentiment model error: {e}")
             raise
     
+    def enable_micro_batching(self, max_batch_size, max_wait_ms):
+        """Route single analyses through a cross-request batching scheduler"""
+        self.scheduler = InferenceScheduler(
+            'sentiment', self._probabilities, max_batch_size, max_wait_ms
+        )
+    
     def analyze_emotions(self, text):
         """Detect emotional manipulation"""
         try:
             # Sentiment analysis
-            inputs = self.tokenizer(text[:512], return_tensors="pt", truncation=True)
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
-            
-            sentiment_scores = {
-                'negative': round(probs[0][0].item(), 4),
-                'neutral': round(probs[0][1].item(), 4),
-                'positive': round(probs[0][2].item(), 4)
-            }
-            
-            # Manipulation detection
-            manipulation = self._detect_manipulation(text)
-            
-            # TextBlob analysis
-            blob = TextBlob(text)
-            
-            return {
-                'sentiment': sentiment_scores,
-                'manipulation_score': manipulation,
-                'polarity': round(blob.sentiment.polarity, 3),
-                'subjectivity': round(blob.sentiment.subjectivity, 3),
-                'emotional_intensity': max(sentiment_scores.values()),
-                'red_flags': self._identify_red_flags(text)
-            }
+            if self.scheduler is not None:
+                probs, report = self.scheduler.submit(text)
+            else:
+                probs, report = self._probabilities([text])[0]
+            return self._build_result(text, probs, report)
         except Exception as e:
             logger.error(f"Sentiment analysis error: {e}")
-            return {
-                'sentiment': {'negative': 0, 'neutral': 1, 'positive': 0},
-                'manipulation_score': {'score': 0, 'detected_tactics': []},
-                'polarity': 0,
-                'subjectivity': 0,
-                'emotional_intensity': 0,
-                'red_flags': []
-            }
+            return self._fallback_result(e)
     
-    def _detect_manipulation(self, text):
-        """Detect manipulation tactics"""
-        tactics = {
-            'fear_mongering': ['crisis', 'danger', 'threat', 'scary', 'terrifying'],
-            'urgency': ['now', 'immediately', 'urgent', 'breaking', 'alert'],
-            'sensationalism': ['shocking', 'unbelievable', 'incredible', 'stunning'],
-            'absolutes': ['always', 'never', 'everyone', 'nobody']
+    def analyze_emotions_batch(self, texts):
+        """Detect emotional manipulation for many texts in batched forward passes"""
+        try:
+            probs = self._probabilities(texts)
+        except Exception as e:
+            logger.error(f"Sentiment analysis error: {e}")
+            return [self._fallback_result(e) for _ in texts]
+        
+        results = []
+        for text, (row, report) in zip(texts, probs):
+            try:
+                results.append(self._build_result(text, row, report))
+            except Exception as e:
+                logger.error(f"Sentiment analysis error: {e}")
+                results.append(self._fallback_result(e))
+        return results
+    
+    def _probabilities(self, texts):
+        """Return ([negative, neutral, positive], long-document report) for each text"""
+        return document_probabilities(
+            self.model, self.tokenizer, texts, ['negative', 'neutral', 'positive'],
+            Config.INFERENCE_BATCH_SIZE
+        )
+    
+    def _build_result(self, text, probs, report=None):
+        sentiment_scores = {
+            'negative': round(probs[0], 4),
+            'neutral': round(probs[1], 4),
+            'positive': round(probs[2], 4)
         }
         
-        text_lower = text.lower()
+        # Manipulation detection
+        manipulation = self._detect_manipulation(text)
+        
+        # TextBlob analysis
+        blob = TextBlob(text)
+        
+        result = {
+            'sentiment': sentiment_scores,
+            'manipulation_score': manipulation,
+            'polarity': round(blob.sentiment.polarity, 3),
+            'subjectivity': round(blob.sentiment.subjectivity, 3),
+            'emotional_intensity': max(sentiment_scores.values()),
+            'red_flags': self._identify_red_flags(text)
+        }
+        if report is not None:
+            result['long_document'] = report
+        return result
+    
+    def _fallback_result(self, error):
+        return {
+            'sentiment': {'negative': 0, 'neutral': 1, 'positive': 0},
+            'manipulation_score': {'score': 0, 'detected_tactics': []},
+            'polarity': 0,
+            'subjectivity': 0,
+            'emotional_intensity': 0,
+            'red_flags': [],
+            'error': str(error)
+        }
+    
+    def _detect_manipulation(self, text):
+        """Detect manipulation tactics"""
         score = 0
         detected = []
         
-        for category, words in tactics.items():
-            matches = sum(1 for word in words if word in text_lower)
+        for category, found in self.manipulation_lexicon.scan(text).items():
+            matches = len({m['term'] for m in found})
             if matches > 0:
                 score += matches * 0.1
                 detected.append(category)
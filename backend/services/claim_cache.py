@@ -0,0 +1,130 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from utils.cache import TTLCache
+from utils.error_handler import logger
+
+_MISSING = object()
+
+
+class ClaimCache:
+    """Claim-level cache for Fact Check API answers.
+
+    Positive answers and empty ("no fact check found") answers are cached
+    with separate TTLs. The in-process tier is a bounded LRU; an optional
+    SQLite file keeps entries across restarts and is shared by all workers.
+    """
+
+    def __init__(self, max_size=10000, positive_ttl=86400, negative_ttl=3600, path=None):
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.memory = TTLCache(max_size, positive_ttl)
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._writes = 0
+
+        if self.path:
+            self._connection()
+
+    @staticmethod
+    def normalize(claim):
+        """Case, whitespace and edge punctuation do not change the query"""
+        claim = ' '.join(claim.lower().split())
+        return re.sub(r'^\W+|\W+$', '', claim)
+
+    def get(self, claim):
+        """Return (found, fact_check); fact_check is None for a cached empty answer"""
+        key = self.normalize(claim)
+        value = self.memory.get(key, _MISSING)
+
+        if value is _MISSING and self.path:
+            value = self._disk_get(key)
+            if value is not _MISSING:
+                with self._lock:
+                    self.disk_hits += 1
+
+        with self._lock:
+            if value is _MISSING:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            if value is None:
+                self.negative_hits += 1
+        return True, value
+
+    def set(self, claim, fact_check):
+        """Cache an API answer; pass None to record that nothing was found"""
+        key = self.normalize(claim)
+        ttl = self.positive_ttl if fact_check is not None else self.negative_ttl
+        self.memory.set(key, fact_check, ttl=ttl)
+        if self.path:
+            self._disk_set(key, fact_check, ttl)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.memory),
+                'hits': self.hits,
+                'negative_hits': self.negative_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'persistent': bool(self.path)
+            }
+
+    def _connection(self):
+        # sqlite3 connections must not cross threads or forks
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS claim_cache ('
+                'claim TEXT PRIMARY KEY, fact_check TEXT, expires_at REAL NOT NULL)'
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _disk_get(self, key):
+        try:
+            row = self._connection().execute(
+                'SELECT fact_check, expires_at FROM claim_cache WHERE claim = ?', (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Claim cache read error: {e}")
+            return _MISSING
+
+        if row is None:
+            return _MISSING
+        remaining = row[1] - time.time()
+        if remaining <= 0:
+            return _MISSING
+
+        value = json.loads(row[0]) if row[0] is not None else None
+        self.memory.set(key, value, ttl=remaining)
+        return value
+
+    def _disk_set(self, key, fact_check, ttl):
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO claim_cache (claim, fact_check, expires_at) VALUES (?, ?, ?)',
+                    (key, json.dumps(fact_check) if fact_check is not None else None, time.time() + ttl)
+                )
+                self._writes += 1
+                if self._writes % 500 == 0:
+                    conn.execute('DELETE FROM claim_cache WHERE expires_at < ?', (time.time(),))
+        except sqlite3.Error as e:
+            logger.error(f"Claim cache write error: {e}")
@@ -0,0 +1,158 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from utils.domains import normalize_host, registrable_domain
+from utils.error_handler import logger
+
+MAGIC = b'TLDR'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHII')  # magic, version, reserved, slot count, entry count
+SLOT = struct.Struct('<QB')  # 64-bit domain hash (0 = empty slot), tier code
+TIERS = ('unknown', 'high', 'medium', 'low')
+# When one domain is listed with several tiers, the least credible one wins
+TIER_PRECEDENCE = {'low': 3, 'medium': 2, 'high': 1}
+
+# Used when no index file has been built
+BUILTIN_SOURCES = {
+    'reuters.com': 'high', 'apnews.com': 'high', 'bbc.com': 'high', 'npr.org': 'high',
+    'cnn.com': 'medium', 'nytimes.com': 'medium', 'washingtonpost.com': 'medium',
+}
+
+
+def domain_hash(domain):
+    """Stable 64-bit key of a normalized domain; never 0"""
+    value = int.from_bytes(hashlib.blake2b(domain.encode(), digest_size=8).digest(), 'little')
+    return value or 1
+
+
+def build_index(entries, path, load_factor=0.5):
+    """Write a {domain: tier} mapping as an open-addressing hash table file"""
+    table = {}
+    for domain, tier in entries.items():
+        domain = normalize_host(domain)
+        if not domain or tier not in TIER_PRECEDENCE:
+            continue
+        key = domain_hash(domain)
+        if TIER_PRECEDENCE[tier] > TIER_PRECEDENCE.get(table.get(key), 0):
+            table[key] = tier
+
+    slots = 16
+    while slots * load_factor < len(table):
+        slots *= 2
+
+    buffer = bytearray(HEADER.size + slots * SLOT.size)
+    HEADER.pack_into(buffer, 0, MAGIC, FORMAT_VERSION, 0, slots, len(table))
+    mask = slots - 1
+    for key, tier in table.items():
+        slot = key & mask
+        while SLOT.unpack_from(buffer, HEADER.size + slot * SLOT.size)[0]:
+            slot = (slot + 1) & mask
+        SLOT.pack_into(buffer, HEADER.size + slot * SLOT.size, key, TIERS.index(tier))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(buffer)
+    os.replace(tmp_path, path)
+    return len(table)
+
+
+class DomainReputationIndex:
+    """Domain -> credibility tier lookups against a memory-mapped hash table.
+
+    The file is mapped read-only, so every worker shares the same page-cache
+    copy and opening it costs nothing regardless of size. A host inherits the
+    tier of its closest listed parent, but never looks above its registrable
+    domain: `bbc.com.fake-site.net` resolves through `fake-site.net` only.
+    """
+
+    def __init__(self, path, check_interval=60):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._table = None  # (mmap, slot count, entry count), swapped as one reference
+        self._identity = None
+        self._checked_at = 0
+        self.lookups = 0
+        self.hits = 0
+        self._open()
+
+    def lookup(self, value):
+        """Credibility tier of a URL or host: high, medium, low or unknown"""
+        self._maybe_reload()
+        host = normalize_host(value)
+        if not host:
+            return 'unknown'
+
+        registrable = registrable_domain(host)
+        candidates = [host]
+        while candidates[-1] != registrable and '.' in candidates[-1]:
+            candidates.append(candidates[-1].split('.', 1)[1])
+
+        self.lookups += 1
+        for candidate in candidates:
+            tier = self._get(candidate)
+            if tier:
+                self.hits += 1
+                return tier
+        return 'unknown'
+
+    def stats(self):
+        return {
+            'domains': self._table[2] if self._table else len(BUILTIN_SOURCES),
+            'source': self.path if self._table else 'builtin',
+            'lookups': self.lookups,
+            'hits': self.hits
+        }
+
+    def _get(self, domain):
+        table = self._table
+        if table is None:
+            return BUILTIN_SOURCES.get(domain)
+        mm, slots, _ = table
+        key = domain_hash(domain)
+        mask = slots - 1
+        slot = key & mask
+        while True:
+            stored, tier = SLOT.unpack_from(mm, HEADER.size + slot * SLOT.size)
+            if stored == key:
+                return TIERS[tier]
+            if stored == 0:
+                return None
+            slot = (slot + 1) & mask
+
+    def _open(self):
+        try:
+            with open(self.path, 'rb') as f:
+                identity = os.fstat(f.fileno())
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return
+
+        magic, version, _, slots, entries = HEADER.unpack_from(mm, 0) if len(mm) >= HEADER.size else (b'', 0, 0, 0, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or len(mm) != HEADER.size + slots * SLOT.size:
+            logger.error(f"Ignoring invalid domain reputation index {self.path}")
+            mm.close()
+            return
+
+        with self._lock:
+            # The old mapping is left to the garbage collector so concurrent
+            # lookups never read from a closed map
+            self._table = (mm, slots, entries)
+            self._identity = (identity.st_ino, identity.st_mtime_ns)
+        logger.info(f"✅ Domain reputation index mapped: {entries} domains")
+
+    def _maybe_reload(self):
+        """Pick up an index rebuilt in place (the builder replaces the file atomically)"""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return
+        if (stat.st_ino, stat.st_mtime_ns) != self._identity:
+            self._open()
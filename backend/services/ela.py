@@ -0,0 +1,80 @@
+from io import BytesIO
+import numpy as np
+from PIL import Image, ImageChops
+
+
+def error_level_analysis(img, quality=90, tile_size=32, top_tiles=5):
+    """Error Level Analysis of an RGB image with global and per-tile statistics.
+
+    The recompression difference stays uint8 for the whole analysis: global
+    mean/std/max come from a single 256-bin histogram, and tile statistics are
+    reduced one strip of tiles at a time, so peak memory stays close to the
+    size of the uint8 image.
+    """
+    temp = BytesIO()
+    img.save(temp, 'JPEG', quality=quality)
+    temp.seek(0)
+    compressed = Image.open(temp)
+    compressed.load()
+
+    diff = np.asarray(ImageChops.difference(img, compressed))
+    height, width = diff.shape[:2]
+
+    # Global statistics in one pass over the uint8 values
+    histogram = np.bincount(diff.ravel(), minlength=256)
+    levels = np.arange(256, dtype=np.int64)
+    count = int(histogram.sum())
+    mean = float((histogram * levels).sum()) / count
+    variance = float((histogram * levels * levels).sum()) / count - mean * mean
+    nonzero = np.flatnonzero(histogram)
+    peak = int(nonzero[-1]) if nonzero.size else 0
+
+    # Tile statistics, one strip of tile rows at a time
+    col_starts = np.arange(0, width, tile_size)
+    rows = (height + tile_size - 1) // tile_size
+    tile_mean = np.zeros((rows, len(col_starts)), dtype=np.float32)
+    tile_std = np.zeros_like(tile_mean)
+    tile_max = np.zeros((rows, len(col_starts)), dtype=np.uint8)
+    tile_widths = np.diff(np.append(col_starts, width))
+
+    for r in range(rows):
+        strip = diff[r * tile_size:(r + 1) * tile_size]
+        pixels = strip.shape[0] * tile_widths * strip.shape[2]
+
+        column_sums = strip.sum(axis=(0, 2), dtype=np.uint32)
+        column_squares = np.square(strip, dtype=np.uint32).sum(axis=(0, 2), dtype=np.uint64)
+        sums = np.add.reduceat(column_sums, col_starts)
+        squares = np.add.reduceat(column_squares, col_starts)
+
+        tile_mean[r] = sums / pixels
+        tile_std[r] = np.sqrt(np.maximum(squares / pixels - tile_mean[r].astype(np.float64) ** 2, 0))
+        tile_max[r] = np.maximum.reduceat(strip.max(axis=(0, 2)), col_starts)
+
+    # Tiles far above the image-wide tile level are localized evidence
+    spread = float(tile_mean.std())
+    threshold = float(tile_mean.mean()) + 3 * spread
+    outliers = int((tile_mean > threshold).sum()) if spread > 0 else 0
+    order = np.argsort(tile_mean, axis=None)[::-1][:top_tiles]
+
+    return {
+        'ela_mean': round(mean, 2),
+        'ela_std': round(float(np.sqrt(max(variance, 0))), 2),
+        'ela_max': round(float(peak), 2),
+        'tiles': {
+            'tile_size': tile_size,
+            'rows': rows,
+            'cols': len(col_starts),
+            'grid': np.round(tile_mean, 1).tolist(),
+            'tile_mean_std': round(spread, 2),
+            'max_tile_mean': round(float(tile_mean.max()), 2),
+            'outlier_tiles': outliers,
+            'outlier_fraction': round(outliers / tile_mean.size, 4),
+            'top_tiles': [{
+                'row': int(i // tile_mean.shape[1]),
+                'col': int(i % tile_mean.shape[1]),
+                'mean': round(float(tile_mean.flat[i]), 2),
+                'std': round(float(tile_std.flat[i]), 2),
+                'max': int(tile_max.flat[i])
+            } for i in order]
+        }
+    }
@@ -1,11 +1,27 @@
-import requests
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from config import Config
 from utils.error_handler import logger
+from utils.http_client import http_client
+from services.claim_cache import ClaimCache
+
+# Returned by _query_api when the lookup itself failed, as opposed to finding no fact check
+QUERY_FAILED = object()
 
 class FactChecker:
     def __init__(self):
         self.api_key = Config.GOOGLE_FACT_CHECK_API
         self.base_url = Config.FACT_CHECK_URL
+        self.cache = ClaimCache(
+            max_size=Config.CLAIM_CACHE_SIZE,
+            positive_ttl=Config.CLAIM_CACHE_TTL,
+            negative_ttl=Config.CLAIM_CACHE_NEGATIVE_TTL,
+            path=Config.CLAIM_CACHE_PATH or None
+        ) if Config.CLAIM_CACHE_ENABLED else None
+        self._executor = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
         logger.info("✓ Fact Checker Initialized")
     
     def verify_claims(self, text):
@@ -14,26 +30,65 @@ class FactChecker:
             return {
                 'claims_found': 0,
                 'verified_claims': [],
+                'timed_out_claims': [],
+                'failed_claims': [],
                 'overall_verification': {
                     'score': 0.5,
                     'status': 'INSUFFICIENT_DATA'
                 }
             }
         
-        claims = self._extract_claims(text)
-        results = []
-        
-        for claim in claims[:3]:
-            response = self._query_api(claim)
-            if response:
-                results.append(response)
+        claims = self._extract_claims(text)[:Config.FACT_CHECK_MAX_CLAIMS]
+        results, timed_out, failed = self._query_claims(claims)
         
         return {
             'claims_found': len(results),
             'verified_claims': results,
+            'timed_out_claims': timed_out,
+            'failed_claims': failed,
             'overall_verification': self._calculate_score(results)
         }
     
+    def _query_claims(self, claims):
+        """Query all claims at once under one overall deadline"""
+        if not claims:
+            return [], [], []
+        
+        executor = self._get_executor()
+        futures = [executor.submit(self._query_api, claim) for claim in claims]
+        done, _ = wait(futures, timeout=Config.FACT_CHECK_DEADLINE)
+        
+        results = []
+        timed_out = []
+        failed = []
+        for claim, future in zip(claims, futures):
+            if future in done:
+                response = future.result()
+                if response is QUERY_FAILED:
+                    failed.append({'claim': claim[:100], 'status': 'ERROR'})
+                elif response:
+                    results.append(response)
+            else:
+                # Queued lookups are cancelled; ones already running finish in the
+                # background and land in the claim cache
+                future.cancel()
+                timed_out.append({'claim': claim[:100], 'status': 'TIMEOUT'})
+        
+        if timed_out:
+            logger.warning(f"Fact check deadline hit: {len(timed_out)} of {len(claims)} claims timed out")
+        return results, timed_out, failed
+    
+    def _get_executor(self):
+        # Worker threads do not survive fork, so each process builds its own pool
+        with self._executor_lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=Config.FACT_CHECK_CONCURRENCY,
+                    thread_name_prefix='fact-check'
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+    
     def _extract_claims(self, text):
         """Extract claims from text"""
         import re
@@ -43,33 +98,52 @@ class FactChecker:
             if any(word in sentence.lower() for word in ['is', 'are', 'was', 'were']):
                 if len(sentence.split()) > 5:
                     claims.append(sentence.strip())
-        return claims[:5]
+        return claims[:Config.FACT_CHECK_MAX_CLAIMS]
     
     def _query_api(self, claim):
         """Query Google Fact Check API"""
+        if not self.api_key:
+            return None  # not configured: nothing to find, and nothing failed
+        
+        if self.cache:
+            found, fact_check = self.cache.get(claim)
+            if found:
+                return self._build_result(claim, fact_check)
+        
         try:
             params = {
                 'key': self.api_key,
                 'query': claim,
                 'languageCode': 'en'
             }
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = http_client.get('fact_check', self.base_url, params=params)
             
             if response.status_code == 200:
                 data = response.json()
+                fact_check = None
                 if 'claims' in data and len(data['claims']) > 0:
                     first_claim = data['claims'][0]
-                    return {
-                        'claim': claim[:100],
-                        'fact_check': {
-                            'rating': first_claim.get('claimReview', [{}])[0].get('textualRating', 'Unknown'),
-                            'source': first_claim.get('claimReview', [{}])[0].get('publisher', {}).get('name', 'Unknown')
-                        }
+                    fact_check = {
+                        'rating': first_claim.get('claimReview', [{}])[0].get('textualRating', 'Unknown'),
+                        'source': first_claim.get('claimReview', [{}])[0].get('publisher', {}).get('name', 'Unknown')
                     }
-            return None
+                # Only successful answers are cached; errors are retried next time
+                if self.cache:
+                    self.cache.set(claim, fact_check)
+                return self._build_result(claim, fact_check)
+            logger.error(f"Fact check API returned {response.status_code}")
+            return QUERY_FAILED
         except Exception as e:
             logger.error(f"Fact check error: {e}")
+            return QUERY_FAILED
+    
+    def _build_result(self, claim, fact_check):
+        if fact_check is None:
             return None
+        return {
+            'claim': claim[:100],
+            'fact_check': fact_check
+        }
     
     def _calculate_score(self, results):
         """Calculate verification score"""
@@ -1,6 +1,6 @@
-import requests
 from config import Config
 from utils.error_handler import logger
+from utils.http_client import http_client
 
 class GoogleImageSearch:
     """Google Custom Search API for image verification"""
@@ -22,7 +22,7 @@ class GoogleImageSearch:
                 'num': 10
             }
             
-            response = requests.get(self.endpoint, params=params, timeout=10)
+            response = http_client.get('google_search', self.endpoint, params=params)
             
             if response.status_code == 200:
                 data = response.json()
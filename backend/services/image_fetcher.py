@@ -0,0 +1,96 @@
+import hashlib
+from io import BytesIO
+import requests
+from PIL import Image
+from config import Config
+from utils.http_client import http_client
+
+ALLOWED_CONTENT_TYPES = ('image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/bmp', 'image/tiff')
+
+
+class ImageFetchError(Exception):
+    """Image could not be downloaded or decoded within limits"""
+
+
+class FetchedImage:
+    """One downloaded image shared by every verification step.
+
+    `image` is opened once from the buffer; `original_size` and `exif` are
+    read from the header before any reduced decoding changes `image.size`.
+    """
+
+    def __init__(self, url, data, content_type):
+        self.url = url
+        self.data = data
+        self.content_type = content_type
+        self.sha256 = hashlib.sha256(data).hexdigest()
+
+        try:
+            self.image = Image.open(BytesIO(data))
+        except Exception as e:
+            raise ImageFetchError(f"Could not decode image: {e}")
+
+        self.format = self.image.format
+        self.original_size = self.image.size
+        if self.original_size[0] * self.original_size[1] > Config.IMAGE_MAX_PIXELS:
+            raise ImageFetchError(f"Image exceeds {Config.IMAGE_MAX_PIXELS} pixels")
+
+        try:
+            self.exif = self.image._getexif() if hasattr(self.image, '_getexif') else None
+        except Exception:
+            self.exif = None
+
+        self._rgb = {}
+
+    def rgb(self, max_side=None):
+        """Decoded RGB image no larger than `max_side`, computed once per size.
+
+        JPEGs use draft mode, so the decoder itself produces a reduced image
+        (1/2, 1/4 or 1/8 scale) instead of decoding at full resolution first.
+        """
+        if max_side in self._rgb:
+            return self._rgb[max_side]
+
+        img = Image.open(BytesIO(self.data))
+        if max_side and img.format == 'JPEG' and max(img.size) > max_side:
+            # draft keeps both sides at or above the box, so ask for the scaled size, not a square
+            scale = max_side / max(img.size)
+            img.draft('RGB', (int(img.width * scale), int(img.height * scale)))
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        if max_side and max(img.size) > max_side:
+            ratio = max_side / max(img.size)
+            new_size = tuple(int(dim * ratio) for dim in img.size)
+            img = img.resize(new_size, Image.Resampling.LANCZOS)
+
+        self._rgb[max_side] = img
+        return img
+
+
+def fetch_image(url):
+    """Stream an image once with content-type and byte-size limits"""
+    try:
+        response = http_client.get('image', url, stream=True)
+    except requests.RequestException as e:
+        raise ImageFetchError(f"Download failed: {e}")
+
+    with response:
+        if response.status_code != 200:
+            raise ImageFetchError(f"Download failed with status {response.status_code}")
+
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in ALLOWED_CONTENT_TYPES:
+            raise ImageFetchError(f"Unsupported content type '{content_type}'")
+
+        declared = response.headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > Config.IMAGE_MAX_BYTES:
+            raise ImageFetchError(f"Image exceeds {Config.IMAGE_MAX_BYTES} bytes")
+
+        buffer = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            buffer.extend(chunk)
+            if len(buffer) > Config.IMAGE_MAX_BYTES:
+                raise ImageFetchError(f"Image exceeds {Config.IMAGE_MAX_BYTES} bytes")
+
+    return FetchedImage(url, bytes(buffer), content_type)
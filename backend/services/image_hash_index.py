@@ -0,0 +1,234 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from itertools import combinations
+import numpy as np
+from PIL import Image
+from utils.error_handler import logger
+
+_DCT_SIZE = 32
+_DCT = np.cos(np.pi * np.outer(np.arange(_DCT_SIZE), 2 * np.arange(_DCT_SIZE) + 1) / (2 * _DCT_SIZE))
+
+
+def _bits_to_int(bits):
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), 'big')
+
+
+def compute_hashes(img):
+    """64-bit aHash, dHash and pHash of a PIL image"""
+    gray = img.convert('L')
+
+    small = np.asarray(gray.resize((8, 8), Image.Resampling.LANCZOS), dtype=np.float32)
+    ahash = _bits_to_int(small > small.mean())
+
+    wide = np.asarray(gray.resize((9, 8), Image.Resampling.LANCZOS), dtype=np.int16)
+    dhash = _bits_to_int(wide[:, 1:] > wide[:, :-1])
+
+    pixels = np.asarray(gray.resize((_DCT_SIZE, _DCT_SIZE), Image.Resampling.LANCZOS), dtype=np.float64)
+    low = (_DCT @ pixels @ _DCT.T)[:8, :8]
+    phash = _bits_to_int(low > np.median(low.ravel()[1:]))
+
+    return {'ahash': ahash, 'dhash': dhash, 'phash': phash}
+
+
+def _to_signed(value):
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+_POPCOUNT8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(values):
+    """Set bits of each uint64 in an array"""
+    return _POPCOUNT8[values.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+class ImageHashIndex:
+    """Near-duplicate index of perceptual hashes backed by SQLite.
+
+    pHashes are held in numpy arrays under multi-index hashing: each 64-bit
+    hash is split into `chunks` chunks, with one sorted (chunk value,
+    position) table per chunk. Two hashes within distance r share at least
+    one chunk within r // chunks bits, so a lookup binary-searches only those
+    chunk neighbours and checks the candidates' distances in one vectorized
+    pass, independent of index size. Rows synced since the last rebuild of
+    the chunk tables are scanned directly until there are enough to rebuild.
+    """
+
+    def __init__(self, path, max_distance=8, chunks=4, sync_interval=30, rebuild_min=1024):
+        self.path = path
+        self.max_distance = max_distance
+        self.chunks = chunks
+        self.chunk_bits = 64 // chunks
+        self.sync_interval = sync_interval
+        self.rebuild_min = rebuild_min
+        self._chunk_dtype = np.min_scalar_type((1 << self.chunk_bits) - 1)
+        self._tables = [(np.empty(0, self._chunk_dtype), np.empty(0, np.uint32)) for _ in range(chunks)]
+        self._phashes = np.empty(0, np.uint64)
+        self._dhashes = np.empty(0, np.uint64)
+        self._ids = np.empty(0, np.int64)
+        self._indexed = 0  # rows covered by the chunk tables; the rest are scanned
+        self._last_id = 0
+        self._synced_at = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._probes = np.array(self._probe_masks(max_distance // chunks), dtype=self._chunk_dtype)
+        self.lookups = 0
+        self.matches = 0
+
+    def lookup(self, hashes, limit=5):
+        """Indexed images within max_distance of a pHash, closest first"""
+        self._sync()
+        phash = np.uint64(hashes['phash'])
+        with self._lock:
+            parts = [np.arange(self._indexed, len(self._ids), dtype=np.uint32)]
+            for (keys, positions), chunk in zip(self._tables, self._split(hashes['phash'])):
+                probes = self._probes ^ self._chunk_dtype.type(chunk)
+                starts = np.searchsorted(keys, probes, side='left')
+                lengths = np.searchsorted(keys, probes, side='right') - starts
+                # Concatenate the ranges [start, start + length) without a Python loop
+                offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+                parts.append(positions[offsets + np.arange(len(offsets))])
+            candidates = np.concatenate(parts)
+
+            # A hash can be a candidate through several chunks; dedupe the few that are near
+            near = np.unique(candidates[_popcount(self._phashes[candidates] ^ phash) <= self.max_distance])
+            distances = _popcount(self._phashes[near] ^ phash)
+            ddistances = _popcount(self._dhashes[near] ^ np.uint64(hashes['dhash']))
+            row_ids = self._ids[near]
+            self.lookups += 1
+
+        order = np.lexsort((row_ids, ddistances, distances))[:limit]
+        found = [(int(distances[i]), int(ddistances[i]), int(row_ids[i])) for i in order]
+        if not found:
+            return []
+        self.matches += 1
+
+        rows = self._fetch_rows([row_id for _, _, row_id in found])
+        return [dict(rows[row_id], phash_distance=distance, dhash_distance=ddistance)
+                for distance, ddistance, row_id in found if row_id in rows]
+
+    def add(self, hashes, url=None, label='verified', source=None, reverse_search=None, sha256=None):
+        """Store an image's hashes; images already indexed by SHA-256 are skipped"""
+        conn = self._connection()
+        try:
+            with conn:
+                if sha256 and conn.execute('SELECT 1 FROM image_hashes WHERE sha256 = ?', (sha256,)).fetchone():
+                    return False
+                conn.execute(
+                    'INSERT INTO image_hashes (phash, dhash, ahash, sha256, url, label, source, reverse_search, created_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (_to_signed(hashes['phash']), _to_signed(hashes['dhash']), _to_signed(hashes['ahash']),
+                     sha256, url, label, source,
+                     json.dumps(reverse_search) if reverse_search is not None else None, time.time())
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Image hash index write error: {e}")
+            return False
+        self._sync(force=True)
+        return True
+
+    def stats(self):
+        with self._lock:
+            memory = self._phashes.nbytes + self._dhashes.nbytes + self._ids.nbytes + sum(
+                keys.nbytes + positions.nbytes for keys, positions in self._tables
+            )
+            return {
+                'images': len(self._ids),
+                'unindexed': len(self._ids) - self._indexed,
+                'memory_bytes': memory,
+                'lookups': self.lookups,
+                'lookups_with_match': self.matches,
+                'max_distance': self.max_distance
+            }
+
+    def _split(self, value):
+        mask = (1 << self.chunk_bits) - 1
+        return [(value >> (i * self.chunk_bits)) & mask for i in range(self.chunks)]
+
+    def _probe_masks(self, radius):
+        masks = [0]
+        for r in range(1, radius + 1):
+            for bits in combinations(range(self.chunk_bits), r):
+                masks.append(sum(1 << b for b in bits))
+        return masks
+
+    def _rebuild_tables(self):
+        """Sort every chunk of every hash into its table (caller holds the lock)"""
+        mask = np.uint64((1 << self.chunk_bits) - 1)
+        tables = []
+        for i in range(self.chunks):
+            values = ((self._phashes >> np.uint64(i * self.chunk_bits)) & mask).astype(self._chunk_dtype)
+            order = np.argsort(values, kind='stable')
+            tables.append((values[order], order.astype(np.uint32)))
+        self._tables = tables
+        self._indexed = len(self._ids)
+
+    def _sync(self, force=False):
+        """Load rows added since the last sync (possibly by other workers)"""
+        if not force and time.monotonic() - self._synced_at < self.sync_interval:
+            return
+        try:
+            cursor = self._connection().execute(
+                'SELECT id, phash, dhash FROM image_hashes WHERE id > ? ORDER BY id', (self._last_id,)
+            )
+            batches = []
+            while True:
+                rows = cursor.fetchmany(50000)
+                if not rows:
+                    break
+                batches.append(np.array(rows, dtype=np.int64).reshape(-1, 3))
+        except sqlite3.Error as e:
+            logger.error(f"Image hash index read error: {e}")
+            return
+
+        with self._lock:
+            if batches:
+                new = np.concatenate(batches)
+                new = new[new[:, 0] > self._last_id]  # another thread may have synced meanwhile
+                if len(new):
+                    self._ids = np.concatenate([self._ids, new[:, 0]])
+                    # SQLite hands back the signed view of each unsigned hash
+                    self._phashes = np.concatenate([self._phashes, new[:, 1].view(np.uint64)])
+                    self._dhashes = np.concatenate([self._dhashes, new[:, 2].view(np.uint64)])
+                    self._last_id = int(new[-1, 0])
+            if len(self._ids) - self._indexed > max(self.rebuild_min, self._indexed // 64):
+                self._rebuild_tables()
+            self._synced_at = time.monotonic()
+
+    def _fetch_rows(self, row_ids):
+        placeholders = ','.join('?' * len(row_ids))
+        rows = self._connection().execute(
+            f'SELECT id, url, label, source, reverse_search FROM image_hashes WHERE id IN ({placeholders})',
+            row_ids
+        ).fetchall()
+        return {
+            row_id: {
+                'url': url,
+                'label': label,
+                'source': source,
+                'reverse_search': json.loads(reverse) if reverse else None
+            }
+            for row_id, url, label, source, reverse in rows
+        }
+
+    def _connection(self):
+        # sqlite3 connections must not cross threads or forks
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS image_hashes ('
+                'id INTEGER PRIMARY KEY, phash INTEGER NOT NULL, dhash INTEGER NOT NULL, '
+                'ahash INTEGER NOT NULL, sha256 TEXT, url TEXT, label TEXT NOT NULL, source TEXT, '
+                'reverse_search TEXT, created_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_image_hashes_sha256 ON image_hashes (sha256)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
@@ -1,9 +1,9 @@
-import requests
-from PIL import Image, ExifTags
-from io import BytesIO
-import hashlib
-import numpy as np
+from PIL import ExifTags
+from config import Config
+from services.ela import error_level_analysis
 from services.google_image_search import GoogleImageSearch
+from services.image_fetcher import fetch_image, ImageFetchError
+from services.image_hash_index import ImageHashIndex, compute_hashes
 from utils.error_handler import logger
 
 TAGS = ExifTags.TAGS
@@ -11,6 +11,10 @@ TAGS = ExifTags.TAGS
 class ImageVerifier:
     def __init__(self):
         self.google_search = GoogleImageSearch()
+        self.hash_index = ImageHashIndex(
+            Config.IMAGE_HASH_INDEX_PATH,
+            max_distance=Config.PHASH_MAX_DISTANCE
+        ) if Config.IMAGE_HASH_INDEX_PATH else None
         logger.info("✓ Image Verifier Initialized")
     
     def verify_image(self, image_url):
@@ -18,10 +22,17 @@ class ImageVerifier:
         if not image_url:
             return None
         
+        # Download and decode once; every check below shares the same buffer
+        try:
+            fetched = fetch_image(image_url)
+        except ImageFetchError as e:
+            logger.error(f"Image fetch error: {e}")
+            fetched = None
+        
         results = {
-            'metadata_analysis': self._analyze_metadata(image_url),
-            'manipulation_detection': self._detect_manipulation(image_url),
-            'reverse_search': self.google_search.search_by_url(image_url),
+            'metadata_analysis': self._analyze_metadata(fetched),
+            'manipulation_detection': self._detect_manipulation(fetched),
+            'reverse_search': self._reverse_search(image_url, fetched),
             'overall_trust_score': 0,
             'warnings': []
         }
@@ -29,69 +40,106 @@ class ImageVerifier:
         results['overall_trust_score'], results['warnings'] = self._calculate_score(results)
         return results
     
-    def _analyze_metadata(self, image_url):
+    def _reverse_search(self, image_url, fetched):
+        """Local perceptual-hash index first, Google only when it has no usable match"""
+        hashes = None
+        if self.hash_index is not None and fetched is not None:
+            try:
+                hashes = compute_hashes(fetched.rgb(max_side=1920))
+                local = self._local_reverse_search(self.hash_index.lookup(hashes))
+                if local:
+                    return local
+            except Exception as e:
+                logger.error(f"Image hash index error: {e}")
+        
+        reverse = self.google_search.search_by_url(image_url)
+        
+        if hashes is not None:
+            # Remember the image, and Google's answer when it had one
+            self.hash_index.add(
+                hashes,
+                url=image_url,
+                label='verified',
+                reverse_search=reverse if reverse.get('status') == 'success' else None,
+                sha256=fetched.sha256
+            )
+        return reverse
+    
+    def _local_reverse_search(self, matches):
+        """Build a reverse_search result from index matches, or None if none is usable"""
+        known = [m for m in matches if m['label'] != 'verified']
+        previous = [m for m in matches if m['label'] == 'verified' and m['reverse_search']]
+        if not known and not previous:
+            return None
+        
+        result = dict(previous[0]['reverse_search']) if previous and not known else {
+            'status': 'success',
+            'similar_images_found': len(matches),
+            'top_sources': [m['source'] for m in known if m['source']][:5],
+            'appears_elsewhere': 1,
+            'context_warning': None
+        }
+        if known:
+            labels = {m['label'] for m in known}
+            if 'known_fake' in labels:
+                result['context_warning'] = "⚠️ Matches a known fake or manipulated image"
+            elif 'stock' in labels:
+                result['context_warning'] = "⚠️ Matches a stock image"
+        
+        result['source'] = 'local_index'
+        result['local_matches'] = [{
+            'label': m['label'],
+            'source': m['source'],
+            'url': m['url'],
+            'distance': m['phash_distance']
+        } for m in matches]
+        return result
+    
+    def _analyze_metadata(self, fetched):
         """Extract EXIF metadata"""
+        if fetched is None:
+            return {'error': 'Could not analyze metadata'}
         try:
-            response = requests.get(image_url, timeout=10)
-            img = Image.open(BytesIO(response.content))
-            
             metadata = {
-                'format': img.format,
-                'size': list(img.size),
+                'format': fetched.format,
+                'size': list(fetched.original_size),
                 'has_exif': 0,
                 'camera_info': {}
             }
             
-            try:
-                exif = img._getexif()
-                if exif:
-                    metadata['has_exif'] = 1
-                    for tag_id, value in exif.items():
-                        tag = TAGS.get(tag_id, tag_id)
-                        if tag in ['Make', 'Model']:
-                            metadata['camera_info'][tag] = str(value)
-            except:
-                pass
+            if fetched.exif:
+                metadata['has_exif'] = 1
+                for tag_id, value in fetched.exif.items():
+                    tag = TAGS.get(tag_id, tag_id)
+                    if tag in ['Make', 'Model']:
+                        metadata['camera_info'][tag] = str(value)
             
-            metadata['is_low_res'] = 1 if img.size[0] * img.size[1] < 100000 else 0
+            width, height = fetched.original_size
+            metadata['is_low_res'] = 1 if width * height < 100000 else 0
             return metadata
         except Exception as e:
             logger.error(f"Metadata error: {e}")
             return {'error': 'Could not analyze metadata'}
     
-    def _detect_manipulation(self, image_url):
+    def _detect_manipulation(self, fetched):
         """Error Level Analysis"""
+        if fetched is None:
+            return {'error': 'Could not detect manipulation'}
         try:
-            response = requests.get(image_url, timeout=10)
-            img = Image.open(BytesIO(response.content))
-            
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Resize if too large
-            if max(img.size) > 1920:
-                ratio = 1920 / max(img.size)
-                new_size = tuple(int(dim * ratio) for dim in img.size)
-                img = img.resize(new_size, Image.Resampling.LANCZOS)
-            
-            # ELA
-            temp = BytesIO()
-            img.save(temp, 'JPEG', quality=90)
-            temp.seek(0)
-            compressed = Image.open(temp)
-            
-            ela_array = np.abs(np.array(img, dtype=np.float64) - np.array(compressed, dtype=np.float64))
+            # Reduced decode: never materialize more than 1920px on the long side
+            img = fetched.rgb(max_side=1920)
             
-            ela_mean = np.mean(ela_array)
-            ela_std = np.std(ela_array)
-            ela_max = np.max(ela_array)
+            ela = error_level_analysis(img, tile_size=Config.ELA_TILE_SIZE)
+            ela_std = ela['ela_std']
+            ela_max = ela['ela_max']
             
             return {
-                'ela_mean': round(float(ela_mean), 2),
-                'ela_std': round(float(ela_std), 2),
-                'ela_max': round(float(ela_max), 2),
+                'ela_mean': ela['ela_mean'],
+                'ela_std': ela_std,
+                'ela_max': ela_max,
                 'likely_manipulated': 1 if (ela_std > 15 or ela_max > 50) else 0,
-                'confidence': 'HIGH' if ela_std > 20 else 'MEDIUM' if ela_std > 10 else 'LOW'
+                'confidence': 'HIGH' if ela_std > 20 else 'MEDIUM' if ela_std > 10 else 'LOW',
+                'tiles': ela['tiles']
             }
         except Exception as e:
             logger.error(f"ELA error: {e}")
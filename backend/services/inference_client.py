@@ -0,0 +1,136 @@
+import itertools
+import os
+import socket
+import threading
+from services.inference_protocol import (
+    OP_EMOTIONS_BATCH, OP_ERROR, OP_PING, OP_PREDICT_BATCH, OP_STATS,
+    REPLY_FLAG, ProtocolError, encode_frame, read_frame
+)
+from utils.error_handler import logger
+
+
+class InferenceClient:
+    """Thin client for the inference server over a local UNIX socket.
+
+    Each thread keeps one persistent connection, re-opened after fork or
+    after a connection error.
+    """
+
+    def __init__(self, socket_path, timeout=60):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+
+    def call(self, op, payload=None):
+        """Send one request and wait for its reply, retrying once on a stale connection.
+
+        Only refused, reset or closed connections are retried; a timeout means
+        the server is just slow, and resending would double the wait.
+        """
+        for attempt in range(2):
+            sock = self._connection()
+            try:
+                request_id = next(self._ids) & 0xFFFFFFFF
+                sock.sendall(encode_frame(op, request_id, payload))
+                frame = read_frame(sock)
+                if frame is None:
+                    raise ConnectionError("Inference server closed the connection")
+                break
+            except ConnectionError:
+                self._close()
+                if attempt:
+                    raise
+            except (OSError, ProtocolError):
+                # Includes socket.timeout; a late reply would desync the connection
+                self._close()
+                raise
+
+        reply_op, reply_id, result = frame
+        if reply_id != request_id:
+            self._close()
+            raise ProtocolError(f"Reply {reply_id} does not match request {request_id}")
+        if reply_op == OP_ERROR:
+            raise RuntimeError(f"Inference server error: {result.get('error')}")
+        if reply_op != op | REPLY_FLAG:
+            raise ProtocolError(f"Unexpected reply op {reply_op}")
+        return result
+
+    def ping(self):
+        return self.call(OP_PING) == 'pong'
+
+    def stats(self):
+        return self.call(OP_STATS)
+
+    def _connection(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is None or self._local.pid != os.getpid():
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+            self._local.pid = os.getpid()
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None and self._local.pid == os.getpid():
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = None
+
+
+class RemoteFakeNewsDetector:
+    """FakeNewsDetector interface backed by the inference server"""
+
+    def __init__(self, client):
+        self.client = client
+        self.scheduler = None
+
+    def predict(self, text):
+        """Predict if news is fake or real"""
+        return self.predict_batch([text])[0]
+
+    def predict_batch(self, texts):
+        """Predict fake/real for many texts in one server round trip"""
+        try:
+            return self.client.call(OP_PREDICT_BATCH, list(texts))
+        except Exception as e:
+            logger.error(f"Remote prediction error: {e}")
+            return [{
+                'label': 'ERROR',
+                'confidence': 0.0,
+                'probabilities': {'FAKE': 0.0, 'REAL': 0.0},
+                'risk_level': 'UNKNOWN',
+                'error': str(e)
+            } for _ in texts]
+
+
+class RemoteSentimentAnalyzer:
+    """SentimentAnalyzer interface backed by the inference server"""
+
+    def __init__(self, client):
+        self.client = client
+        self.scheduler = None
+
+    def analyze_emotions(self, text):
+        """Detect emotional manipulation"""
+        return self.analyze_emotions_batch([text])[0]
+
+    def analyze_emotions_batch(self, texts):
+        """Detect emotional manipulation for many texts in one server round trip"""
+        try:
+            return self.client.call(OP_EMOTIONS_BATCH, list(texts))
+        except Exception as e:
+            logger.error(f"Remote sentiment analysis error: {e}")
+            return [{
+                'sentiment': {'negative': 0, 'neutral': 1, 'positive': 0},
+                'manipulation_score': {'score': 0, 'detected_tactics': []},
+                'polarity': 0,
+                'subjectivity': 0,
+                'emotional_intensity': 0,
+                'red_flags': [],
+                'error': str(e)
+            } for _ in texts]
@@ -0,0 +1,56 @@
+import json
+import struct
+
+# Frame: version (1 byte), op (1 byte), request id (4 bytes), payload length (4 bytes),
+# followed by a compact UTF-8 JSON payload
+HEADER = struct.Struct('!BBII')
+VERSION = 1
+MAX_PAYLOAD = 64 * 1024 * 1024
+
+OP_PING = 1
+OP_PREDICT_BATCH = 2
+OP_EMOTIONS_BATCH = 3
+OP_STATS = 4
+
+REPLY_FLAG = 0x80
+OP_ERROR = 0xFF
+
+
+class ProtocolError(Exception):
+    """Malformed or unexpected frame"""
+
+
+def encode_frame(op, request_id, payload):
+    body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return HEADER.pack(VERSION, op, request_id, len(body)) + body
+
+
+def read_frame(sock):
+    """Read one frame, returning (op, request_id, payload) or None on a clean EOF"""
+    header = _recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    version, op, request_id, length = HEADER.unpack(header)
+    if version != VERSION:
+        raise ProtocolError(f"Unsupported protocol version {version}")
+    if length > MAX_PAYLOAD:
+        raise ProtocolError(f"Payload of {length} bytes exceeds limit")
+
+    body = _recv_exact(sock, length) if length else b''
+    if body is None:
+        raise ProtocolError("Connection closed mid-frame")
+    return op, request_id, json.loads(body.decode('utf-8')) if body else None
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1024 * 1024))
+        if not chunk:
+            if remaining == size:
+                return None
+            raise ProtocolError("Connection closed mid-frame")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
@@ -0,0 +1,175 @@
+"""Standalone inference service.
+
+Owns FakeNewsDetector and SentimentAnalyzer in a small process pool and
+serves them to web workers over a local UNIX socket, so web concurrency and
+model concurrency can be scaled independently.
+
+Usage (from backend/):
+    python -m services.inference_server --socket /tmp/truthlens-inference.sock --workers 2
+"""
+import argparse
+import multiprocessing
+import os
+import socketserver
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import Config
+from services.inference_protocol import (
+    OP_EMOTIONS_BATCH, OP_ERROR, OP_PING, OP_PREDICT_BATCH, OP_STATS,
+    REPLY_FLAG, ProtocolError, encode_frame, read_frame
+)
+from utils.error_handler import logger
+
+# Loaded once in the server process before the first pool forks, so its
+# processes share the weights copy-on-write. Replacement pools start from a
+# forkserver and load their own copy (see main)
+_fake_news_detector = None
+_sentiment_analyzer = None
+
+
+def _load_models():
+    global _fake_news_detector, _sentiment_analyzer
+    from models.fake_news_detector import FakeNewsDetector
+    from models.sentiment_analyzer import SentimentAnalyzer
+    _fake_news_detector = FakeNewsDetector()
+    _sentiment_analyzer = SentimentAnalyzer()
+
+
+def _init_pool_process(torch_threads, load_models=False):
+    from models.inference import configure_torch_threads
+    configure_torch_threads(torch_threads)
+    if load_models:
+        _load_models()
+
+
+def _dispatch(op, texts):
+    """Run one batch inside a pool process"""
+    if op == OP_PREDICT_BATCH:
+        return _fake_news_detector.predict_batch(texts)
+    if op == OP_EMOTIONS_BATCH:
+        return _sentiment_analyzer.analyze_emotions_batch(texts)
+    raise ProtocolError(f"Unknown op {op}")
+
+
+class InferenceServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, executor_factory, workers):
+        self.executor_factory = executor_factory
+        self.executor = executor_factory()
+        self.workers = workers
+        self.requests_served = 0
+        self.pool_restarts = 0
+        self._lock = threading.Lock()
+        super().__init__(socket_path, _ConnectionHandler)
+        os.chmod(socket_path, 0o660)
+
+    def count_request(self):
+        with self._lock:
+            self.requests_served += 1
+
+    def run_batch(self, op, payload):
+        """Run one batch in the pool, replacing the pool if a process died"""
+        executor = self.executor
+        try:
+            return executor.submit(_dispatch, op, payload).result()
+        except BrokenProcessPool:
+            # A crashed pool process (e.g. OOM-killed) breaks the pool for good;
+            # fail this request, but give the next ones a fresh pool
+            with self._lock:
+                if self.executor is executor:
+                    logger.error("Inference pool process died, restarting the pool")
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self.executor = self.executor_factory(restart=True)
+                    self.pool_restarts += 1
+            raise
+
+
+class _ConnectionHandler(socketserver.BaseRequestHandler):
+    """Serves frames on one persistent client connection until it closes"""
+
+    def handle(self):
+        while True:
+            try:
+                frame = read_frame(self.request)
+            except (ProtocolError, OSError, ValueError) as e:
+                logger.warning(f"Inference connection dropped: {e}")
+                return
+            if frame is None:
+                return
+
+            op, request_id, payload = frame
+            try:
+                if op == OP_PING:
+                    result = 'pong'
+                elif op == OP_STATS:
+                    result = {
+                        'workers': self.server.workers,
+                        'requests_served': self.server.requests_served,
+                        'pool_restarts': self.server.pool_restarts,
+                        'backend': Config.INFERENCE_BACKEND
+                    }
+                else:
+                    result = self.server.run_batch(op, payload)
+                    self.server.count_request()
+                reply = encode_frame(op | REPLY_FLAG, request_id, result)
+            except Exception as e:
+                logger.error(f"Inference request error: {e}")
+                reply = encode_frame(OP_ERROR, request_id, {'error': str(e)})
+
+            try:
+                self.request.sendall(reply)
+            except OSError:
+                return
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--socket', default=Config.INFERENCE_SOCKET or '/tmp/truthlens-inference.sock')
+    parser.add_argument('--workers', type=int, default=Config.INFERENCE_SERVER_WORKERS)
+    args = parser.parse_args()
+
+    logger.info("Loading models for the inference server...")
+    _load_models()
+
+    torch_threads = Config.TORCH_NUM_THREADS or max(1, (os.cpu_count() or 1) // args.workers)
+    def create_pool(restart=False):
+        if restart:
+            # The server is running handler threads by now, and forking a
+            # threaded process can copy a lock some thread holds. Start from a
+            # clean forkserver and load the models in each new process instead
+            return ProcessPoolExecutor(
+                max_workers=args.workers,
+                mp_context=multiprocessing.get_context('forkserver'),
+                initializer=_init_pool_process,
+                initargs=(torch_threads, True)
+            )
+        executor = ProcessPoolExecutor(
+            max_workers=args.workers,
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_pool_process,
+            initargs=(torch_threads,)
+        )
+        # Fork the pool processes now, before the socket server starts any threads
+        executor.submit(os.getpid).result()
+        return executor
+
+    if os.path.exists(args.socket):
+        os.unlink(args.socket)
+
+    server = InferenceServer(args.socket, create_pool, args.workers)
+    logger.info(f"✅ Inference server listening on {args.socket} with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.executor.shutdown(wait=False, cancel_futures=True)
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+import time
+from config import Config
+from utils.domains import normalize_host, registrable_domain
+from utils.error_handler import logger
+from utils.http_client import http_client
+
+
+class SourceRegistry:
+    """NewsAPI source catalog indexed by host, with registrable-domain fallback.
+
+    The catalog is loaded from a disk snapshot when available and refreshed
+    by a background thread every `refresh_interval` seconds, so lookups are
+    a dict access instead of an HTTP round trip.
+    """
+
+    def __init__(self, api_key, refresh_interval=86400, cache_path=None):
+        self.api_key = api_key
+        self.refresh_interval = refresh_interval
+        self.cache_path = cache_path
+        self._index = {}
+        self._loaded_at = 0
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._refresher = None
+        self._refresher_pid = None
+
+        if self.cache_path:
+            self._load_snapshot()
+
+    def lookup(self, domain):
+        """Return the NewsAPI source registered for a domain, or None"""
+        self._ensure_refresher()
+        if not self._ready.is_set():
+            # Cold start without a snapshot: wait briefly for the first download
+            self._ready.wait(timeout=Config.NEWSAPI_TIMEOUT)
+        # Most specific first: news.abcnews.go.com, abcnews.go.com, go.com
+        host = normalize_host(domain)
+        registrable = registrable_domain(host)
+        while host:
+            source = self._index.get(host)
+            if source is not None or host == registrable or '.' not in host:
+                return source
+            host = host.split('.', 1)[1]
+        return None
+
+    def refresh(self):
+        """Download the catalog, rebuild the index and persist a snapshot"""
+        response = http_client.get(
+            'newsapi',
+            Config.NEWSAPI_SOURCES_URL,
+            params={'apiKey': self.api_key}
+        )
+        response.raise_for_status()
+        sources = response.json().get('sources', [])
+        self._build_index(sources, time.time())
+        logger.info(f"NewsAPI source registry refreshed: {len(self._index)} domains")
+
+        if self.cache_path:
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'fetched_at': self._loaded_at, 'sources': sources}, f)
+            os.replace(tmp_path, self.cache_path)
+
+    def stats(self):
+        return {
+            'domains': len(self._index),
+            'age_seconds': round(time.time() - self._loaded_at) if self._loaded_at else None
+        }
+
+    def _build_index(self, sources, fetched_at):
+        index = {}
+        by_registrable = {}
+        for source in sources:
+            host = normalize_host(source.get('url', ''))
+            if not host:
+                continue
+            entry = {'id': source.get('id'), 'name': source.get('name')}
+            index.setdefault(host, entry)
+            by_registrable.setdefault(registrable_domain(host), []).append(entry)
+        # Shared domains (espn.go.com, abcnews.go.com) get no registrable-domain entry
+        for domain, entries in by_registrable.items():
+            if domain not in index and len({entry['id'] for entry in entries}) == 1:
+                index[domain] = entries[0]
+        with self._lock:
+            self._index = index
+            self._loaded_at = fetched_at
+        self._ready.set()
+
+    def _load_snapshot(self):
+        """Load the on-disk snapshot; returns True if one was loaded"""
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if snapshot.get('fetched_at', 0) <= self._loaded_at:
+            return False
+        self._build_index(snapshot.get('sources', []), snapshot['fetched_at'])
+        return True
+
+    def _ensure_refresher(self):
+        # Started lazily so each forked worker runs its own thread
+        if not self.api_key:
+            self._ready.set()
+            return
+        if self._refresher is not None and self._refresher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._refresher is not None and self._refresher_pid == os.getpid():
+                return
+            self._refresher_pid = os.getpid()
+            self._refresher = threading.Thread(
+                target=self._refresh_loop, name='newsapi-source-registry', daemon=True
+            )
+            self._refresher.start()
+
+    def _refresh_loop(self):
+        while True:
+            if time.time() - self._loaded_at >= self.refresh_interval:
+                # Another worker may already have written a fresh snapshot
+                fresh = self.cache_path and self._load_snapshot() \
+                    and time.time() - self._loaded_at < self.refresh_interval
+                if not fresh:
+                    try:
+                        self.refresh()
+                    except Exception as e:
+                        logger.error(f"NewsAPI source registry refresh failed: {e}")
+                        self._ready.set()
+                        time.sleep(min(300, self.refresh_interval))
+                        continue
+            time.sleep(max(1, self.refresh_interval - (time.time() - self._loaded_at)))
@@ -1,16 +1,18 @@
-import requests
-from urllib.parse import urlparse
 from config import Config
+from utils.domains import normalize_host
 from utils.error_handler import logger
+from services.domain_reputation import DomainReputationIndex
+from services.source_registry import SourceRegistry
 
 class SourceValidator:
     def __init__(self):
         self.news_api_key = Config.NEWS_API_KEY
-        self.credible_sources = {
-            'high': ['reuters.com', 'apnews.com', 'bbc.com', 'npr.org'],
-            'medium': ['cnn.com', 'nytimes.com', 'washingtonpost.com'],
-            'low': []
-        }
+        self.registry = SourceRegistry(
+            self.news_api_key,
+            refresh_interval=Config.NEWSAPI_REFRESH_HOURS * 3600,
+            cache_path=Config.NEWSAPI_SOURCES_CACHE or None
+        )
+        self.reputation = DomainReputationIndex(Config.DOMAIN_REPUTATION_PATH)
         logger.info("✓ Source Validator Initialized")
     
     def validate_source(self, url):
@@ -37,32 +39,20 @@ class SourceValidator:
     def _extract_domain(self, url):
         """Extract domain from URL"""
         try:
-            parsed = urlparse(url)
-            domain = parsed.netloc or parsed.path
-            return domain.replace('www.', '')
-        except:
+            return normalize_host(url) or url
+        except ValueError:
             return url
     
     def _check_known_sources(self, domain):
         """Check against known sources"""
-        for tier, sources in self.credible_sources.items():
-            if any(source in domain for source in sources):
-                return tier
-        return 'unknown'
+        return self.reputation.lookup(domain)
     
     def _check_newsapi(self, domain):
         """Check NewsAPI"""
         try:
-            response = requests.get(
-                "https://newsapi.org/v2/sources",
-                params={'apiKey': self.news_api_key},
-                timeout=5
-            )
-            if response.status_code == 200:
-                sources = response.json().get('sources', [])
-                for source in sources:
-                    if domain in source.get('url', ''):
-                        return {'verified': True, 'name': source.get('name')}
+            source = self.registry.lookup(domain)
+            if source:
+                return {'verified': True, 'name': source.get('name')}
             return {'verified': False}
         except:
             return {'verified': False}
@@ -0,0 +1,21 @@
+import pytest
+from database import db, create_app, User
+
+
+@pytest.fixture
+def app(tmp_path):
+    """App bound to a throwaway SQLite database, with an app context pushed"""
+    app = create_app(f"sqlite:///{tmp_path / 'test.db'}")
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def user(app):
+    user = User(email='reader@example.com', password_hash='x', subscription_tier='free')
+    db.session.add(user)
+    db.session.commit()
+    db.session.refresh(user)  # loaded now, so tests can read it from other threads
+    return user
@@ -0,0 +1,105 @@
+import json
+from types import SimpleNamespace
+import pytest
+from config import Config
+from database import db, CachedResult, DailyUsage, User
+from utils.preprocessing import TextPreprocessor
+from utils.quota import utc_today
+from utils.scoring import TrustScoreCalculator
+
+TEXT = ('Officials said on Monday that the new policy was announced after a long review. '
+        'The report is based on data that researchers were able to check independently. ') * 2
+
+
+@pytest.fixture(scope='module')
+def app_module(tmp_path_factory):
+    """The real app on a throwaway database; no models are loaded at import"""
+    tmp = tmp_path_factory.mktemp('stream')
+    patch = pytest.MonkeyPatch()
+    patch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp / 'app.db'}")
+    patch.setattr(Config, 'RATELIMIT_STORAGE_URI', 'memory://')
+    patch.setattr(Config, 'INFERENCE_SOCKET', str(tmp / 'unused.sock'))
+    patch.setattr(Config, 'WRITE_BEHIND_ENABLED', False)
+    import app as app_module
+    yield app_module
+    patch.undo()
+
+
+def _models(**overrides):
+    stages = {
+        'fake_news_detector': SimpleNamespace(predict=lambda text: {
+            'label': 'REAL', 'confidence': 0.9, 'probabilities': {'FAKE': 0.1, 'REAL': 0.9}, 'risk_level': 'LOW'}),
+        'sentiment_analyzer': SimpleNamespace(analyze_emotions=lambda text: {
+            'sentiment': {'negative': 0.1, 'neutral': 0.8, 'positive': 0.1},
+            'manipulation_score': {'score': 0.1, 'detected_tactics': []}, 'red_flags': []}),
+        'bias_detector': SimpleNamespace(detect_bias=lambda text: {'overall_bias_score': 0.2, 'bias_level': 'LOW'}),
+        'fact_checker': SimpleNamespace(verify_claims=lambda text: {
+            'claims_found': 0, 'verified_claims': [], 'timed_out_claims': [], 'failed_claims': [],
+            'overall_verification': {'score': 0.5, 'status': 'UNVERIFIED'}}),
+    }
+    stages.update(overrides)
+    return dict(stages, source_validator=None, image_verifier=None,
+                preprocessor=TextPreprocessor(), trust_calculator=TrustScoreCalculator())
+
+
+@pytest.fixture
+def client(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'get_models', _models)
+    with app_module.app.app_context():
+        app_module.result_cache.memory.clear()
+        CachedResult.query.delete()
+        db.session.commit()
+    return app_module.app.test_client()
+
+
+def _events(response):
+    assert response.mimetype == 'text/event-stream'
+    events = []
+    for block in response.get_data(as_text=True).strip().split('\n\n'):
+        event, data = block.split('\n')
+        events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+def test_streamed_result_matches_the_plain_endpoint(client, app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'result_cache', None)
+    events = _events(client.post('/api/analyze/stream', json={'text': TEXT}))
+
+    names = [name for name, _ in events]
+    assert names[0] == 'start' and names[-2:] == ['score', 'result']
+    assert sorted(data['stage'] for name, data in events if name == 'stage') == sorted(events[0][1]['stages'])
+    assert events[-1][1] == client.post('/api/analyze', json={'text': TEXT}).json
+    assert events[-1][1]['cache_hit'] is False
+
+
+def test_cached_result_is_replayed(client):
+    plain = client.post('/api/analyze', json={'text': TEXT}).json
+    events = _events(client.post('/api/analyze/stream', json={'text': TEXT}))
+
+    assert events[0] == ('start', {'stages': events[0][1]['stages'], 'cache_hit': True})
+    assert {data['stage']: data['result'] for name, data in events if name == 'stage'} == \
+        {stage: plain[stage] for stage in events[0][1]['stages']}
+    assert events[-2] == ('score', plain['overall_trust_score'])
+    assert events[-1] == ('result', dict(plain, cache_hit=True))
+
+
+def test_failing_stage_ends_with_an_error_and_gives_the_quota_back(client, app_module, monkeypatch):
+    def broken(text):
+        raise RuntimeError('model crashed')
+    monkeypatch.setattr(app_module, 'get_models', lambda: _models(bias_detector=SimpleNamespace(detect_bias=broken)))
+
+    with app_module.app.app_context():
+        user = User(email='stream@example.com', password_hash='x', subscription_tier='free')
+        db.session.add(user)
+        db.session.commit()
+        token = app_module.generate_token(user.id)
+        user_id = user.id
+
+    response = client.post('/api/analyze/stream', json={'text': TEXT + ' Unique.'},
+                           headers={'Authorization': f"Bearer {token}"})
+    events = _events(response)
+
+    assert events[-1] == ('error', {'error': 'Analysis failed'})
+    assert 'result' not in [name for name, _ in events]
+    with app_module.app.app_context():
+        assert db.session.get(DailyUsage, (user_id, utc_today())).count == 0
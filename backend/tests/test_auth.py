@@ -0,0 +1,111 @@
+from datetime import datetime
+import pytest
+from flask import jsonify
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from auth import auth_cache, generate_token, login_required
+from database import db, User
+
+
+@pytest.fixture
+def client(app, monkeypatch):
+    auth_cache.clear()
+    monkeypatch.setattr(auth_cache, 'revalidate_interval', 60)
+
+    @app.route('/whoami')
+    @login_required
+    def whoami(user):
+        return jsonify(user.to_dict())
+
+    return app.test_client()
+
+
+def _other_worker_update(user_id, **changes):
+    """Change a user through a separate session, as another worker would"""
+    with Session(db.engine) as session:
+        user = session.get(User, user_id)
+        for name, value in changes.items():
+            setattr(user, name, value)
+        session.commit()
+
+
+def test_token_is_served_from_cache(client, user):
+    headers = {'Authorization': f"Bearer {generate_token(user.id)}"}
+    assert client.get('/whoami', headers=headers).json['email'] == user.email
+    hits = auth_cache.stats()['hits']
+    assert client.get('/whoami', headers=headers).json['email'] == user.email
+    assert auth_cache.stats()['hits'] == hits + 1
+
+
+def test_cache_hit_issues_no_sql(client, user):
+    headers = {'Authorization': f"Bearer {generate_token(user.id)}"}
+    client.get('/whoami', headers=headers)
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        assert client.get('/whoami', headers=headers).status_code == 200
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    assert statements == []
+
+
+def test_tier_change_in_this_worker_is_seen_at_once(client, user):
+    headers = {'Authorization': f"Bearer {generate_token(user.id)}"}
+    assert client.get('/whoami', headers=headers).json['subscription_tier'] == 'free'
+    db.session.get(User, user.id).subscription_tier = 'pro'
+    db.session.commit()
+    assert client.get('/whoami', headers=headers).json['subscription_tier'] == 'pro'
+
+
+def test_tier_change_in_another_worker_is_seen_after_revalidation(client, user, monkeypatch):
+    headers = {'Authorization': f"Bearer {generate_token(user.id)}"}
+    assert client.get('/whoami', headers=headers).json['subscription_tier'] == 'free'
+    _other_worker_update(user.id, subscription_tier='pro')
+    assert client.get('/whoami', headers=headers).json['subscription_tier'] == 'free'
+
+    monkeypatch.setattr(auth_cache, 'revalidate_interval', 0)
+    assert client.get('/whoami', headers=headers).json['subscription_tier'] == 'pro'
+
+
+def test_rolled_back_change_keeps_the_cache(client, user):
+    headers = {'Authorization': f"Bearer {generate_token(user.id)}"}
+    client.get('/whoami', headers=headers)
+    db.session.get(User, user.id).subscription_tier = 'pro'
+    db.session.flush()
+    db.session.rollback()
+    hits = auth_cache.stats()['hits']
+    assert client.get('/whoami', headers=headers).json['subscription_tier'] == 'free'
+    assert auth_cache.stats()['hits'] == hits + 1
+
+
+def test_rotated_api_key_stops_working(client, user):
+    old_key = user.generate_api_key()
+    db.session.commit()
+    assert client.get('/whoami', headers={'X-API-Key': old_key}).status_code == 200
+
+    account = db.session.get(User, user.id)
+    new_key = account.generate_api_key()
+    db.session.commit()
+    assert client.get('/whoami', headers={'X-API-Key': old_key}).status_code == 401
+    assert client.get('/whoami', headers={'X-API-Key': new_key}).status_code == 200
+
+
+def test_only_the_key_hash_is_stored(user):
+    api_key = user.generate_api_key()
+    db.session.commit()
+    assert user.api_key is None
+    assert api_key not in (user.api_key_hash or '')
+
+
+def test_unrelated_updates_keep_the_auth_version(user):
+    version = user.auth_version
+    _other_worker_update(user.id, last_login=datetime.utcnow())
+    db.session.refresh(user)
+    assert user.auth_version == version
+
+
+@pytest.mark.parametrize('header', ['Bearer not-a-token', 'Bearer', 'garbage'])
+def test_invalid_tokens_are_rejected(client, user, header):
+    assert client.get('/whoami', headers={'Authorization': header}).status_code == 401
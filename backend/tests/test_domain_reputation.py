@@ -0,0 +1,55 @@
+import pytest
+from services.domain_reputation import DomainReputationIndex, build_index
+
+ENTRIES = {
+    'bbc.com': 'high',
+    'bbc.co.uk': 'high',
+    'reuters.com': 'high',
+    'tabloid.example': 'medium',
+    'fake-site.net': 'low',
+    'www.rumours.example': 'low',
+}
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / 'domains.idx'
+    build_index(ENTRIES, str(path))
+    return DomainReputationIndex(str(path))
+
+
+def test_build_index_round_trip(tmp_path, index):
+    assert index.stats() == {'domains': len(ENTRIES), 'source': str(tmp_path / 'domains.idx'),
+                             'lookups': 0, 'hits': 0}
+    for domain, tier in ENTRIES.items():
+        assert index.lookup(domain) == tier
+    assert index.lookup('https://rumours.example/story?id=1') == 'low'
+    assert index.lookup('unlisted.org') == 'unknown'
+
+
+def test_listed_name_inside_another_domain_is_not_trusted(index):
+    assert index.lookup('bbc.com.fake-site.net') == 'low'
+    assert index.lookup('https://bbc.com.unlisted.net/news') == 'unknown'
+
+
+def test_subdomains_inherit_their_registrable_domain(index):
+    assert index.lookup('https://news.bbc.co.uk/world') == 'high'
+    assert index.lookup('live.news.bbc.co.uk') == 'high'
+    assert index.lookup('co.uk') == 'unknown'
+
+
+def test_least_credible_tier_wins_for_duplicate_domains(tmp_path):
+    path = str(tmp_path / 'domains.idx')
+    assert build_index({'Example.com': 'high', 'www.example.com': 'low', 'bad.com': 'bogus'}, path) == 1
+    assert DomainReputationIndex(path).lookup('example.com') == 'low'
+
+
+def test_rebuilt_index_is_picked_up(tmp_path):
+    path = str(tmp_path / 'domains.idx')
+    build_index({'example.com': 'medium'}, path)
+    index = DomainReputationIndex(path, check_interval=0)
+    assert index.lookup('example.com') == 'medium'
+
+    build_index({'example.com': 'high', 'other.com': 'low'}, path)
+    assert index.lookup('example.com') == 'high'
+    assert index.lookup('other.com') == 'low'
@@ -0,0 +1,66 @@
+from io import BytesIO
+import numpy as np
+import pytest
+from PIL import Image
+from services.ela import error_level_analysis
+
+
+def _baseline_ela(img, quality=90):
+    """The float64 ELA the image verifier used before the uint8 engine"""
+    temp = BytesIO()
+    img.save(temp, 'JPEG', quality=quality)
+    temp.seek(0)
+    compressed = Image.open(temp)
+    ela_array = np.abs(np.array(img, dtype=np.float64) - np.array(compressed, dtype=np.float64))
+    return ela_array, {
+        'ela_mean': round(float(np.mean(ela_array)), 2),
+        'ela_std': round(float(np.std(ela_array)), 2),
+        'ela_max': round(float(np.max(ela_array)), 2)
+    }
+
+
+def _images():
+    rng = np.random.default_rng(12)
+    noise = Image.fromarray(rng.integers(0, 256, (240, 320, 3), dtype=np.uint8))
+    gradient = Image.fromarray(np.dstack([np.tile(np.linspace(0, 255, 333, dtype=np.uint8), (197, 1))] * 3))
+    spliced = gradient.copy()
+    spliced.paste(noise.crop((0, 0, 64, 48)), (100, 60))
+    return {'noise': noise, 'gradient': gradient, 'spliced': spliced}
+
+
+@pytest.mark.parametrize('name', ['noise', 'gradient', 'spliced'])
+def test_global_statistics_match_baseline(name):
+    img = _images()[name]
+    _, expected = _baseline_ela(img)
+    result = error_level_analysis(img)
+    assert {key: result[key] for key in expected} == expected
+
+
+@pytest.mark.parametrize('tile_size', [16, 32, 50])
+def test_tile_statistics_match_a_direct_computation(tile_size):
+    img = _images()['spliced']
+    ela_array, _ = _baseline_ela(img)
+    tiles = error_level_analysis(img, tile_size=tile_size, top_tiles=3)['tiles']
+
+    rows = -(-img.height // tile_size)
+    cols = -(-img.width // tile_size)
+    assert (tiles['rows'], tiles['cols']) == (rows, cols)
+    means = np.array([[ela_array[r * tile_size:(r + 1) * tile_size, c * tile_size:(c + 1) * tile_size].mean()
+                       for c in range(cols)] for r in range(rows)])
+    assert np.allclose(tiles['grid'], np.round(means, 1), atol=0.051)
+
+    for top in tiles['top_tiles']:
+        tile = ela_array[top['row'] * tile_size:(top['row'] + 1) * tile_size,
+                         top['col'] * tile_size:(top['col'] + 1) * tile_size]
+        assert top['mean'] == pytest.approx(tile.mean(), abs=0.01)
+        assert top['std'] == pytest.approx(tile.std(), abs=0.01)
+        assert top['max'] == tile.max()
+
+
+def test_spliced_region_stands_out():
+    tiles = error_level_analysis(_images()['spliced'], tile_size=16)['tiles']
+    top = tiles['top_tiles'][0]
+    # The noise patch covers rows 60-108 and columns 100-164
+    assert 60 // 16 <= top['row'] <= 107 // 16
+    assert 100 // 16 <= top['col'] <= 163 // 16
+    assert tiles['outlier_tiles'] > 0
@@ -0,0 +1,42 @@
+import threading
+import time
+import pytest
+from config import Config
+from services.fact_checker import FactChecker, QUERY_FAILED
+
+TEXT = ('The slow claim is still being checked by the service. '
+        'The failing claim is one the service could not answer. '
+        'The quick claim is one the service knows very well.')
+
+
+@pytest.fixture
+def checker(monkeypatch):
+    monkeypatch.setattr(Config, 'CLAIM_CACHE_ENABLED', False)
+    monkeypatch.setattr(Config, 'FACT_CHECK_DEADLINE', 0.5)
+    release = threading.Event()
+
+    def query(claim):
+        if 'slow' in claim:
+            release.wait(5)
+            return None
+        if 'failing' in claim:
+            return QUERY_FAILED
+        return {'claim': claim, 'fact_check': {'rating': 'True', 'source': 'Example'}}
+
+    checker = FactChecker()
+    monkeypatch.setattr(checker, '_query_api', query)
+    yield checker
+    release.set()
+
+
+def test_claims_are_sorted_by_outcome_at_the_deadline(checker):
+    started = time.monotonic()
+    result = checker.verify_claims(TEXT)
+
+    assert time.monotonic() - started < 2
+    assert [c['claim'] for c in result['timed_out_claims']] == ['The slow claim is still being checked by the service']
+    assert [c['claim'] for c in result['failed_claims']] == ['The failing claim is one the service could not answer']
+    assert [c['claim'] for c in result['verified_claims']] == ['The quick claim is one the service knows very well']
+    assert result['timed_out_claims'][0]['status'] == 'TIMEOUT'
+    assert result['failed_claims'][0]['status'] == 'ERROR'
+    assert result['overall_verification']['status'] == 'MOSTLY_TRUE'
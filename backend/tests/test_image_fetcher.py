@@ -0,0 +1,43 @@
+from io import BytesIO
+import pytest
+from PIL import Image, JpegImagePlugin
+from services.image_fetcher import FetchedImage
+
+
+def _jpeg(width, height):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), (120, 30, 200)).save(buffer, 'JPEG')
+    return FetchedImage('https://example.com/photo.jpg', buffer.getvalue(), 'image/jpeg')
+
+
+@pytest.fixture
+def decoded_sizes(monkeypatch):
+    """Sizes JPEG draft mode decodes at"""
+    sizes = []
+    draft = JpegImagePlugin.JpegImageFile.draft
+
+    def recording_draft(self, mode, size):
+        result = draft(self, mode, size)
+        sizes.append(self.size)
+        return result
+
+    monkeypatch.setattr(JpegImagePlugin.JpegImageFile, 'draft', recording_draft)
+    return sizes
+
+
+@pytest.mark.parametrize('width, height, decoded', [
+    (4000, 3000, (2000, 1500)),
+    (3000, 4000, (1500, 2000)),
+    (8000, 6000, (2000, 1500)),
+])
+def test_non_square_jpegs_decode_reduced(decoded_sizes, width, height, decoded):
+    img = _jpeg(width, height).rgb(max_side=1920)
+    assert decoded_sizes == [decoded]
+    assert max(img.size) == 1920
+    assert abs(img.width / img.height - width / height) < 0.01
+
+
+def test_rgb_is_computed_once_per_size():
+    fetched = _jpeg(640, 480)
+    assert fetched.rgb(max_side=1920) is fetched.rgb(max_side=1920)
+    assert fetched.rgb(max_side=1920).size == (640, 480)
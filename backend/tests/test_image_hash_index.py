@@ -0,0 +1,68 @@
+import random
+import numpy as np
+import pytest
+from services.image_hash_index import ImageHashIndex, _popcount, _to_signed
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / 'hashes.db')
+
+
+def _flip(value, bits, rng):
+    for bit in rng.sample(range(64), bits):
+        value ^= 1 << bit
+    return value
+
+
+def _fill(path, phashes):
+    conn = ImageHashIndex(path)._connection()
+    with conn:
+        conn.executemany(
+            'INSERT INTO image_hashes (phash, dhash, ahash, label, created_at) VALUES (?, 0, 0, ?, 0)',
+            [(_to_signed(int(p)), 'stock') for p in phashes]
+        )
+
+
+def test_popcount():
+    values = np.array([0, 1, 0xFF, 2 ** 64 - 1], dtype=np.uint64)
+    assert _popcount(values).tolist() == [0, 1, 8, 64]
+
+
+def test_add_and_find_near_duplicate(index_path):
+    index = ImageHashIndex(index_path, max_distance=8)
+    phash = 0x0123456789ABCDEF
+    assert index.add({'phash': phash, 'dhash': 7, 'ahash': 1}, url='https://example.com/a.jpg',
+                     label='known_fake', sha256='abc')
+    assert not index.add({'phash': phash, 'dhash': 7, 'ahash': 1}, sha256='abc')
+
+    [match] = index.lookup({'phash': phash ^ 0b1011, 'dhash': 7})
+    assert match['url'] == 'https://example.com/a.jpg'
+    assert match['label'] == 'known_fake'
+    assert match['phash_distance'] == 3
+    assert index.lookup({'phash': phash ^ 0x1FF, 'dhash': 7}) == []
+
+
+@pytest.mark.parametrize('rebuild_min', [0, 10 ** 6])
+def test_lookup_matches_brute_force(index_path, rebuild_min):
+    # rebuild_min=0 probes the chunk tables, 10**6 scans unindexed rows
+    np_rng = np.random.default_rng(3)
+    phashes = np_rng.integers(0, 2 ** 64 - 1, 5000, dtype=np.uint64)
+    _fill(index_path, phashes)
+    index = ImageHashIndex(index_path, max_distance=8, rebuild_min=rebuild_min)
+
+    rng = random.Random(4)
+    for _ in range(50):
+        query = _flip(int(phashes[rng.randrange(len(phashes))]), rng.randint(0, 8), rng)
+        expected = np.flatnonzero(_popcount(phashes ^ np.uint64(query)) <= 8) + 1
+        found = index.lookup({'phash': query, 'dhash': 0}, limit=100)
+        assert sorted(match['phash_distance'] for match in found) == \
+            sorted(_popcount(phashes[expected - 1] ^ np.uint64(query)).tolist())
+
+
+def test_picks_up_rows_added_by_other_workers(index_path):
+    index = ImageHashIndex(index_path, sync_interval=0)
+    assert index.lookup({'phash': 42, 'dhash': 0}) == []
+    ImageHashIndex(index_path).add({'phash': 42, 'dhash': 0, 'ahash': 0}, label='stock')
+    assert [m['label'] for m in index.lookup({'phash': 42, 'dhash': 0})] == ['stock']
+    assert index.stats()['images'] == 1
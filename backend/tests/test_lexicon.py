@@ -0,0 +1,50 @@
+import os
+from config import Config
+from models.bias_detector import BiasDetector
+from utils.lexicon import Lexicon
+
+
+def _terms(matches):
+    return [match['term'] for match in matches]
+
+
+def test_terms_match_whole_words_only():
+    lexicon = Lexicon({'urgency': ['now'], 'diversity': ['but']})
+    text = "I know it snows nowhere, but butter is sold now. Now!"
+    assert _terms(lexicon.find(text)) == ['but', 'now', 'now']
+
+
+def test_matching_ignores_case_and_reports_spans():
+    lexicon = Lexicon({'urgency': ['breaking']})
+    [match] = lexicon.find("BREAKING: markets fall")
+    assert (match['term'], match['start'], match['end']) == ('breaking', 0, 8)
+
+
+def test_longest_term_wins_on_shared_prefixes():
+    lexicon = Lexicon({'loaded': ['elite', 'elites', 'regime']})
+    assert _terms(lexicon.find("The elites and the elite regime")) == ['elites', 'elite', 'regime']
+
+
+def test_phrases_match_across_any_whitespace():
+    lexicon = Lexicon({'diversity': ['on the other hand']})
+    assert _terms(lexicon.find("On  the\nother hand, no.")) == ['on the other hand']
+    assert lexicon.find("on the others hand") == []
+
+
+def test_scan_groups_by_category_and_shares_terms():
+    lexicon = Lexicon({'a': ['crisis'], 'b': ['crisis', 'alert']})
+    result = lexicon.scan("Crisis alert")
+    assert _terms(result['a']) == ['crisis']
+    assert _terms(result['b']) == ['crisis', 'alert']
+
+
+def test_shipped_lexicons_do_not_match_inside_words():
+    lexicon = Lexicon.from_files(os.path.join(Config.LEXICON_DIR, 'manipulation.json'))
+    assert lexicon.find("I know the snowplow knows nothing about known unknowns") == []
+
+
+def test_bias_detector_counts_words_not_substrings():
+    result = BiasDetector().detect_bias(
+        "The thug was said to be a liberal. Thuggish illiberal sayings are not counted."
+    )
+    assert sorted(result['biased_words_found']) == ['liberal', 'thug']
@@ -0,0 +1,80 @@
+import multiprocessing
+import time
+import pytest
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+from utils.limiter_storage import SQLiteStorage
+
+
+@pytest.fixture
+def uri(tmp_path):
+    return f"sqlite:///{tmp_path / 'ratelimit.db'}"
+
+
+def test_sqlite_scheme_is_registered(uri):
+    storage = storage_from_string(uri)
+    assert isinstance(storage, SQLiteStorage)
+    assert storage.check()
+
+
+def test_incr_counts_within_the_window(uri):
+    storage = SQLiteStorage(uri)
+    assert storage.incr('client', expiry=60) == 1
+    assert storage.incr('client', expiry=60, amount=2) == 3
+    assert storage.get('client') == 3
+    assert storage.get('other') == 0
+    assert time.time() < storage.get_expiry('client') <= time.time() + 60
+
+
+def test_counter_restarts_after_the_window(uri):
+    storage = SQLiteStorage(uri)
+    storage.incr('client', expiry=0.05)
+    storage.incr('client', expiry=0.05)
+    time.sleep(0.1)
+    assert storage.get('client') == 0
+    assert storage.incr('client', expiry=60) == 1
+
+
+def test_elastic_expiry_extends_the_window(uri):
+    storage = SQLiteStorage(uri)
+    storage.incr('client', expiry=1)
+    first = storage.get_expiry('client')
+    storage.incr('client', expiry=30, elastic_expiry=True)
+    assert storage.get_expiry('client') > first + 20
+
+
+def test_clear_and_reset(uri):
+    storage = SQLiteStorage(uri)
+    storage.incr('a', expiry=60)
+    storage.incr('b', expiry=60)
+    storage.clear('a')
+    assert storage.get('a') == 0
+    assert storage.reset() == 1
+    assert storage.get('b') == 0
+
+
+def test_limiter_enforces_limits(uri):
+    limiter = FixedWindowRateLimiter(storage_from_string(uri))
+    item = parse('3 per minute')
+    assert [limiter.hit(item, 'client') for _ in range(4)] == [True, True, True, False]
+    assert limiter.hit(item, 'another-client')
+
+
+def _hit_many(uri, hits, queue):
+    limiter = FixedWindowRateLimiter(storage_from_string(uri))
+    item = parse('50 per hour')
+    queue.put(sum(limiter.hit(item, 'shared-client') for _ in range(hits)))
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='needs fork')
+def test_processes_share_counters(uri):
+    ctx = multiprocessing.get_context('fork')
+    queue = ctx.Queue()
+    workers = [ctx.Process(target=_hit_many, args=(uri, 40, queue)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    admitted = sum(queue.get(timeout=30) for _ in workers)
+    for worker in workers:
+        worker.join()
+    assert admitted == 50
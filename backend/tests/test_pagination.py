@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+import pytest
+from database import db, Analysis
+from utils.error_handler import ValidationError
+from utils.pagination import decode_cursor, encode_cursor, keyset_page
+
+
+def _add_analyses(user, timestamps):
+    for created_at in timestamps:
+        db.session.add(Analysis(user_id=user.id, content_type='text', content_preview='x',
+                                trust_score=50, grade='C', created_at=created_at))
+    db.session.commit()
+
+
+def _pages(user, per_page):
+    query = Analysis.query.filter(Analysis.user_id == user.id)\
+        .order_by(Analysis.created_at.desc(), Analysis.id.desc())
+    pages, cursor = [], None
+    while True:
+        rows, cursor = keyset_page(query, Analysis.created_at, Analysis.id, per_page, cursor)
+        pages.append([(row.created_at, row.id) for row in rows])
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip_keeps_microseconds():
+    created_at = datetime(2025, 3, 1, 12, 30, 5, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', encode_cursor(datetime(2025, 1, 1), 1)[:-3]])
+def test_invalid_cursor_is_a_validation_error(cursor):
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor)
+
+
+def test_pages_across_equal_timestamps(user):
+    # Batched writes give many rows the same created_at
+    same = datetime(2025, 3, 1, 12, 0, 0, 500000)
+    _add_analyses(user, [same] * 23 + [same + timedelta(seconds=1)] * 4 + [same - timedelta(seconds=1)] * 3)
+
+    pages = _pages(user, per_page=10)
+    rows = [row for page in pages for row in page]
+    assert [len(page) for page in pages] == [10, 10, 10]
+    assert len(set(rows)) == 30
+    assert rows == sorted(rows, reverse=True)
+
+
+def test_last_page_has_no_cursor(user):
+    _add_analyses(user, [datetime(2025, 3, 1)] * 10)
+    assert [len(page) for page in _pages(user, per_page=10)] == [10]
+    assert _pages(user, per_page=20) == [_pages(user, per_page=10)[0]]
@@ -0,0 +1,68 @@
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from database import db, Analysis, DailyUsage
+from utils.quota import DailyQuota, utc_today
+
+
+def test_reserve_stops_at_the_limit(user):
+    quota = DailyQuota()
+    assert all(quota.reserve(user) for _ in range(Config.RATE_LIMIT_FREE))
+    assert not quota.reserve(user)
+    assert db.session.get(DailyUsage, (user.id, utc_today())).count == Config.RATE_LIMIT_FREE
+    assert quota.usage(user)['remaining'] == 0
+
+
+def test_multi_item_reservations_are_all_or_nothing(user):
+    quota = DailyQuota()
+    assert quota.reserve(user, Config.RATE_LIMIT_FREE - 2)
+    assert not quota.reserve(user, 3)
+    assert quota.usage(user)['used'] == Config.RATE_LIMIT_FREE - 2
+
+
+def test_release_gives_back_a_reservation(user):
+    quota = DailyQuota()
+    assert quota.reserve(user, Config.RATE_LIMIT_FREE)
+    quota.release(user)
+    assert quota.usage(user)['used'] == Config.RATE_LIMIT_FREE - 1
+    assert quota.reserve(user)
+    assert not quota.reserve(user)
+
+
+def test_release_never_goes_below_zero(user):
+    quota = DailyQuota()
+    assert quota.reserve(user)
+    quota.release(user, 5)
+    assert quota.usage(user)['used'] == 1
+
+
+def test_workers_share_the_database_count(user):
+    # Two workers, each with its own cache
+    first, second = DailyQuota(), DailyQuota()
+    assert first.reserve(user, Config.RATE_LIMIT_FREE - 1)
+    assert second.reserve(user)
+    assert not first.reserve(user)
+    assert not second.reserve(user)
+
+
+def test_concurrent_reservations_never_overshoot(app, user):
+    quota = DailyQuota()
+
+    def reserve(_):
+        with app.app_context():
+            return quota.reserve(user)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        granted = sum(pool.map(reserve, range(3 * Config.RATE_LIMIT_FREE)))
+    assert granted == Config.RATE_LIMIT_FREE
+
+
+def test_first_reservation_counts_analyses_already_stored_today(user):
+    for _ in range(3):
+        db.session.add(Analysis(user_id=user.id, content_type='text', content_preview='x',
+                                trust_score=50, grade='C', created_at=datetime.utcnow()))
+    db.session.commit()
+
+    quota = DailyQuota()
+    assert quota.reserve(user)
+    assert quota.usage(user)['used'] == 4
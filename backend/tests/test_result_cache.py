@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from database import db, AnalysisBlob, CachedResult
+from utils import result_cache
+from utils.result_cache import ResultCache, is_degraded
+
+
+def _result(**stages):
+    result = {
+        'fake_news_detection': {'label': 'REAL', 'probabilities': {'REAL': 0.9, 'FAKE': 0.1}},
+        'fact_checking': {'claims_found': 0, 'verified_claims': [], 'timed_out_claims': [], 'failed_claims': []},
+        'image_verification': None,
+        'overall_trust_score': {'score': 80, 'grade': 'B'}
+    }
+    result.update(stages)
+    return result
+
+
+def test_complete_result_is_not_degraded():
+    assert not is_degraded(_result())
+
+
+def test_model_error_is_degraded():
+    assert is_degraded(_result(fake_news_detection={'label': 'ERROR'}))
+
+
+def test_sentiment_fallback_is_degraded():
+    fallback = {'sentiment': {'negative': 0, 'neutral': 1, 'positive': 0}, 'error': 'CUDA out of memory'}
+    assert is_degraded(_result(sentiment_analysis=fallback))
+    assert not is_degraded(_result(sentiment_analysis={'sentiment': {'negative': 0.2, 'neutral': 0.7, 'positive': 0.1}}))
+
+
+def test_fact_check_timeouts_and_failures_are_degraded():
+    timed_out = {'timed_out_claims': [{'claim': 'x', 'status': 'TIMEOUT'}], 'failed_claims': []}
+    failed = {'timed_out_claims': [], 'failed_claims': [{'claim': 'x', 'status': 'ERROR'}]}
+    assert is_degraded(_result(fact_checking=timed_out))
+    assert is_degraded(_result(fact_checking=failed))
+
+
+def test_failed_image_fetch_is_degraded():
+    image = {'metadata_analysis': {'error': 'Could not analyze metadata'},
+             'manipulation_detection': {'error': 'Could not detect manipulation'}}
+    assert is_degraded(_result(image_verification=image))
+
+
+def test_degraded_results_are_not_cached(app):
+    cache = ResultCache()
+    cache.set('degraded', _result(fact_checking={'timed_out_claims': [{'claim': 'x'}]}))
+    cache.set('complete', _result())
+
+    assert cache.get('degraded') == (None, None)
+    assert cache.get('complete')[1] == 'memory'
+    assert cache.stats()['degraded_skipped'] == 1
+
+
+def test_expired_rows_are_swept_periodically(app, monkeypatch):
+    monkeypatch.setattr(result_cache, 'SWEEP_EVERY', 2)
+    cache = ResultCache()
+    stale = datetime.utcnow() - cache.db_ttl - timedelta(minutes=1)
+    db.session.add(CachedResult(cache_key='old:v', content_hash='old', version='v', created_at=stale))
+    db.session.commit()
+
+    cache.set('first', _result())
+    assert db.session.get(CachedResult, 'old:v') is not None
+    cache.set('second', _result())
+
+    assert db.session.get(CachedResult, 'old:v') is None
+    assert CachedResult.query.count() == 2
+    assert cache.stats()['expired_swept'] == 1
+
+
+def test_database_tier_stores_the_result_as_a_shared_blob(app):
+    cache = ResultCache()
+    cache.set('abc', _result())
+    cache.memory.clear()
+
+    row = db.session.get(CachedResult, cache.key('abc'))
+    assert row.inline_result is None
+    assert db.session.get(AnalysisBlob, row.result_hash).load() == _result()
+    assert cache.get('abc') == (_result(), 'database')
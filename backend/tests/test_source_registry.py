@@ -0,0 +1,31 @@
+from services.source_registry import SourceRegistry
+
+SOURCES = [
+    {'id': 'abc-news', 'name': 'ABC News', 'url': 'https://abcnews.go.com'},
+    {'id': 'espn', 'name': 'ESPN', 'url': 'http://espn.go.com'},
+    {'id': 'bbc-news', 'name': 'BBC News', 'url': 'http://www.bbc.co.uk/news'},
+]
+
+
+def _registry():
+    registry = SourceRegistry(api_key=None)
+    registry._build_index(SOURCES, fetched_at=1)
+    return registry
+
+
+def test_sources_on_a_shared_domain_keep_their_own_host():
+    registry = _registry()
+    assert registry.lookup('https://abcnews.go.com/US/story')['id'] == 'abc-news'
+    assert registry.lookup('espn.go.com')['id'] == 'espn'
+    assert registry.lookup('scores.espn.go.com')['id'] == 'espn'
+
+
+def test_shared_registrable_domain_matches_nothing():
+    assert _registry().lookup('go.com') is None
+    assert _registry().lookup('unknown.go.com') is None
+
+
+def test_subdomains_fall_back_to_a_single_source_domain():
+    registry = _registry()
+    assert registry.lookup('sport.bbc.co.uk')['id'] == 'bbc-news'
+    assert registry.lookup('example.co.uk') is None
@@ -0,0 +1,93 @@
+import threading
+import time
+import pytest
+from utils.write_behind import WriteBehindQueue, _queues, flush_all
+
+
+@pytest.fixture(autouse=True)
+def forget_queues():
+    yield
+    _queues.clear()
+
+
+class Recorder:
+    """write_fn that records batches and can fail or stall on demand"""
+
+    def __init__(self, fail_on=(), delay=0):
+        self.batches = []
+        self.fail_on = set(fail_on)
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, records):
+        time.sleep(self.delay)
+        if self.fail_on.intersection(records):
+            raise RuntimeError('bad record')
+        with self.lock:
+            self.batches.append(list(records))
+
+    @property
+    def written(self):
+        return sorted(record for batch in self.batches for record in batch)
+
+
+def test_flush_writes_everything_submitted():
+    recorder = Recorder()
+    queue = WriteBehindQueue('test', recorder, batch_size=50, max_delay_ms=20)
+    for i in range(200):
+        assert queue.submit([i])
+    assert queue.flush(timeout=5)
+    assert recorder.written == list(range(200))
+    assert queue.stats()['pending'] == 0
+    assert queue.stats()['written'] == 200
+
+
+def test_records_are_grouped_into_batches():
+    recorder = Recorder()
+    queue = WriteBehindQueue('test', recorder, batch_size=100, max_delay_ms=200)
+    queue.submit(range(60))
+    assert queue.flush(timeout=5)
+    assert len(recorder.batches) < 60
+    assert max(len(batch) for batch in recorder.batches) <= 100
+
+
+def test_failing_record_does_not_take_its_batch_down():
+    recorder = Recorder(fail_on={13})
+    queue = WriteBehindQueue('test', recorder, batch_size=50, max_delay_ms=50, max_retries=2)
+    queue.submit(range(30))
+    assert queue.flush(timeout=5)
+    assert recorder.written == [i for i in range(30) if i != 13]
+    assert queue.stats()['failed'] == 1
+
+
+def test_drop_policy_discards_when_full():
+    recorder = Recorder(delay=0.2)
+    queue = WriteBehindQueue('test', recorder, batch_size=1, max_pending=2, max_delay_ms=0, policy='drop')
+    results = [queue.submit([i]) for i in range(10)]
+    assert not all(results)
+    assert queue.flush(timeout=5)
+    assert queue.stats()['dropped'] == results.count(False)
+
+
+def test_sync_policy_writes_inline_when_full():
+    recorder = Recorder(delay=0.05)
+    queue = WriteBehindQueue('test', recorder, batch_size=1, max_pending=1, max_delay_ms=0, policy='sync')
+    for i in range(10):
+        assert queue.submit([i])
+    assert queue.flush(timeout=5)
+    assert recorder.written == list(range(10))
+    assert queue.stats()['inline_writes'] > 0
+
+
+def test_flush_all_drains_every_queue():
+    recorders = [Recorder(), Recorder()]
+    queues = [WriteBehindQueue(f"test-{i}", recorder, max_delay_ms=500) for i, recorder in enumerate(recorders)]
+    for queue in queues:
+        queue.submit(range(5))
+    flush_all(timeout=5)
+    assert [recorder.written for recorder in recorders] == [list(range(5))] * 2
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        WriteBehindQueue('test', Recorder(), policy='later')
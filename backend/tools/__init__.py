@@ -0,0 +1 @@
+# Empty file
\ No newline at end of file
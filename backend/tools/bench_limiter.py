@@ -0,0 +1,87 @@
+"""Rate limiter storage benchmark.
+
+Measures the per-request cost of a limiter hit for each storage URI, both
+from one process and from several processes sharing the counters (as
+Gunicorn workers do), and checks that the processes together never admit
+more requests than the limit allows.
+
+Usage (from backend/):
+    python -m tools.bench_limiter
+    python -m tools.bench_limiter --uris memory://,sqlite:////tmp/bench-ratelimit.db,redis://localhost:6379 --processes 4
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+import utils.limiter_storage  # noqa: F401  registers sqlite://
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def _hit_loop(uri, hits, keys, limit, queue):
+    """Time `hits` limiter hits spread over `keys` clients (child process)"""
+    limiter = FixedWindowRateLimiter(storage_from_string(uri))
+    item = parse(limit)
+    timings, admitted = [], 0
+    for i in range(hits):
+        started = time.perf_counter()
+        if limiter.hit(item, f"client-{i % keys}"):
+            admitted += 1
+        timings.append(time.perf_counter() - started)
+    queue.put((timings, admitted))
+
+
+def _run(uri, processes, hits, keys, limit):
+    storage_from_string(uri).reset()
+    ctx = multiprocessing.get_context('fork')
+    queue = ctx.Queue()
+    workers = [ctx.Process(target=_hit_loop, args=(uri, hits, keys, limit, queue)) for _ in range(processes)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    results = [queue.get() for _ in workers]
+    elapsed = time.perf_counter() - started
+    for worker in workers:
+        worker.join()
+
+    timings = [t for worker_timings, _ in results for t in worker_timings]
+    return {
+        'p50_us': round(_percentile(timings, 0.5) * 1e6, 1),
+        'p99_us': round(_percentile(timings, 0.99) * 1e6, 1),
+        'hits_per_second': round(len(timings) / elapsed),
+        'admitted': sum(admitted for _, admitted in results)
+    }
+
+
+def main():
+    default_sqlite = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'truthlens-bench-ratelimit.db')}"
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--uris', default=f"memory://,{default_sqlite}", help='comma-separated storage URIs')
+    parser.add_argument('--processes', type=int, default=4, help='concurrent processes in the shared run')
+    parser.add_argument('--hits', type=int, default=5000, help='hits per process')
+    parser.add_argument('--keys', type=int, default=50, help='distinct clients (rate limit keys)')
+    parser.add_argument('--limit', default='100 per hour', help='limit applied to every client')
+    args = parser.parse_args()
+
+    per_key_limit = parse(args.limit).amount
+    print(f"{args.hits} hits per process over {args.keys} clients, limit '{args.limit}'\n")
+    print(f"{'storage':<48} {'procs':>5} {'p50 µs':>8} {'p99 µs':>8} {'hits/s':>9} {'admitted':>9} {'expected':>9}")
+    for uri in [u.strip() for u in args.uris.split(',') if u.strip()]:
+        for processes in sorted({1, args.processes}):
+            result = _run(uri, processes, args.hits, args.keys, args.limit)
+            # memory:// is per process, so each process admits its own full quota
+            shared = not uri.startswith('memory://')
+            expected = min(args.hits * processes, per_key_limit * args.keys * (1 if shared else processes))
+            print(f"{uri:<48} {processes:>5} {result['p50_us']:>8} {result['p99_us']:>8} "
+                  f"{result['hits_per_second']:>9} {result['admitted']:>9} {expected:>9}")
+
+
+if __name__ == '__main__':
+    main()
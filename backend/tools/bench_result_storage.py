@@ -0,0 +1,182 @@
+"""Analysis result storage benchmark.
+
+Fills a scratch SQLite database with synthetic analyses stored the old way
+(inline JSON in analyses.analysis_result), measures file size and history
+query latency, migrates the results into compressed blobs with
+tools.migrate_result_blobs and measures again.
+
+Usage (from backend/):
+    python -m tools.bench_result_storage
+    python -m tools.bench_result_storage --rows 20000 --duplicate-rate 0.4 --codec zstd
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import tuple_
+from sqlalchemy.orm import load_only, undefer
+from config import Config
+from database import db, create_app, Analysis, AnalysisBlob, User
+from tools.migrate_result_blobs import checkpoint, migrate, vacuum
+
+WORDS = ('government officials report economy election vaccine climate study researchers claim '
+         'evidence sources policy president minister health market data analysis breaking').split()
+
+
+def _sentence(rng, words=20):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _synthetic_result(rng):
+    """A result shaped like run_analyses() output"""
+    score = round(rng.uniform(20, 95), 1)
+    return {
+        'fake_news_detection': {
+            'prediction': rng.choice(['FAKE', 'REAL']),
+            'confidence': round(rng.random(), 4),
+            'probabilities': {'fake': round(rng.random(), 4), 'real': round(rng.random(), 4)}
+        },
+        'sentiment_analysis': {
+            'sentiment': {'negative': round(rng.random(), 4), 'neutral': round(rng.random(), 4),
+                          'positive': round(rng.random(), 4)},
+            'manipulation_score': {'score': round(rng.random(), 2), 'detected_tactics': ['urgency']},
+            'polarity': round(rng.uniform(-1, 1), 3),
+            'subjectivity': round(rng.random(), 3),
+            'red_flags': ['Clickbait language'] if rng.random() < 0.3 else []
+        },
+        'bias_detection': {
+            'overall_bias_score': round(rng.random(), 3),
+            'biased_words_found': rng.sample(WORDS, 3),
+            'biased_word_spans': [{'word': w, 'start': i * 40, 'end': i * 40 + len(w)}
+                                  for i, w in enumerate(rng.sample(WORDS, 5))]
+        },
+        'fact_checking': {
+            'claims_found': 3,
+            'fact_checks': [{'claim': _sentence(rng), 'text': _sentence(rng, 30), 'rating': 'False',
+                             'publisher': 'Example Fact Check', 'url': f"https://example.org/{rng.random()}"}
+                            for _ in range(3)]
+        },
+        'source_validation': None,
+        'image_verification': None,
+        'overall_trust_score': {'score': score, 'grade': 'A' if score > 80 else 'C', 'breakdown': [score] * 5}
+    }
+
+
+def _fill(rows, users, duplicate_rate, seed):
+    rng = random.Random(seed)
+    owners = []
+    for i in range(users):
+        user = User(email=f"bench{i}@example.com", password_hash='x')
+        db.session.add(user)
+        owners.append(user)
+    db.session.flush()
+
+    # Cache hits store the same result again, which is what the blob table deduplicates
+    results = []
+    base = datetime(2025, 1, 1)
+    for i in range(rows):
+        result = rng.choice(results) if results and rng.random() < duplicate_rate else _synthetic_result(rng)
+        results.append(result)
+        db.session.add(Analysis(
+            user_id=owners[i % users].id,
+            content_type='text',
+            content_preview=_sentence(rng, 60)[:500],
+            trust_score=result['overall_trust_score']['score'],
+            grade=result['overall_trust_score']['grade'],
+            analysis_result=result,
+            created_at=base + timedelta(seconds=i * 37)
+        ))
+        if i % 1000 == 999:
+            db.session.commit()
+    db.session.commit()
+    return owners[0].id
+
+
+def _time(fn, repeat):
+    fn()  # warm-up, so the first run does not pay for cold pages
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return round(sorted(timings)[len(timings) // 2] * 1000, 2)
+
+
+def _measure(path, user_id, per_page, repeat):
+    summary_columns = load_only(Analysis.id, Analysis.content_type, Analysis.content_preview,
+                                Analysis.trust_score, Analysis.grade, Analysis.created_at)
+    ordered = Analysis.query.filter(Analysis.user_id == user_id)\
+        .order_by(Analysis.created_at.desc(), Analysis.id.desc())
+    last = ordered.offset(ordered.count() - per_page - 1).first()
+    cursor = tuple_(last.created_at, last.id)
+
+    def summary_page():
+        [a.to_summary_dict() for a in ordered.options(summary_columns).limit(per_page)]
+
+    def deep_summary_page():
+        [a.to_summary_dict() for a in ordered.options(summary_columns).filter(
+            tuple_(Analysis.created_at, Analysis.id) < cursor
+        ).limit(per_page)]
+
+    def full_page():
+        rows = ordered.options(undefer(Analysis.analysis_result)).limit(per_page).all()
+        Analysis.preload_results(rows)
+        [a.to_dict() for a in rows]
+
+    def full_scan():
+        # The old history listing loaded every column of every row it touched
+        rows = Analysis.query.options(undefer(Analysis.analysis_result)).filter(Analysis.user_id == user_id).all()
+        Analysis.preload_results(rows)
+        [a.to_dict() for a in rows]
+
+    db.session.commit()
+    checkpoint()
+    # Whatever a reader kept from being checkpointed still counts
+    size = sum(os.path.getsize(p) for p in (path, path + '-wal') if os.path.exists(p))
+    return {
+        'db_mb': round(size / 1024 / 1024, 2),
+        'summary_page_ms': _time(summary_page, repeat),
+        'deep_summary_page_ms': _time(deep_summary_page, repeat),
+        'full_page_ms': _time(full_page, repeat),
+        'full_scan_ms': _time(full_scan, max(1, repeat // 5))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--duplicate-rate', type=float, default=0.3, help='share of rows repeating an earlier result')
+    parser.add_argument('--codec', choices=['zlib', 'zstd'], default=Config.RESULT_BLOB_CODEC)
+    parser.add_argument('--per-page', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=25, help='timed runs per query (median is reported)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    Config.RESULT_BLOB_CODEC = args.codec
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'bench.db')
+        app = create_app(f"sqlite:///{path}")
+        with app.app_context():
+            print(f"Filling {args.rows} analyses for {args.users} users...")
+            user_id = _fill(args.rows, args.users, args.duplicate_rate, args.seed)
+            before = _measure(path, user_id, args.per_page, args.repeat)
+
+            print(f"Migrating to {args.codec} blobs...")
+            migrate(log=lambda message: None)
+            vacuum()
+            after = _measure(path, user_id, args.per_page, args.repeat)
+            blobs = AnalysisBlob.query.count()
+
+    print(f"\n{args.rows} analyses, {blobs} distinct results, {args.per_page} rows per page\n")
+    print(f"{'metric':<22} {'inline JSON':>12} {'blobs':>10} {'change':>8}")
+    for key in before:
+        change = f"{(after[key] - before[key]) / before[key] * 100:+.0f}%" if before[key] else 'n/a'
+        print(f"{key:<22} {before[key]:>12} {after[key]:>10} {change:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Import a corpus of known images into the local perceptual-hash index.
+
+Usage (from backend/):
+    python -m tools.import_image_hashes --label known_fake --source "FactCheck archive" path/to/images/
+    python -m tools.import_image_hashes --label stock --source shutterstock --urls stock_urls.txt
+"""
+import argparse
+import mimetypes
+import os
+from config import Config
+from services.image_fetcher import FetchedImage, ImageFetchError, fetch_image
+from services.image_hash_index import ImageHashIndex, compute_hashes
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tif', '.tiff')
+
+
+def _local_images(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(IMAGE_EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def _load(location, is_url):
+    if is_url:
+        return fetch_image(location)
+    with open(location, 'rb') as f:
+        data = f.read()
+    return FetchedImage(location, data, mimetypes.guess_type(location)[0] or '')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='*', help='image files or directories')
+    parser.add_argument('--urls', help='text file with one image URL per line')
+    parser.add_argument('--label', required=True, choices=['known_fake', 'stock', 'verified'])
+    parser.add_argument('--source', help='where the corpus comes from, shown in matches')
+    parser.add_argument('--index', default=Config.IMAGE_HASH_INDEX_PATH, help='SQLite index path')
+    args = parser.parse_args()
+
+    locations = [(path, False) for path in _local_images(args.paths)]
+    if args.urls:
+        with open(args.urls, encoding='utf-8') as f:
+            locations.extend((line.strip(), True) for line in f if line.strip())
+
+    index = ImageHashIndex(args.index)
+    added = skipped = failed = 0
+    for location, is_url in locations:
+        try:
+            image = _load(location, is_url)
+            hashes = compute_hashes(image.rgb(max_side=1920))
+        except (ImageFetchError, OSError) as e:
+            print(f"skip {location}: {e}")
+            failed += 1
+            continue
+
+        if index.add(hashes, url=location if is_url else None, label=args.label,
+                     source=args.source, sha256=image.sha256):
+            added += 1
+        else:
+            skipped += 1
+
+    print(f"Imported {added} images ({skipped} already indexed, {failed} failed) into {args.index}")
+
+
+if __name__ == '__main__':
+    main()
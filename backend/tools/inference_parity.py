@@ -0,0 +1,150 @@
+"""Inference backend parity check.
+
+Runs a fixed corpus through FakeNewsDetector and SentimentAnalyzer with every
+inference backend and compares each backend against fp32: label agreement,
+probability deltas, latency and resident memory.
+
+Usage (from backend/):
+    python -m tools.inference_parity
+    python -m tools.inference_parity --backends fp32,int8 --corpus articles.txt --runs 5
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import time
+
+CORPUS = [
+    "The city council approved the new budget on Tuesday after a lengthy debate over school funding and road repairs.",
+    "SHOCKING: Scientists confirm that drinking lemon water cures every known disease, and doctors don't want you to know!!",
+    "According to the Bureau of Labor Statistics, the unemployment rate fell to 3.9 percent last month as hiring picked up.",
+    "Breaking: the government is secretly replacing all birds with surveillance drones, insiders reveal in leaked documents.",
+    "The central bank left interest rates unchanged, saying inflation was moving closer to its two percent target.",
+    "You won't believe what this celebrity said about the election. The elite media is hiding the truth from everyone.",
+    "Researchers published a peer-reviewed study in Nature describing a new method for recycling lithium-ion batteries.",
+    "Officials warn of a terrifying crisis as the regime's propaganda machine spreads fear across the nation immediately.",
+    "The local library will extend its opening hours during exam season, the county said in a statement on Friday.",
+    "Millions of voters were never registered, a viral post claims without providing any evidence or named sources.",
+    "The team won the championship after a late goal in extra time, ending a twenty-year wait for the trophy.",
+    "A new vaccine trial reported strong results, although critics say the sample size was too small to be conclusive.",
+]
+
+
+def _rss_mb():
+    """Current resident set size in MB (falls back to peak RSS off Linux)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _run_backend(backend, corpus, runs, queue):
+    """Load both models with one backend and time the corpus (child process)"""
+    from config import Config
+    Config.INFERENCE_BACKEND = backend
+    from models.fake_news_detector import FakeNewsDetector
+    from models.sentiment_analyzer import SentimentAnalyzer
+
+    baseline_rss = _rss_mb()
+    detector = FakeNewsDetector()
+    analyzer = SentimentAnalyzer()
+    loaded_rss = _rss_mb()
+
+    # Warm-up pass so one-off graph optimizations are not timed
+    detector.predict_batch(corpus[:2])
+    analyzer.analyze_emotions_batch(corpus[:2])
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fake_news = detector.predict_batch(corpus)
+        sentiment = analyzer.analyze_emotions_batch(corpus)
+        timings.append(time.perf_counter() - started)
+
+    queue.put({
+        'backend': backend,
+        'fake_news': [r['probabilities'] for r in fake_news],
+        'sentiment': [r['sentiment'] for r in sentiment],
+        'latency_ms_per_doc': round(min(timings) / len(corpus) * 1000, 2),
+        'model_rss_mb': round(loaded_rss - baseline_rss, 1),
+        'peak_rss_mb': _rss_mb()
+    })
+
+
+def _compare(baseline, candidate):
+    """Label agreement and probability deltas of a backend against fp32"""
+    report = {}
+    for task in ('fake_news', 'sentiment'):
+        agree, deltas = 0, []
+        for ref, other in zip(baseline[task], candidate[task]):
+            if max(ref, key=ref.get) == max(other, key=other.get):
+                agree += 1
+            deltas.extend(abs(ref[k] - other[k]) for k in ref)
+        report[task] = {
+            'label_agreement': round(agree / len(baseline[task]), 4),
+            'mean_prob_delta': round(sum(deltas) / len(deltas), 5),
+            'max_prob_delta': round(max(deltas), 5)
+        }
+    return report
+
+
+def main():
+    from models.inference import BACKENDS
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', default=','.join(BACKENDS), help='comma-separated backends to compare')
+    parser.add_argument('--corpus', help='text file with one document per line (default: built-in corpus)')
+    parser.add_argument('--runs', type=int, default=3, help='timed passes per backend (best is reported)')
+    parser.add_argument('--json', action='store_true', help='print the full report as JSON')
+    args = parser.parse_args()
+
+    corpus = CORPUS
+    if args.corpus:
+        with open(args.corpus, encoding='utf-8') as f:
+            corpus = [line.strip() for line in f if line.strip()]
+
+    backends = [b.strip() for b in args.backends.split(',') if b.strip()]
+    if 'fp32' not in backends:
+        backends.insert(0, 'fp32')
+
+    # Each backend runs in a fresh process so latency and RSS are not mixed up
+    ctx = multiprocessing.get_context('spawn')
+    results = {}
+    for backend in backends:
+        queue = ctx.Queue()
+        process = ctx.Process(target=_run_backend, args=(backend, corpus, args.runs, queue))
+        process.start()
+        results[backend] = queue.get()
+        process.join()
+
+    report = []
+    for backend in backends:
+        entry = {
+            'backend': backend,
+            'latency_ms_per_doc': results[backend]['latency_ms_per_doc'],
+            'speedup_vs_fp32': round(results['fp32']['latency_ms_per_doc'] / results[backend]['latency_ms_per_doc'], 2),
+            'model_rss_mb': results[backend]['model_rss_mb'],
+            'peak_rss_mb': results[backend]['peak_rss_mb']
+        }
+        entry.update(_compare(results['fp32'], results[backend]))
+        report.append(entry)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{len(corpus)} documents, best of {args.runs} runs\n")
+    print(f"{'backend':<8} {'ms/doc':>8} {'speedup':>8} {'model MB':>9} {'peak MB':>8} "
+          f"{'fake agree':>11} {'fake maxΔ':>10} {'sent agree':>11} {'sent maxΔ':>10}")
+    for e in report:
+        print(f"{e['backend']:<8} {e['latency_ms_per_doc']:>8} {e['speedup_vs_fp32']:>8} {e['model_rss_mb']:>9} "
+              f"{e['peak_rss_mb']:>8} {e['fake_news']['label_agreement']:>11} {e['fake_news']['max_prob_delta']:>10} "
+              f"{e['sentiment']['label_agreement']:>11} {e['sentiment']['max_prob_delta']:>10}")
+
+
+if __name__ == '__main__':
+    main()
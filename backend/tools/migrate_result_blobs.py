@@ -0,0 +1,93 @@
+"""Move inline analysis results into compressed, deduplicated blobs.
+
+Rows written before analysis_blobs existed keep their result in the
+analyses.analysis_result JSON column. This tool stores each of those results
+in analysis_blobs, points the row at it and clears the inline copy. It is
+safe to interrupt and re-run.
+
+Usage (from backend/):
+    python -m tools.migrate_result_blobs
+    python -m tools.migrate_result_blobs --batch-size 1000 --prune --vacuum
+"""
+import argparse
+import time
+from sqlalchemy.orm import undefer
+from config import Config
+from database import db, create_app, Analysis, AnalysisBlob, CachedResult
+
+
+def migrate(batch_size=500, log=print):
+    """Convert inline results in id order; returns the number of rows moved"""
+    moved, last_id = 0, 0
+    while True:
+        rows = Analysis.query.options(undefer(Analysis.analysis_result)).filter(
+            Analysis.id > last_id,
+            Analysis.result_hash.is_(None),
+            Analysis.analysis_result.isnot(None)
+        ).order_by(Analysis.id).limit(batch_size).all()
+        if not rows:
+            return moved
+
+        for row in rows:
+            if row.analysis_result is not None:
+                row.result_hash = AnalysisBlob.store(row.analysis_result)
+            # SQL NULL rather than a JSON 'null'
+            row.analysis_result = db.null()
+        db.session.commit()
+        moved += len(rows)
+        last_id = rows[-1].id
+        log(f"  {moved} rows migrated (last id {last_id})")
+
+
+def prune():
+    """Delete blobs no analysis or cached result refers to; returns the number deleted"""
+    referenced = db.session.query(Analysis.result_hash).filter(Analysis.result_hash.isnot(None)).union(
+        db.session.query(CachedResult.result_hash).filter(CachedResult.result_hash.isnot(None))
+    )
+    deleted = AnalysisBlob.query.filter(AnalysisBlob.sha256.notin_(referenced)).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+
+def vacuum():
+    """Give the space freed by the migration back to the file system (SQLite only)"""
+    if db.engine.dialect.name != 'sqlite':
+        return False
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        conn.execute(db.text('VACUUM'))
+    # In WAL mode VACUUM writes the compacted pages to the -wal file; copy them
+    # back and truncate it so the space is actually returned
+    checkpoint()
+    return True
+
+
+def checkpoint():
+    """Fold the write-ahead log into the main file and truncate it (SQLite only)"""
+    if db.engine.dialect.name != 'sqlite':
+        return
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        conn.execute(db.text('PRAGMA wal_checkpoint(TRUNCATE)'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default=Config.SQLALCHEMY_DATABASE_URI)
+    parser.add_argument('--batch-size', type=int, default=500, help='rows converted per transaction')
+    parser.add_argument('--prune', action='store_true', help='delete blobs nothing refers to')
+    parser.add_argument('--vacuum', action='store_true', help='compact the SQLite file afterwards')
+    args = parser.parse_args()
+
+    app = create_app(args.database_url)
+    with app.app_context():
+        started = time.perf_counter()
+        moved = migrate(args.batch_size)
+        blobs = AnalysisBlob.query.count()
+        print(f"Migrated {moved} results into {blobs} distinct blobs in {time.perf_counter() - started:.1f}s")
+        if args.prune:
+            print(f"Pruned {prune()} unreferenced blobs")
+        if args.vacuum and vacuum():
+            print("Vacuumed database")
+
+
+if __name__ == '__main__':
+    main()
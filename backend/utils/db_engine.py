@@ -0,0 +1,55 @@
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from config import Config
+
+# Connect-time SQLite settings. 'default' leaves SQLite's own defaults
+# (rollback journal, synchronous=FULL) for comparison in tools/bench_db.py.
+SQLITE_PROFILES = {
+    'default': {},
+    'tuned': {
+        'journal_mode': 'WAL',
+        'synchronous': Config.SQLITE_SYNCHRONOUS,
+        'mmap_size': Config.SQLITE_MMAP_SIZE,
+        'cache_size': -Config.SQLITE_CACHE_SIZE_KB,  # negative = KiB instead of pages
+        'temp_store': 'MEMORY',
+    },
+}
+
+
+def engine_options(url):
+    """SQLALCHEMY_ENGINE_OPTIONS suited to the database behind `url`"""
+    if url.startswith('sqlite'):
+        # busy_timeout is set through the driver so it also covers the first pragmas
+        connect_args = {'timeout': Config.SQLITE_BUSY_TIMEOUT_MS / 1000, 'check_same_thread': False}
+        if url in ('sqlite://', 'sqlite:///:memory:'):
+            return {'connect_args': connect_args, 'poolclass': StaticPool}
+        # One connection per concurrent thread; SQLite connections are cheap to keep open
+        return {
+            'connect_args': connect_args,
+            'pool_size': Config.DB_POOL_SIZE,
+            'max_overflow': Config.DB_MAX_OVERFLOW,
+            'pool_timeout': Config.DB_POOL_TIMEOUT
+        }
+
+    return {
+        'pool_size': Config.DB_POOL_SIZE,
+        'max_overflow': Config.DB_MAX_OVERFLOW,
+        'pool_timeout': Config.DB_POOL_TIMEOUT,
+        'pool_recycle': Config.DB_POOL_RECYCLE,
+        'pool_pre_ping': True,
+        'connect_args': {'connect_timeout': Config.DB_CONNECT_TIMEOUT} if url.startswith('postgresql') else {}
+    }
+
+
+def install_sqlite_pragmas(engine, profile=None):
+    """Apply a SQLite profile's pragmas to every new connection of `engine`"""
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = SQLITE_PROFILES[profile or Config.SQLITE_PROFILE]
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
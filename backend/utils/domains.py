@@ -0,0 +1,93 @@
+import threading
+from urllib.parse import urlparse
+from config import Config
+from utils.error_handler import logger
+
+# Multi-label public suffixes that are common in news URLs, used when no
+# Public Suffix List file is available
+MULTI_LABEL_SUFFIXES = {
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'ltd.uk', 'me.uk', 'net.uk',
+    'com.au', 'net.au', 'org.au', 'gov.au', 'edu.au',
+    'co.nz', 'org.nz', 'govt.nz',
+    'co.in', 'net.in', 'org.in', 'gov.in',
+    'co.jp', 'ne.jp', 'or.jp',
+    'co.za', 'org.za', 'gov.za',
+    'co.kr', 'or.kr',
+    'com.br', 'com.cn', 'com.mx', 'com.ar', 'com.tr', 'com.sg', 'com.hk',
+    'com.my', 'com.ph', 'com.pk', 'com.ng', 'com.eg', 'com.sa', 'com.tw',
+    'co.il', 'co.id', 'co.th', 'co.ke',
+}
+
+_rules = None
+_rules_lock = threading.Lock()
+
+
+def load_public_suffix_list(path):
+    """Parse a Public Suffix List file into (rules, wildcards, exceptions)"""
+    rules, wildcards, exceptions = set(), set(), set()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            rule = line.split(None, 1)[0].lower() if line.strip() else ''
+            if not rule or rule.startswith('//'):
+                continue
+            if rule.startswith('!'):
+                exceptions.add(rule[1:])
+            elif rule.startswith('*.'):
+                wildcards.add(rule[2:])
+            else:
+                rules.add(rule)
+    return rules, wildcards, exceptions
+
+
+def _suffix_rules():
+    global _rules
+    if _rules is None:
+        with _rules_lock:
+            if _rules is None:
+                path = Config.PUBLIC_SUFFIX_LIST
+                try:
+                    _rules = load_public_suffix_list(path)
+                    logger.info(f"Loaded {len(_rules[0])} public suffix rules from {path}")
+                except OSError:
+                    _rules = (MULTI_LABEL_SUFFIXES, set(), set())
+    return _rules
+
+
+def normalize_host(value):
+    """Lower-cased host name of a URL or bare domain, without port or 'www.'"""
+    value = (value or '').strip().lower()
+    if '//' not in value:
+        value = '//' + value
+    host = urlparse(value).hostname or ''
+    host = host.rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    return host
+
+
+def public_suffix(host):
+    """Number of trailing labels of a host that form its public suffix"""
+    rules, wildcards, exceptions = _suffix_rules()
+    labels = host.split('.')
+    # Candidates are checked longest first, so the first hit is the longest rule
+    for i in range(len(labels)):
+        candidate = '.'.join(labels[i:])
+        if candidate in exceptions:
+            return len(labels) - i - 1
+        if candidate in rules:
+            return len(labels) - i
+        if i + 1 < len(labels) and '.'.join(labels[i + 1:]) in wildcards:
+            return len(labels) - i
+    return 1
+
+
+def registrable_domain(value):
+    """The registrable domain (public suffix plus one label) of a URL or host"""
+    host = normalize_host(value)
+    if not host:
+        return host
+    labels = host.split('.')
+    suffix = public_suffix(host)
+    if len(labels) <= suffix:
+        return host
+    return '.'.join(labels[-(suffix + 1):])
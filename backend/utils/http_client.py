@@ -0,0 +1,137 @@
+import os
+import random
+import threading
+from collections import deque
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import Config
+from utils.fork_safety import register_after_fork
+
+# Per-service settings. Google Custom Search answers 429 when the daily quota
+# is used up, so retrying it would only burn time.
+SERVICES = {
+    'fact_check': {'read_timeout': 10, 'max_concurrency': 8, 'retry_statuses': (429, 500, 502, 503, 504)},
+    'newsapi': {'read_timeout': 5, 'max_concurrency': 2, 'retry_statuses': (429, 500, 502, 503, 504)},
+    'google_search': {'read_timeout': 10, 'max_concurrency': 4, 'retry_statuses': (500, 502, 503, 504)},
+    'image': {'read_timeout': 10, 'max_concurrency': 8, 'retry_statuses': (500, 502, 503, 504)},
+    'public_suffix_list': {'read_timeout': 30, 'max_concurrency': 1, 'retry_statuses': (500, 502, 503, 504)},
+}
+
+
+class JitteredRetry(Retry):
+    """Retry with full jitter on the exponential backoff"""
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return random.uniform(0, backoff) if backoff > 0 else 0
+
+
+class HttpClient:
+    """Shared HTTP layer for every external service.
+
+    Each service gets its own keep-alive session with per-host connection
+    pools, bounded retries with jittered backoff on 429/5xx, separate connect
+    and read timeouts and a concurrency limit.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._semaphores = {}
+        self._pid = os.getpid()
+        self._host_stats = {}
+
+    def get(self, service, url, **kwargs):
+        """GET through the service's pooled session"""
+        settings = SERVICES[service]
+        kwargs.setdefault('timeout', (Config.HTTP_CONNECT_TIMEOUT, settings['read_timeout']))
+        session, semaphore = self._session(service)
+
+        with semaphore:
+            response = session.get(url, **kwargs)
+
+        self._record(urlparse(url).hostname, response)
+        return response
+
+    def stats(self):
+        """Per-host latency and connection reuse"""
+        connections = {}
+        with self._lock:
+            for session in self._sessions.values():
+                for adapter in session.adapters.values():
+                    pools = adapter.poolmanager.pools
+                    for key in pools.keys():
+                        pool = pools.get(key)
+                        if pool is None:
+                            continue
+                        entry = connections.setdefault(pool.host, {'new_connections': 0, 'pooled_requests': 0})
+                        entry['new_connections'] += pool.num_connections
+                        entry['pooled_requests'] += pool.num_requests
+
+            report = {}
+            for host, stats in self._host_stats.items():
+                latencies = sorted(stats['latencies'])
+                pool = connections.get(host, {'new_connections': 0, 'pooled_requests': 0})
+                requests_made = pool['pooled_requests']
+                report[host] = {
+                    'requests': stats['requests'],
+                    'errors': stats['errors'],
+                    'latency_ms': {
+                        'p50': round(latencies[len(latencies) // 2] * 1000, 1) if latencies else 0.0,
+                        'p95': round(latencies[int(len(latencies) * 0.95)] * 1000, 1) if latencies else 0.0
+                    },
+                    'new_connections': pool['new_connections'],
+                    'connection_reuse': round(1 - pool['new_connections'] / requests_made, 4) if requests_made else 0.0
+                }
+            return report
+
+    def reset(self):
+        """Drop sessions inherited from a parent process"""
+        with self._lock:
+            self._sessions = {}
+            self._semaphores = {}
+            self._host_stats = {}
+            self._pid = os.getpid()
+
+    def _session(self, service):
+        if self._pid != os.getpid():
+            self.reset()
+        with self._lock:
+            if service not in self._sessions:
+                settings = SERVICES[service]
+                retry = JitteredRetry(
+                    total=Config.HTTP_MAX_RETRIES,
+                    connect=Config.HTTP_MAX_RETRIES,
+                    read=Config.HTTP_MAX_RETRIES,
+                    status=Config.HTTP_MAX_RETRIES,
+                    backoff_factor=Config.HTTP_BACKOFF_FACTOR,
+                    status_forcelist=settings['retry_statuses'],
+                    allowed_methods=frozenset(['GET', 'HEAD']),
+                    respect_retry_after_header=False,
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=Config.HTTP_POOL_HOSTS,
+                    pool_maxsize=settings['max_concurrency'],
+                    max_retries=retry
+                )
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._sessions[service] = session
+                self._semaphores[service] = threading.BoundedSemaphore(settings['max_concurrency'])
+            return self._sessions[service], self._semaphores[service]
+
+    def _record(self, host, response):
+        with self._lock:
+            stats = self._host_stats.setdefault(host, {'requests': 0, 'errors': 0, 'latencies': deque(maxlen=500)})
+            stats['requests'] += 1
+            if response.status_code >= 400:
+                stats['errors'] += 1
+            stats['latencies'].append(response.elapsed.total_seconds())
+
+
+http_client = HttpClient()
+register_after_fork(http_client.reset)
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import re
+
+
+def lexicon_fingerprint(directory):
+    """Digest of every lexicon file, so edits invalidate cached analyses"""
+    digest = hashlib.md5()
+    try:
+        names = sorted(n for n in os.listdir(directory) if n.endswith('.json'))
+    except OSError:
+        return ''
+    for name in names:
+        digest.update(name.encode())
+        with open(os.path.join(directory, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def _trie_pattern(node):
+    """Regex for the terms below a trie node, sharing common prefixes"""
+    alternatives = []
+    optional = False
+    for char in sorted(node):
+        if char == '':
+            optional = True
+            continue
+        token = r'\s+' if char == ' ' else re.escape(char)
+        alternatives.append(token + _trie_pattern(node[char]))
+
+    if not alternatives:
+        return ''
+    if len(alternatives) == 1 and not optional:
+        return alternatives[0]
+    pattern = '(?:' + '|'.join(alternatives) + ')'
+    return pattern + '?' if optional else pattern
+
+
+class Lexicon:
+    """Multi-category term matcher compiled into one word-bounded regex.
+
+    Terms are merged into a character trie before compiling, so the regex
+    engine follows shared prefixes instead of trying every term at every
+    position, and one pass over the text finds every category.
+    """
+
+    def __init__(self, categories):
+        self.categories = {}
+        self._term_categories = {}
+        trie = {}
+        for category, terms in categories.items():
+            self.categories[category] = []
+            for term in terms:
+                term = self.normalize(term)
+                if not term:
+                    continue
+                self.categories[category].append(term)
+                self._term_categories.setdefault(term, []).append(category)
+                node = trie
+                for char in term:
+                    node = node.setdefault(char, {})
+                node[''] = {}
+
+        body = _trie_pattern(trie) or r'(?!x)x'
+        self.pattern = re.compile(r'\b' + body + r'\b', re.IGNORECASE)
+
+    @staticmethod
+    def normalize(term):
+        return ' '.join(term.lower().split())
+
+    @classmethod
+    def from_files(cls, *paths):
+        """Build a lexicon from JSON files mapping category -> list of terms"""
+        categories = {}
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                for category, terms in json.load(f).items():
+                    categories.setdefault(category, []).extend(terms)
+        return cls(categories)
+
+    def find(self, text):
+        """Every term occurrence as {term, start, end, categories}, in text order"""
+        matches = []
+        for match in self.pattern.finditer(text):
+            term = self.normalize(match.group(0))
+            matches.append({
+                'term': term,
+                'start': match.start(),
+                'end': match.end(),
+                'categories': self._term_categories.get(term, [])
+            })
+        return matches
+
+    def scan(self, text):
+        """Occurrences grouped by category: {category: [match, ...]}"""
+        by_category = {category: [] for category in self.categories}
+        for match in self.find(text):
+            for category in match['categories']:
+                by_category[category].append(match)
+        return by_category
@@ -0,0 +1,105 @@
+"""SQLite storage for flask-limiter.
+
+Importing this module registers the ``sqlite://`` scheme with `limits`, so
+every Gunicorn worker on a host can share one set of counters:
+
+    RATELIMIT_STORAGE_URI=sqlite:////var/run/truthlens/ratelimit.db
+
+Any other `limits` URI (``redis://``, ``memcached://``, ...) can be used
+instead to share counters across hosts.
+"""
+import os
+import sqlite3
+import threading
+import time
+from limits.storage import Storage
+
+
+class SQLiteStorage(Storage):
+    """Fixed-window rate limit counters in a SQLite WAL database.
+
+    Each hit is one upsert on the key's row. Rows whose window has ended are
+    reset in place by the next hit and swept out periodically.
+    """
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri, wrap_exceptions=False, sweep_interval=300, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        # Same form as SQLAlchemy: sqlite:///relative.db or sqlite:////absolute.db
+        self.path = uri.split('://', 1)[1][1:] or ':memory:'
+        self.sweep_interval = sweep_interval
+        self._swept_at = time.monotonic()
+        self._local = threading.local()
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def incr(self, key, expiry, elastic_expiry=False, amount=1):
+        """Add `amount` to the key's counter and return the new value"""
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'INSERT INTO rate_limits (key, count, expires_at) VALUES (?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET '
+                'count = CASE WHEN expires_at <= ? THEN excluded.count ELSE count + excluded.count END, '
+                'expires_at = CASE WHEN expires_at <= ? OR ? THEN excluded.expires_at ELSE expires_at END',
+                (key, amount, now + expiry, now, now, int(elastic_expiry))
+            )
+            count = conn.execute('SELECT count FROM rate_limits WHERE key = ?', (key,)).fetchone()[0]
+        self._maybe_sweep(now)
+        return count
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT count FROM rate_limits WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        row = self._connection().execute(
+            'SELECT expires_at FROM rate_limits WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self):
+        try:
+            self._connection().execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        conn = self._connection()
+        with conn:
+            return conn.execute('DELETE FROM rate_limits').rowcount
+
+    def clear(self, key):
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM rate_limits WHERE key = ?', (key,))
+
+    def _maybe_sweep(self, now):
+        if time.monotonic() - self._swept_at < self.sweep_interval:
+            return
+        self._swept_at = time.monotonic()
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM rate_limits WHERE expires_at <= ?', (now,))
+
+    def _connection(self):
+        # sqlite3 connections must not cross threads or forks
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS rate_limits ('
+                'key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID'
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
@@ -0,0 +1,37 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import tuple_
+from utils.error_handler import ValidationError
+
+
+def encode_cursor(created_at, row_id):
+    """Opaque cursor pointing just past a (created_at, id) row"""
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(created_at, id) of a cursor from encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise ValidationError('Invalid cursor')
+
+
+def keyset_page(query, created_column, id_column, per_page, cursor=None):
+    """One page of a query ordered newest first by (created_at, id).
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(created_column, id_column) < tuple_(created_at, row_id))
+
+    rows = query.limit(per_page + 1).all()
+    if len(rows) <= per_page:
+        return rows, None
+    rows = rows[:per_page]
+    return rows, encode_cursor(getattr(rows[-1], created_column.key), getattr(rows[-1], id_column.key))
@@ -0,0 +1,68 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.error_handler import logger
+
+
+class AnalysisPipeline:
+    """Runs independent analysis stages concurrently on a bounded thread pool.
+
+    The pool is shared by every request in the process, so `max_workers`
+    bounds the total number of stages in flight. A value of 1 runs stages
+    sequentially in the calling thread.
+    """
+
+    def __init__(self, max_workers=8):
+        self.max_workers = max(1, max_workers)
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    def run(self, stages):
+        """Run all stages and return their results keyed by stage name"""
+        return dict(self.iter_results(stages))
+
+    def iter_results(self, stages):
+        """Yield (name, result) pairs as stages complete.
+
+        `stages` maps stage names to zero-argument callables. Every stage is
+        allowed to finish; if any of them raised, the exception of the first
+        failing stage (in declaration order) is re-raised at the end.
+        """
+        errors = {}
+
+        if self.max_workers == 1:
+            for name, stage in stages.items():
+                try:
+                    result = stage()
+                except Exception as e:
+                    errors[name] = e
+                    continue
+                yield name, result
+        else:
+            executor = self._get_executor()
+            futures = {executor.submit(stage): name for name, stage in stages.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors[name] = e
+                    continue
+                yield name, result
+
+        for name in stages:
+            if name in errors:
+                logger.error(f"Pipeline stage '{name}' failed: {errors[name]}")
+                raise errors[name]
+
+    def _get_executor(self):
+        # Worker threads do not survive fork, so each process builds its own pool
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='analysis-stage'
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
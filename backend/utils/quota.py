@@ -0,0 +1,127 @@
+from datetime import datetime, time, timedelta, timezone
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from config import Config
+from database import db, Analysis, DailyUsage
+from utils.cache import TTLCache
+from utils.error_handler import logger
+
+
+def utc_today():
+    return datetime.now(timezone.utc).date()
+
+
+class DailyQuota:
+    """Per-user, per-day analysis counters.
+
+    A reservation is one conditional UPDATE (count + n <= limit) on the
+    user's row for the day, so concurrent workers can never overshoot a
+    quota. Each worker keeps a write-through copy of the counts it has
+    seen: a cached count that is already at the limit rejects without a
+    database round trip, and usage reads are served from the cache.
+    """
+
+    def __init__(self, cache_size=10000, cache_ttl=60):
+        self.cache = TTLCache(cache_size, cache_ttl)
+        self.rejections = 0
+
+    def limit_for(self, user):
+        return Config.RATE_LIMIT_FREE if user.subscription_tier == 'free' else Config.RATE_LIMIT_PRO
+
+    def reserve(self, user, amount=1):
+        """Count `amount` analyses against today's quota; False if it would be exceeded"""
+        day = utc_today()
+        limit = self.limit_for(user)
+        cached = self.cache.get((user.id, day))
+        if cached is not None and cached + amount > limit:
+            self.rejections += 1
+            return False
+
+        allowed, count = self._increment(user.id, day, amount, limit)
+        self.cache.set((user.id, day), count)
+        if not allowed:
+            self.rejections += 1
+        return allowed
+
+    def release(self, user, amount=1):
+        """Give back a reservation for analyses that did not complete"""
+        day = utc_today()
+        table = DailyUsage.__table__
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(
+                    table.update()
+                    .where(table.c.user_id == user.id, table.c.day == day, table.c.count >= amount)
+                    .values(count=table.c.count - amount)
+                )
+                count = conn.execute(
+                    select(table.c.count).where(table.c.user_id == user.id, table.c.day == day)
+                ).scalar()
+        except Exception as e:
+            logger.error(f"Quota release error: {e}")
+            return
+        if count is not None:
+            self.cache.set((user.id, day), count)
+
+    def usage(self, user):
+        """Today's limit, used and remaining analyses"""
+        day = utc_today()
+        limit = self.limit_for(user)
+        used = self.cache.get((user.id, day))
+        if used is None:
+            table = DailyUsage.__table__
+            with db.engine.connect() as conn:
+                used = conn.execute(
+                    select(table.c.count).where(table.c.user_id == user.id, table.c.day == day)
+                ).scalar() or 0
+            self.cache.set((user.id, day), used)
+        resets_at = datetime.combine(day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        return {
+            'date': day.isoformat(),
+            'limit': limit,
+            'used': used,
+            'remaining': max(0, limit - used),
+            'resets_at': resets_at.isoformat()
+        }
+
+    def stats(self):
+        return dict(self.cache.stats(), rejections=self.rejections)
+
+    def _increment(self, user_id, day, amount, limit):
+        """Atomically add `amount` if it fits; returns (allowed, current count)"""
+        table = DailyUsage.__table__
+        row = (table.c.user_id == user_id) & (table.c.day == day)
+        for _ in range(2):
+            with db.engine.begin() as conn:
+                updated = conn.execute(
+                    table.update()
+                    .where(row, table.c.count + amount <= limit)
+                    .values(count=table.c.count + amount)
+                ).rowcount
+                count = conn.execute(select(table.c.count).where(row)).scalar()
+            if updated:
+                return True, count
+            if count is not None:
+                return False, count
+
+            # First analysis of the day: seed the counter from analyses already
+            # stored today, so counts carry over from before counters existed
+            start = datetime.combine(day, time.min)
+            with db.engine.connect() as conn:
+                existing = conn.execute(
+                    select(func.count()).select_from(Analysis.__table__).where(
+                        Analysis.__table__.c.user_id == user_id,
+                        Analysis.__table__.c.created_at >= start
+                    )
+                ).scalar() or 0
+            allowed = existing + amount <= limit
+            try:
+                with db.engine.begin() as conn:
+                    conn.execute(table.insert().values(
+                        user_id=user_id, day=day, count=existing + amount if allowed else existing
+                    ))
+                return allowed, existing + amount if allowed else existing
+            except IntegrityError:
+                # Another worker created today's row first; retry the update
+                continue
+        return False, limit
@@ -0,0 +1,39 @@
+import hashlib
+import json
+import zlib
+from config import Config
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; zlib is always available
+    zstandard = None
+
+
+def encode_result(result, codec=None, level=None):
+    """Canonical JSON of a result compressed: (sha256, codec, raw size, data)"""
+    raw = json.dumps(result, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    sha256 = hashlib.sha256(raw).hexdigest()
+    codec = codec or Config.RESULT_BLOB_CODEC
+    if codec == 'zstd' and zstandard is None:
+        codec = 'zlib'
+
+    if codec == 'zstd':
+        data = zstandard.ZstdCompressor(level=level or Config.RESULT_BLOB_LEVEL).compress(raw)
+    elif codec == 'zlib':
+        data = zlib.compress(raw, level or Config.RESULT_BLOB_LEVEL)
+    else:
+        raise ValueError(f"Unknown result codec: {codec}")
+    return sha256, codec, len(raw), data
+
+
+def decode_result(codec, data):
+    """Inverse of encode_result"""
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError('zstandard is required to read zstd-compressed results')
+        raw = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == 'zlib':
+        raw = zlib.decompress(data)
+    else:
+        raise ValueError(f"Unknown result codec: {codec}")
+    return json.loads(raw)
@@ -0,0 +1,141 @@
+import hashlib
+from datetime import datetime, timedelta
+from config import Config
+from database import db, AnalysisBlob, CachedResult
+from utils.cache import TTLCache
+from utils.error_handler import logger
+from utils.lexicon import lexicon_fingerprint
+
+# Expired database rows are deleted in bulk once every this many stores
+SWEEP_EVERY = 500
+
+
+def compute_content_hash(cleaned_text, url, image_url):
+    """Hash of the normalized analysis inputs"""
+    parts = [' '.join((cleaned_text or '').split()), (url or '').strip(), (image_url or '').strip()]
+    return hashlib.md5('\x1f'.join(parts).encode()).hexdigest()
+
+
+def cache_version():
+    """Short fingerprint of everything that changes analysis output"""
+    settings = [
+        Config.RESULT_CACHE_VERSION,
+        Config.FAKE_NEWS_MODEL,
+        Config.SENTIMENT_MODEL,
+        Config.INFERENCE_BACKEND,
+        Config.LONG_DOC_ENABLED,
+        Config.LONG_DOC_STRIDE,
+        Config.LONG_DOC_MAX_WINDOWS,
+        Config.LONG_DOC_AGGREGATION,
+        lexicon_fingerprint(Config.LEXICON_DIR)
+    ]
+    return hashlib.md5('|'.join(str(s) for s in settings).encode()).hexdigest()[:12]
+
+
+def is_degraded(result):
+    """True if some stage of the analysis failed or ran out of time"""
+    fake_news = result.get('fake_news_detection') or {}
+    if fake_news.get('label') == 'ERROR':
+        return True
+
+    sentiment = result.get('sentiment_analysis') or {}
+    if sentiment.get('error'):
+        return True
+
+    fact_checking = result.get('fact_checking') or {}
+    if fact_checking.get('timed_out_claims') or fact_checking.get('failed_claims'):
+        return True
+
+    image = result.get('image_verification') or {}
+    return any((image.get(check) or {}).get('error') for check in ('metadata_analysis', 'manipulation_detection'))
+
+
+class ResultCache:
+    """Two-tier analysis result cache.
+
+    Tier one is an in-process LRU with a TTL, tier two is the `cached_results`
+    table, which survives worker restarts and is shared by all workers.
+    """
+
+    def __init__(self):
+        self.memory = TTLCache(Config.RESULT_CACHE_SIZE, Config.RESULT_CACHE_TTL)
+        self.db_ttl = timedelta(seconds=Config.RESULT_CACHE_DB_TTL)
+        self.version = cache_version()
+        self.db_hits = 0
+        self.skipped = 0
+        self.swept = 0
+        self._writes = 0
+
+    def key(self, content_hash):
+        return f"{content_hash}:{self.version}"
+
+    def get(self, content_hash):
+        """Return (result, tier) for a cached analysis or (None, None)"""
+        key = self.key(content_hash)
+        result = self.memory.get(key)
+        if result is not None:
+            return result, 'memory'
+
+        try:
+            row = db.session.get(CachedResult, key)
+            if row is None:
+                return None, None
+            if row.created_at and row.created_at + self.db_ttl < datetime.utcnow():
+                db.session.delete(row)
+                db.session.commit()
+                return None, None
+
+            result = row.result
+            if result is None:
+                return None, None
+
+            self.memory.set(key, result)
+            self.db_hits += 1
+            return result, 'database'
+        except Exception as e:
+            logger.error(f"Result cache lookup error: {e}")
+            db.session.rollback()
+            return None, None
+
+    def set(self, content_hash, result):
+        """Store a finished analysis in both tiers"""
+        if is_degraded(result):
+            # Never pin a degraded result; the next request retries, and claim
+            # lookups still running at the deadline will be in the claim cache
+            self.skipped += 1
+            return
+
+        key = self.key(content_hash)
+        self.memory.set(key, result)
+        try:
+            db.session.merge(CachedResult(
+                cache_key=key,
+                content_hash=content_hash,
+                version=self.version,
+                # The blob is deduplicated with the analysis row saved next
+                result_hash=AnalysisBlob.store(result),
+                created_at=datetime.utcnow()
+            ))
+            db.session.commit()
+            self._writes += 1
+            if self._writes % SWEEP_EVERY == 0:
+                self.sweep()
+        except Exception as e:
+            logger.error(f"Result cache store error: {e}")
+            db.session.rollback()
+
+    def sweep(self):
+        """Delete database rows past the TTL; returns the number deleted"""
+        cutoff = datetime.utcnow() - self.db_ttl
+        deleted = CachedResult.query.filter(CachedResult.created_at < cutoff).delete(synchronize_session=False)
+        db.session.commit()
+        self.swept += deleted
+        return deleted
+
+    def stats(self):
+        stats = self.memory.stats()
+        stats['database_hits'] = self.db_hits
+        stats['degraded_skipped'] = self.skipped
+        stats['expired_swept'] = self.swept
+        stats['version'] = self.version
+        return stats
@@ -0,0 +1,172 @@
+import os
+import threading
+import time
+from collections import deque
+from utils.error_handler import logger
+
+POLICIES = ('block', 'sync', 'drop')
+
+_queues = []
+
+
+def flush_all(timeout=10):
+    """Drain every write-behind queue; called at exit and by gunicorn's worker_exit"""
+    for queue in _queues:
+        queue.flush(timeout)
+
+
+class WriteBehindQueue:
+    """Persists records off the request path in batched transactions.
+
+    `submit` appends records to a bounded in-memory queue and returns
+    immediately. A background thread waits up to `max_delay_ms` for more
+    records, then hands up to `batch_size` of them to `write_fn` so they are
+    committed together (group commit).
+
+    When the queue is full the `policy` decides: 'block' waits up to
+    `block_timeout` seconds for room and then writes inline, 'sync' writes
+    inline at once and 'drop' discards the records. A failing batch is
+    retried, then written record by record so one bad record cannot take
+    the rest of its batch down with it.
+    """
+
+    def __init__(self, name, write_fn, batch_size=100, max_pending=5000, max_delay_ms=50,
+                 policy='block', block_timeout=1.0, max_retries=3):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown write-behind policy: {policy}")
+        self.name = name
+        self.write_fn = write_fn
+        self.batch_size = max(1, batch_size)
+        self.max_pending = max(1, max_pending)
+        self.max_delay = max(0, max_delay_ms) / 1000
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.max_retries = max_retries
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._worker = None
+        self._worker_pid = None
+
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self.dropped = 0
+        self.inline_writes = 0
+        self.last_error = None
+        _queues.append(self)
+
+    def submit(self, records):
+        """Queue records for writing; returns False if they were dropped"""
+        records = list(records)
+        if not records:
+            return True
+        with self._cond:
+            self._ensure_worker()
+            if len(self._queue) + len(records) > self.max_pending and self.policy == 'block':
+                deadline = time.monotonic() + self.block_timeout
+                while len(self._queue) + len(records) > self.max_pending:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+            if len(self._queue) + len(records) <= self.max_pending:
+                self._queue.extend((record, time.monotonic()) for record in records)
+                self._cond.notify_all()
+                return True
+
+            if self.policy == 'drop':
+                self.dropped += len(records)
+                logger.warning(f"Write-behind queue {self.name} full, dropped {len(records)} records")
+                return False
+            self.inline_writes += len(records)
+
+        # Backpressure: the caller pays for its own write
+        self._write(records)
+        return True
+
+    def flush(self, timeout=10):
+        """Block until everything queued so far is written; True if drained"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if self._worker_pid != os.getpid():
+                return not self._queue
+            self._cond.notify_all()
+            while self._queue or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.error(f"Write-behind queue {self.name}: {len(self._queue)} records not flushed")
+                    return False
+                self._cond.wait(min(remaining, 0.05))
+        return True
+
+    def stats(self):
+        with self._cond:
+            return {
+                'pending': len(self._queue),
+                'written': self.written,
+                'batches': self.batches,
+                'avg_batch_size': round(self.written / self.batches, 2) if self.batches else 0.0,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'inline_writes': self.inline_writes,
+                'policy': self.policy,
+                'max_pending': self.max_pending,
+                'last_error': self.last_error
+            }
+
+    def _ensure_worker(self):
+        # Threads do not survive fork; records queued in the parent stay the parent's
+        if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+        if self._worker_pid != os.getpid():
+            self._queue.clear()
+            self._in_flight = 0
+        self._worker_pid = os.getpid()
+        self._worker = threading.Thread(target=self._run, name=f"write-behind-{self.name}", daemon=True)
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+
+                # Give concurrent requests a moment to join the same transaction
+                deadline = self._queue[0][1] + self.max_delay
+                while len(self._queue) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                size = min(len(self._queue), self.batch_size)
+                batch = [self._queue.popleft()[0] for _ in range(size)]
+                self._in_flight = size
+                self._cond.notify_all()
+
+            self._write(batch)
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def _write(self, records, attempts=None):
+        for attempt in range(attempts or self.max_retries):
+            try:
+                self.write_fn(records)
+                with self._cond:
+                    self.written += len(records)
+                    self.batches += 1
+                return
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Write-behind batch of {len(records)} failed ({self.name}, attempt {attempt + 1}): {e}")
+                time.sleep(min(0.05 * 2 ** attempt, 1.0))
+
+        if len(records) > 1:
+            for record in records:
+                self._write([record], attempts=1)
+            return
+        with self._cond:
+            self.failed += 1